@@ -22,7 +22,7 @@ from datetime import datetime
 
 # Import our existing modules
 from pdf_report_generator import SAPMEIIPDFGenerator
-from rag_consultant import ask as rag_ask
+from rag_consultant import ask_stream as rag_ask_stream
 
 # Page configuration
 st.set_page_config(
@@ -69,6 +69,23 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+
+def write_stream(pieces) -> str:
+    """Show streamed text pieces as they arrive; returns the full text.
+    st.write_stream needs Streamlit >= 1.31, older versions update a
+    placeholder piece by piece."""
+    if hasattr(st, "write_stream"):
+        text = st.write_stream(pieces)
+        return text if isinstance(text, str) else "".join(map(str, text))
+    placeholder = st.empty()
+    text = ""
+    for piece in pieces:
+        text += piece
+        placeholder.markdown(text + "▌")
+    placeholder.markdown(text)
+    return text
+
+
 class AIVisualizationApp:
     """AI-powered visualization application for SAP ME/MII analysis"""
     
@@ -404,32 +421,24 @@ class AIVisualizationApp:
             # Add user message to chat
             st.chat_message("user").write(user_question)
             
-            # Get AI response
-            with st.spinner("AI agent is thinking..."):
-                try:
-                    ai_response = rag_ask(user_question, output_dir=str(analysis_dir))
-                    
-                    # Add AI response to chat
-                    with st.chat_message("assistant"):
-                        st.markdown(f"""
-                        <div class="ai-response">
-                            <h4>🧠 AI Agent Response:</h4>
-                            <p>{ai_response}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Store in session state
-                    if 'chat_history' not in st.session_state:
-                        st.session_state.chat_history = []
-                    
-                    st.session_state.chat_history.append({
-                        'user': user_question,
-                        'ai': ai_response,
-                        'timestamp': datetime.now().strftime('%H:%M:%S')
-                    })
-                    
-                except Exception as e:
-                    st.error(f"Error getting AI response: {e}")
+            # Get AI response (streamed: tokens are shown as they arrive)
+            try:
+                with st.chat_message("assistant"):
+                    st.markdown("#### 🧠 AI Agent Response:")
+                    ai_response = write_stream(rag_ask_stream(user_question, output_dir=str(analysis_dir)))
+                
+                # Store in session state
+                if 'chat_history' not in st.session_state:
+                    st.session_state.chat_history = []
+                
+                st.session_state.chat_history.append({
+                    'user': user_question,
+                    'ai': ai_response,
+                    'timestamp': datetime.now().strftime('%H:%M:%S')
+                })
+                
+            except Exception as e:
+                st.error(f"Error getting AI response: {e}")
         
         # Show chat history
         if 'chat_history' in st.session_state and st.session_state.chat_history:
@@ -0,0 +1,84 @@
+"""
+Benchmark: development context extraction (doc_agent.extract_development_context)
+- before: the 11 per-pattern re.findall calls and per-keyword lower() of
+          the earlier implementation (copied below), lists with duplicates
+- after:  one tokenizer pass over the distinct tokens, deduplicated,
+          ranked and cross-checked against the controller index
+
+The input is a synthetic `git log` of --lines lines mentioning controllers,
+services and functions of the analysis in --analysis-dir.
+
+Usage:
+  python benchmarks/bench_dev_context.py                           # 5000 lines
+  python benchmarks/bench_dev_context.py --lines 50000 --analysis-dir ./tvmes_enhanced_analysis
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+from doc_agent import DocumentationAgent
+
+WORDS = "fix refactor update move call handler for the in to with plant order resource label".split()
+RISKS = "security websocket error validation api".split()
+
+
+def make_log(lines: int, names, rng: random.Random) -> str:
+    out = []
+    for i in range(lines):
+        if i % 8 == 0:
+            out.append(f"commit {rng.getrandbits(160):040x}\nAuthor: dev{i % 7} <dev@example.com>\n")
+        out.append("    " + " ".join(rng.choice(names) if rng.random() < 0.3 else rng.choice(WORDS + RISKS)
+                                     for _ in range(12)))
+    return "\n".join(out)
+
+
+def legacy_context(dev_summary: str):
+    """extract_development_context before the single-pass extractor (graph step omitted)."""
+    context = {'affected_controllers': [], 'affected_services': [], 'affected_functions': [], 'risk_areas': []}
+    for key, patterns in (
+            ('affected_controllers', [r'(\w+Controller\.js)', r'(\w+\.controller\.js)', r'(\w+Controller)']),
+            ('affected_services', [r'(\w+Service)', r'(\w+Manager)', r'(\w+Helper)']),
+            ('affected_functions', [r'(\w+\(\))', r'(\w+\([^)]*\))', r'on(\w+)', r'get(\w+)', r'set(\w+)'])):
+        for pattern in patterns:
+            context[key].extend(re.findall(pattern, dev_summary, re.IGNORECASE))
+    for keyword in ['security', 'authentication', 'authorization', 'websocket', 'api', 'error', 'validation']:
+        if keyword.lower() in dev_summary.lower():
+            context['risk_areas'].append(keyword)
+    return context
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=5000)
+    parser.add_argument('--analysis-dir', default='./tvmes_enhanced_analysis')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    agent = DocumentationAgent(Path(args.analysis_dir))
+    agent.graph = None  # text extraction only
+    names = ["SfcService", "ShopOrderManager", "DateHelper", "TraceabilityService", "ResourceController.js",
+             "validateInput()", "start(sfc, operation)"]
+    for ctrl in agent.analysis_data.get('controllers', [])[:10]:
+        names.append(re.split(r'[\\/]', ctrl.get('file', ''))[-1])
+        names.extend(ctrl.get('functions', [])[:3])
+    log = make_log(args.lines, names, random.Random(args.seed))
+    print(f"change log: {args.lines:,} lines, {len(log) / 1024:,.0f} KB, "
+          f"{len(agent.analysis_data.get('controllers', []))} controllers in the analysis")
+
+    for label, fn in (("before", legacy_context), ("after", agent.extract_development_context)):
+        fn(log)
+        start = time.perf_counter()
+        context = fn(log)
+        elapsed = time.perf_counter() - start
+        sizes = {k: len(v) for k, v in context.items() if k.startswith('affected_') and v}
+        print(f"{label:>7}: {elapsed * 1000:8.1f} ms  prompt context {len(json.dumps(context)):>9,} chars  {sizes}")
+
+
+if __name__ == '__main__':
+    main()
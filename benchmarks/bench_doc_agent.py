@@ -0,0 +1,113 @@
+"""
+Benchmark: documentation generation latency (doc_agent.DocumentationAgent)
+- sequential: concurrency=1, training material then QA scenarios
+- concurrent: both LLM requests at once (concurrency=2)
+- batch:      --items summaries, one DocumentationAgent + save per summary
+              (as separate doc_agent.py runs: analysis data, graph and RAG
+              index loaded each time) vs doc_agent.run_batch
+
+A local fake Ollama (/api/chat) serves --slots requests in parallel
+(OLLAMA_NUM_PARALLEL) and takes --gen seconds per answer, so the total
+approaches one generation with enough slots and the sum of both without.
+
+Usage:
+  python benchmarks/bench_doc_agent.py                 # 2 slots, 1 s per answer
+  python benchmarks/bench_doc_agent.py --slots 1 --gen 2
+  python benchmarks/bench_doc_agent.py --slots 4 --gen 0.5 --items 20
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+import rag_index
+from doc_agent import DocumentationAgent, run_batch
+
+SUMMARY = ("Changed ResourceController.js onConfirm() to call SfcService and ShopOrderManager; "
+           "websocket error handling and validation updated.")
+
+
+def fake_ollama(slots: int, gen_s: float):
+    slot = threading.Semaphore(slots)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            with slot:
+                time.sleep(gen_s)
+            prompt = payload["messages"][0]["content"]
+            body = json.dumps({"model": payload.get("model"), "done": True,
+                               "message": {"role": "assistant", "content": f"# Answer\n{len(prompt)} chars"}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_analysis(out: Path):
+    controllers = [{"file": f"webapp/controller/C{i}.controller.js",
+                    "functions": [f"onAction{j}" for j in range(10)]} for i in range(200)]
+    (out / "sapui5_deep_analysis.json").write_text(json.dumps({"controllers": controllers}), encoding="utf-8")
+    (out / "SUMMARY.md").write_text("# Summary\n" + "\n".join(
+        f"- Service{i} uses ResourceController" for i in range(500)), encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slots', type=int, default=2, help='Parallel requests of the fake Ollama')
+    parser.add_argument('--gen', type=float, default=1.0, help='Seconds per generated answer')
+    parser.add_argument('--items', type=int, default=0, help='Also compare a batch of this many summaries')
+    args = parser.parse_args()
+
+    server = fake_ollama(args.slots, args.gen)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            write_analysis(out)
+            print(f"fake Ollama: {args.slots} slot(s), {args.gen:.1f} s per answer")
+            for label, concurrency in (("sequential", 1), ("concurrent", 2)):
+                agent = DocumentationAgent(out, llm_host=host, concurrency=concurrency, use_cache=False)
+                agent.generate_complete_documentation(SUMMARY)  # warm: RAG index, connections
+                start = time.perf_counter()
+                doc = agent.generate_complete_documentation(SUMMARY)
+                elapsed = time.perf_counter() - start
+                print(f"{label:>10}: {elapsed:6.2f} s  {doc['metadata']['timings_s']}")
+            if args.items:
+                items = [(f"CR_{i:03d}", f"{SUMMARY} Change request {i}.") for i in range(args.items)]
+                start = time.perf_counter()
+                for item_id, summary in items:
+                    rag_index._open_indexes.clear()
+                    agent = DocumentationAgent(out, llm_host=host, concurrency=args.slots, use_cache=False)
+                    agent.save_documentation(agent.generate_complete_documentation(summary), out / "single" / item_id)
+                t_single = time.perf_counter() - start
+                rag_index._open_indexes.clear()
+                start = time.perf_counter()
+                agent = DocumentationAgent(out, llm_host=host, concurrency=args.slots, use_cache=False)
+                report = run_batch(agent, items, out / "batch")
+                t_batch = time.perf_counter() - start
+                print(f"{args.items} summaries: one by one {t_single:6.2f} s   batch {t_batch:6.2f} s "
+                      f"({report['ok']} ok, index {report['index_s']} s)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Benchmark: base analyzer records on a BLS-heavy tree (FolderCollector)
+- scan:   per-file parse + merge (Java classes, BLS steps, relations)
+- export: FolderCollector.result() (pydantic AnalysisResult)
+- graph:  RelGraph vs nx.DiGraph holding the same --graph-edges edges
+  (traced Python heap after building, then edge iteration)
+- store:  reading those edges back for the UI metrics: json.load(graph.json)
+  vs me_mii_graph_store.load_graph(graph.npz) (edge/type/node counts)
+
+A synthetic tree of MII transactions (and a few Java services) is written to
+a temporary folder first; the timed part reads it back through the
+ScanEngine. Reports records/sec and the peak RSS of the process (peak
+traced Python heap where the resource module is not available).
+
+Usage:
+  python benchmarks/bench_folder_records.py                    # 200 transactions x 1000 steps
+  python benchmarks/bench_folder_records.py --files 50 --steps 4000 --graph-edges 2000000
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+from me_mii_graph_store import load_graph, save_graph
+from me_mii_scanner import ScanEngine
+import me_mii_folder_analyzer as fa
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STEP = ('  <Step Action="Execute" Target="SQLQuery_{i}" Name="Step_{i}">\n'
+        '    <Parameter Name="In_{i}"/><Parameter Name="Out_{i}"/>\n'
+        '  </Step>\n')
+
+JAVA_METHOD = '''
+    @GET
+    @Path("/orders/{i}")
+    public Response get{i}(String id) {{
+        String sql = "SELECT * FROM orders WHERE id = ?";
+        return call("http://erp.example.com/api/{i}");
+    }}
+'''
+
+
+def write_tree(root: Path, files: int, steps: int, java: int):
+    for f in range(files):
+        with open(root / f"Transaction_{f}.xml", "w", encoding="utf-8") as fh:
+            fh.write(f'<?xml version="1.0"?>\n<Transaction Name="TRX_{f}">\n')
+            for i in range(steps):
+                fh.write(STEP.format(i=i))
+            fh.write("</Transaction>\n")
+    for f in range(java):
+        body = "".join(JAVA_METHOD.format(i=i) for i in range(50))
+        (root / f"Service{f}.java").write_text(
+            f"package com.example;\npublic class Service{f} {{{body}}}\n", encoding="utf-8")
+
+
+def peak_mb() -> float:
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return rss / 1024 if rss < 1 << 40 else rss / (1024 * 1024)
+    return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+
+def graph_edges(n: int):
+    """Endpoint-style edges: 5000 services x 97 methods, one REST node per edge."""
+    for i in range(n):
+        meta = {"file": f"/src/Service{i % 5000}.java"} if i % 3 == 0 else {}
+        yield f"com.sap.me.ext.Service{i % 5000}.method{i % 97}()", f"REST:GET:/api/v1/orders/{i}", meta
+
+
+def bench_graph(n: int):
+    import networkx as nx
+
+    edges = list(graph_edges(n))
+    for label in ("nx.DiGraph", "RelGraph"):
+        tracemalloc.start()
+        start = time.perf_counter()
+        if label == "RelGraph":
+            graph = fa.RelGraph()
+            for u, v, meta in edges:
+                graph.add_edge(u, v, "SERVICE_EXPOSES_ENDPOINT", **meta)
+            it = graph.iter_edges()
+        else:
+            graph = nx.DiGraph()
+            for u, v, meta in edges:
+                graph.add_edge(u, v, type="SERVICE_EXPOSES_ENDPOINT", **meta)
+            it = graph.edges(data=True)
+        t_build = time.perf_counter() - start
+        heap = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+        tracemalloc.stop()
+        start = time.perf_counter()
+        count = sum(1 for _ in it)
+        t_iter = time.perf_counter() - start
+        print(f"graph {label:>10}: {count:,} edges  build {t_build:6.2f} s  iterate {t_iter:5.2f} s  heap {heap:6.0f} MB")
+        if label == "RelGraph":
+            bench_store(graph)
+        del graph, it
+
+
+def bench_store(graph):
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        (out / "graph.json").write_text(json.dumps(graph.to_edges(), indent=2, ensure_ascii=False), encoding="utf-8")
+        save_graph(graph, out)
+        for name, load in (("graph.json", lambda: json.load(open(out / "graph.json", encoding="utf-8"))),
+                           ("graph.npz", lambda: load_graph(out))):
+            start = time.perf_counter()
+            data = load()
+            t_load = time.perf_counter() - start
+            start = time.perf_counter()
+            if isinstance(data, list):
+                types = {}
+                for e in data:
+                    types[e["type"]] = types.get(e["type"], 0) + 1
+                nodes = len({e["src"] for e in data} | {e["dst"] for e in data})
+            else:
+                types, nodes = data.type_counts(), len(data.used_keys())
+            t_count = time.perf_counter() - start
+            size = (out / name).stat().st_size / (1024 * 1024)
+            print(f"store {name:>10}: {size:6.0f} MB  load {t_load:6.3f} s  counts {t_count:6.3f} s  "
+                  f"({sum(types.values()):,} edges, {nodes:,} nodes)")
+            del data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=200, help='Transaction files')
+    parser.add_argument('--steps', type=int, default=1000, help='Steps per transaction')
+    parser.add_argument('--java', type=int, default=20, help='Java service files (50 methods each)')
+    parser.add_argument('--graph-edges', type=int, default=1000000, help='Edges for the graph store comparison (0 = skip)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_tree(root, args.files, args.steps, args.java)
+        fa.configure_java_parser("fast", None)
+        if resource is None:
+            tracemalloc.start()
+        base_mb = peak_mb()
+
+        start = time.perf_counter()
+        collector = fa.FolderCollector()
+        ScanEngine(root).add(collector).run()
+        t_scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        res = collector.result()
+        t_export = time.perf_counter() - start
+
+    records = len(collector.bls_nodes) + len(collector.relations) + \
+        sum(1 + len(c.methods) for c in collector.classes)
+    print(f"records: {records:,} (steps {len(res.bls):,}, relations {len(collector.relations):,}, "
+          f"classes {len(res.classes)}, graph edges {len(res.relations):,})")
+    print(f"scan:   {t_scan:6.2f} s  {records / t_scan:12,.0f} records/s")
+    print(f"export: {t_export:6.2f} s")
+    print(f"peak:   {peak_mb():6.0f} MB  (before scan {base_mb:.0f} MB)")
+
+    if args.graph_edges:
+        bench_graph(args.graph_edges)
+
+
+if __name__ == '__main__':
+    main()
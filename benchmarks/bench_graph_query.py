@@ -0,0 +1,103 @@
+"""
+Benchmark: impact-analysis queries (me_mii_graph_query.GraphIndex)
+- build:  CSR adjacency, name index, SCCs and closure bitsets
+- query:  upstream / downstream / reachable / shortest_path / impact latency
+          vs the equivalent networkx calls on the same graph
+
+The synthetic graph mimics analyzer output: service methods exposing REST
+endpoints and touching SQL tables, BLS transactions whose steps call other
+transactions (chains with occasional cycles).
+
+Usage:
+  python benchmarks/bench_graph_query.py                       # 2000 services x 10 methods
+  python benchmarks/bench_graph_query.py --services 5000 --transactions 20000 --queries 2000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+import networkx as nx
+
+import me_mii_folder_analyzer as fa
+from me_mii_graph_query import GraphIndex
+from me_mii_graph_store import GraphStore
+
+
+def build_graph(services: int, methods: int, tables: int, transactions: int, rng: random.Random) -> fa.RelGraph:
+    graph = fa.RelGraph()
+    for s in range(services):
+        for m in range(methods):
+            owner = f"com.sap.me.ext.Service{s}.method{m}()"
+            graph.add_endpoint(owner, "GET", f"/api/s{s}/m{m}")
+            graph.add_sql_usage(owner, f"SELECT * FROM TABLE_{rng.randrange(tables)}")
+            if rng.random() < 0.2:
+                graph.add_edge(owner, f"TRX_{rng.randrange(transactions)}", "BLS_CALLS_TARGET")
+    for t in range(transactions):
+        for step in range(3):
+            graph.add_bls_rel(f"TRX_{t}", f"TRX_{t}_Step{step}", {})
+            target = t + rng.randint(1, 50) if rng.random() < 0.98 else rng.randrange(transactions)
+            graph.add_bls_rel(f"TRX_{t}_Step{step}", f"TRX_{target % transactions}", {})
+    return graph
+
+
+def timed(fn, args_list):
+    times = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--services', type=int, default=2000)
+    parser.add_argument('--methods', type=int, default=10)
+    parser.add_argument('--tables', type=int, default=500)
+    parser.add_argument('--transactions', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = build_graph(args.services, args.methods, args.tables, args.transactions, rng)
+    store = GraphStore.from_graph(graph)
+
+    start = time.perf_counter()
+    index = GraphIndex(store)
+    t_index = time.perf_counter() - start
+    start = time.perf_counter()
+    G = graph.to_networkx()
+    t_nx = time.perf_counter() - start
+    print(f"graph: {store.number_of_nodes:,} nodes, {len(store):,} edges, {len(index._members):,} components")
+    print(f"build: GraphIndex {t_index:6.2f} s   nx.DiGraph {t_nx:6.2f} s")
+
+    keys = index.keys
+    nodes = [(rng.choice(keys),) for _ in range(args.queries)]
+    pairs = [(rng.choice(keys), rng.choice(keys)) for _ in range(args.queries)]
+    tables = [(f"TABLE_{rng.randrange(args.tables)}",) for _ in range(args.queries)]
+    cases = [
+        ("upstream", index.upstream, lambda n: nx.ancestors(G, n), nodes),
+        ("downstream", index.downstream, lambda n: nx.descendants(G, n), nodes),
+        ("reachable", index.reachable, lambda u, v: nx.has_path(G, u, v), pairs),
+        ("shortest_path", index.shortest_path,
+         lambda u, v: nx.shortest_path(G, u, v) if nx.has_path(G, u, v) else None, pairs),
+        ("impact(table)", index.impact, None, tables),
+    ]
+    print(f"{'query':>16} {'index ms (med/max)':>20} {'nx ms (med/max)':>18}")
+    for label, fn, nx_fn, args_list in cases:
+        med, worst = timed(fn, args_list)
+        nx_cell = "-"
+        if nx_fn is not None:
+            nx_med, nx_worst = timed(nx_fn, args_list)
+            nx_cell = f"{nx_med:7.3f} / {nx_worst:7.2f}"
+        print(f"{label:>16} {med:9.3f} / {worst:7.2f} {nx_cell:>18}")
+
+
+if __name__ == '__main__':
+    main()
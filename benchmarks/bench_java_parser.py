@@ -0,0 +1,155 @@
+"""
+Benchmark: Java extraction modes (parse_java_file)
+- ast:    javalang.parse.parse + tree walk (reference)
+- fast:   me_mii_java.extract_fast (javalang.tokenizer only, no AST)
+- cached: parse_java_file served from a warm ContentCache
+
+Synthetic ME extension classes (REST resources with annotations, generics,
+nested/anonymous classes, lambdas, initializer blocks, constructors) are
+generated in memory; accuracy is the share of files whose extracted class
+(name, package, methods, parameters, annotations) matches the AST mode.
+Real sources can be added with --root.
+
+Usage:
+  python benchmarks/bench_java_parser.py                        # 2000 synthetic files
+  python benchmarks/bench_java_parser.py --files 500 --root /path/to/java/sources
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+from me_mii_java import extract_ast, extract_fast
+from me_mii_scanner import FileContent, LineIndex, iter_files
+import me_mii_folder_analyzer as fa
+
+METHOD_TMPL = '''
+    /**
+     * {doc} {{@link {cls}}}
+     */
+    @{http}
+    @Path("/{res}/{{id}}")
+    @Produces("application/json")
+    public {ret} {name}(@PathParam("id") final String id, Map<String, List<{gen}>> filter, int... flags) throws SQLException {{
+        String sql = "SELECT * FROM {res} WHERE id = ? AND state = '{{}}'";
+        Runnable task = () -> {{ log.info("run {{}}", id); }};
+        Comparator<{gen}> cmp = new Comparator<{gen}>() {{
+            @Override
+            public int compare({gen} a, {gen} b) {{ return a.hashCode() - b.hashCode(); }}
+        }};
+        for (int i = 0; i < flags.length; i++) {{
+            if (flags[i] > 0) {{ continue; }}
+        }}
+        {ret_stmt}
+    }}
+'''
+
+RETURNS = [("Response", "return null;"), ("List<Order>", "return null;"),
+           ("int[]", "return new int[0];"), ("void", "return;")]
+
+HELPER_TMPL = '''
+    private static <T extends Comparable<T>> T max{i}(T a, T b) {{
+        return a.compareTo(b) >= 0 ? a : b;
+    }}
+
+    protected abstract void hook{i}(String[] args);
+'''
+
+
+def synthetic_class(i: int, rng: random.Random) -> str:
+    cls = f"OrderResource{i}"
+    parts = [
+        f"package com.sap.me.ext.module{i % 17};\n\n",
+        "import java.sql.*;\nimport java.util.*;\nimport javax.ws.rs.*;\n\n",
+        f'@Path("/api/v{i % 3}")\n@SuppressWarnings({{"unchecked", "rawtypes"}})\n',
+        f"public abstract class {cls}<E extends Entity> extends BaseResource implements Serializable {{\n",
+        "    private static final long serialVersionUID = 1L;\n",
+        '    private final Map<String, int[]> cache = new HashMap<>() {{ put("x", new int[] {1, 2}); }};\n',
+        "    static { System.loadLibrary(\"me\"); }\n",
+        f"    public {cls}() {{ super(); }}\n",
+        f"    public <T> {cls}(T seed) {{ this(); }}\n",
+    ]
+    for j in range(rng.randint(3, 12)):
+        ret, ret_stmt = rng.choice(RETURNS)
+        parts.append(METHOD_TMPL.format(
+            doc=f"Handles request {j}", cls=cls,
+            http=rng.choice(["GET", "POST", "PUT", "DELETE"]),
+            res=rng.choice(["orders", "sfcs", "resources", "routings"]),
+            ret=ret, ret_stmt=ret_stmt,
+            name=f"handle{j}", gen=rng.choice(["Order", "Sfc", "E"]),
+        ))
+        if rng.random() < 0.3:
+            parts.append(HELPER_TMPL.format(i=j))
+    parts.append("\n    public enum State { NEW, DONE; State next() { return DONE; } }\n")
+    parts.append("    private static class Holder { void inner() {} }\n")
+    parts.append('    @interface Marker { String value() default "x"; }\n')
+    parts.append("}\n")
+    return "".join(parts)
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    results = [fn(t) for t in texts]
+    return results, time.perf_counter() - start
+
+
+def safe(extract):
+    def run(text):
+        try:
+            return extract(text, LineIndex(text))
+        except Exception as e:
+            return e
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=2000, help='Number of synthetic classes')
+    parser.add_argument('--root', type=Path, default=None, help='Also measure the .java files under this folder')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpora = [("synthetic", [synthetic_class(i, rng) for i in range(args.files)])]
+    if args.root is not None:
+        corpora.append((str(args.root), [e.content.text for e in iter_files(args.root) if e.ext == ".java"]))
+
+    print(f"{'corpus':>24} {'files':>6} {'MB':>6} {'ast s':>8} {'fast s':>8} {'cached s':>9} {'speedup':>8} {'match':>7} {'ast errs':>9}")
+    for label, texts in corpora:
+        if not texts:
+            continue
+        mb = sum(len(t) for t in texts) / (1024 * 1024)
+        ast_res, t_ast = timed(safe(extract_ast), texts)
+        fast_res, t_fast = timed(safe(extract_fast), texts)
+        errors = sum(isinstance(r, Exception) for r in ast_res)
+        parsed = [(a, f) for a, f in zip(ast_res, fast_res) if not isinstance(a, Exception)]
+        match = sum(a == f for a, f in parsed) / len(parsed) if parsed else 1.0
+
+        # Warm content cache: one parse_java_file per file, then timed re-reads
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i, text in enumerate(texts):
+                fp = Path(tmp) / "src" / f"F{i}.java"
+                fp.parent.mkdir(exist_ok=True)
+                fp.write_text(text, encoding="utf-8")
+                paths.append(fp)
+            fa._java_caches.clear()
+            fa.configure_java_parser("fast", Path(tmp) / "cache")
+            for fp in paths:
+                fa.parse_java_file(fp)
+            start = time.perf_counter()
+            for fp in paths:
+                fa.parse_java_file(fp, FileContent(fp))
+            t_cached = time.perf_counter() - start
+            fa.configure_java_parser("ast", None)
+
+        print(f"{label[-24:]:>24} {len(texts):>6} {mb:6.1f} {t_ast:8.2f} {t_fast:8.2f} {t_cached:9.2f} "
+              f"{t_ast / t_fast:7.1f}x {match:7.1%} {errors:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: LLM response cache (llm_cache, rag_consultant.ollama_chat)
+- miss:  generation by a local fake Ollama taking --gen seconds per answer
+- hit:   the same (model, prompt, options) answered from the SQLite cache
+- evict: --fill answers of --size bytes into a cache capped at --max-mb
+
+The cache lives in a temporary folder, the user's cache is not touched.
+
+Usage:
+  python benchmarks/bench_llm_cache.py                   # 20 prompts, 1 s generation
+  python benchmarks/bench_llm_cache.py --prompts 50 --gen 0.2 --fill 5000
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+import llm_cache
+import rag_consultant as rc
+from bench_doc_agent import fake_ollama
+from llm_cache import LLMCache, cache_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prompts', type=int, default=20)
+    parser.add_argument('--gen', type=float, default=1.0, help='Seconds per generated answer')
+    parser.add_argument('--fill', type=int, default=2000, help='Answers written in the eviction run')
+    parser.add_argument('--size', type=int, default=8000, help='Bytes per answer in the eviction run')
+    parser.add_argument('--max-mb', type=float, default=4.0, help='Cache size limit in the eviction run')
+    args = parser.parse_args()
+
+    server = fake_ollama(args.prompts, args.gen)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    prompts = [f"QA scenarios for change request {i}: SfcService.start()" for i in range(args.prompts)]
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            llm_cache.DEFAULT_LLM_CACHE = Path(tmp) / "llm.sqlite"
+            runs = {}
+            for label in ("miss", "hit"):
+                times = []
+                for prompt in prompts:
+                    start = time.perf_counter()
+                    rc.ollama_chat("me-mii-consultant", prompt, host=host, timeout_s=60)
+                    times.append((time.perf_counter() - start) * 1000)
+                runs[label] = statistics.median(times)
+            print(f"{args.prompts} prompts, {args.gen:.1f} s per generation")
+            print(f"miss: {runs['miss']:10.2f} ms   hit: {runs['hit']:8.3f} ms   "
+                  f"({runs['miss'] / runs['hit']:,.0f}x)  {llm_cache.get_cache().stats()}")
+
+            cache = LLMCache(Path(tmp) / "evict.sqlite", max_bytes=int(args.max_mb * 1024 * 1024))
+            answer = "x" * args.size
+            start = time.perf_counter()
+            for i in range(args.fill):
+                cache.put(cache_key("m", f"prompt {i}"), "m", answer)
+            elapsed = time.perf_counter() - start
+            stats = cache.stats()
+            print(f"evict: {args.fill:,} puts in {elapsed:.2f} s ({elapsed / args.fill * 1000:.3f} ms/put), "
+                  f"kept {stats['entries']:,} answers / {stats['bytes'] / 1024 / 1024:.2f} MB "
+                  f"(limit {args.max_mb} MB), newest kept: {cache.get(cache_key('m', f'prompt {args.fill - 1}')) is not None}")
+            cache.close()
+            llm_cache.get_cache().close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: LLM HTTP calls (llm_client)
+- bare:   requests.post per call, as ollama_chat did (new TCP connection each)
+- pooled: LLMClient (keep-alive session, retries with backoff on 5xx)
+
+A local fake Ollama (/api/chat) answers immediately and fails --fail-every'th
+request with 503 (a busy analysis server), so the numbers show connection
+setup cost, connections opened, and how many calls fail outright.
+
+Usage:
+  python benchmarks/bench_llm_client.py                  # 500 calls, every 10th 503
+  python benchmarks/bench_llm_client.py --calls 2000 --fail-every 5
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+import requests
+
+from llm_client import LLMClient
+
+
+def fake_ollama(fail_every: int):
+    state = {'requests': 0, 'connections': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # like Ollama (Go sets TCP_NODELAY)
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            with lock:
+                state['connections'] += 1
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            with lock:
+                state['requests'] += 1
+                fail = fail_every and state['requests'] % fail_every == 0
+            if fail:
+                body, status = b'{"error": "server busy"}', 503
+            else:
+                body, status = json.dumps({"model": payload.get("model"), "done": True,
+                                           "message": {"role": "assistant", "content": "ok"}}).encode(), 200
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def run(label: str, call, calls: int, state):
+    state['connections'] = 0
+    failed = 0
+    start = time.perf_counter()
+    for _ in range(calls):
+        try:
+            call()
+        except requests.RequestException:
+            failed += 1
+    elapsed = time.perf_counter() - start
+    print(f"{label:>8} {elapsed / calls * 1000:10.3f} {state['connections']:12,} {failed:8,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--fail-every', type=int, default=10, help='Answer every n-th request with 503 (0: never)')
+    args = parser.parse_args()
+
+    server, state = fake_ollama(args.fail_every)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    payload = {"model": "fake", "messages": [{"role": "user", "content": "question?"}], "stream": False}
+
+    def bare():
+        resp = requests.post(f"{host}/api/chat", json=payload, timeout=60)
+        resp.raise_for_status()
+        return resp.json()
+
+    client = LLMClient(host, backoff_s=0.01)
+    try:
+        print(f"{args.calls} calls, every {args.fail_every or '-'}th answered with 503")
+        print(f"{'client':>8} {'ms / call':>10} {'connections':>12} {'failed':>8}")
+        run("bare", bare, args.calls, state)
+        run("pooled", lambda: client.post_json("/api/chat", payload, timeout_s=60), args.calls, state)
+        print(f"pooled stats: {client.stats()}")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
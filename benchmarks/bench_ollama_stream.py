@@ -0,0 +1,101 @@
+"""
+Benchmark: Ollama answer latency (rag_consultant)
+- blocking:  ollama_chat ("stream": false), text arrives when the model is done
+- streaming: ollama_chat_stream ("stream": true), NDJSON pieces as generated
+
+A local fake Ollama (/api/chat) answers with canned tokens, sleeping --delay
+seconds per token, so time-to-first-token and total time can be measured
+without a model. Both clients must return the same text.
+
+Usage:
+  python benchmarks/bench_ollama_stream.py                    # 200 tokens x 20 ms
+  python benchmarks/bench_ollama_stream.py --tokens 500 --delay 0.05
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+import rag_consultant as rc
+
+
+def fake_ollama(tokens, delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # like Ollama (Go sets TCP_NODELAY)
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            model = payload.get("model", "")
+            if not payload.get("stream", True):
+                time.sleep(delay * len(tokens))
+                body = json.dumps({"model": model, "done": True,
+                                   "message": {"role": "assistant", "content": "".join(tokens)}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            lines = [{"model": model, "done": False, "message": {"role": "assistant", "content": t}} for t in tokens]
+            lines.append({"model": model, "done": True, "message": {"role": "assistant", "content": ""}})
+            for i, obj in enumerate(lines):
+                time.sleep(delay)
+                data = (json.dumps(obj) + "\n").encode()
+                end = b"0\r\n\r\n" if i == len(lines) - 1 else b""
+                self.wfile.write(b"%x\r\n%s\r\n%s" % (len(data), data, end))
+                self.wfile.flush()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.02, help='Seconds per generated token')
+    args = parser.parse_args()
+
+    tokens = [f"token{i} " for i in range(args.tokens)]
+    server = fake_ollama(tokens, args.delay)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        start = time.perf_counter()
+        blocking = rc.ollama_chat("fake", "question?", host=host, timeout_s=60, use_cache=False)
+        t_blocking = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = None
+        pieces = []
+        for piece in rc.ollama_chat_stream("fake", "question?", host=host, timeout_s=60, use_cache=False):
+            if first is None:
+                first = time.perf_counter() - start
+            pieces.append(piece)
+        t_stream = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    assert "".join(pieces) == blocking == "".join(tokens), "streamed text differs"
+    print(f"answer: {args.tokens} tokens x {args.delay * 1000:.0f} ms")
+    print(f"{'client':>10} {'first token s':>14} {'total s':>9}")
+    print(f"{'blocking':>10} {t_blocking:14.3f} {t_blocking:9.3f}")
+    print(f"{'streaming':>10} {first:14.3f} {t_stream:9.3f}  ({len(pieces)} pieces)")
+
+
+if __name__ == '__main__':
+    main()
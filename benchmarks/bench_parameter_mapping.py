@@ -0,0 +1,96 @@
+"""
+Benchmark: parameter_mapping extraction (advanced parse_xml_file)
+- regex: the former re.finditer(<Parameter ... .*? <Parameter ...>, DOTALL | IGNORECASE)
+- scan:  find_parameter_mappings (linear tag/attribute pass)
+
+Synthetic BLS transaction XML is generated in memory at each size; both
+implementations must return the same pairs.
+
+Usage:
+  python benchmarks/bench_parameter_mapping.py                     # 5, 10, 25, 50 MB
+  python benchmarks/bench_parameter_mapping.py --sizes 1 2 4 --skip-regex-above 10
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+from me_mii_analyzer_advanced import find_parameter_mappings
+
+PARAM_MAPPING_PATTERN = r'<Parameter[^>]*Name="([^"]*)"[^>]*>.*?<Parameter[^>]*Name="([^"]*)"[^>]*>'
+
+
+def synthetic_transaction(size_mb: float) -> str:
+    """BLS transaction XML of about size_mb megabytes."""
+    step = (
+        '  <Step Action="Assign" Target="Output.{i}">\n'
+        '    <Parameter Name="Input_{i}" Type="String" Value="SFC_{i}"/>\n'
+        '    <Script><![CDATA[ if (a > b) {{ result = "x" + a; }} ]]></Script>\n'
+        '    <Parameter Name="Output_{i}" Type="String"/>\n'
+        '    <Links><Link From="Transaction.Input_{i}" To="Output.{i}"/></Links>\n'
+        '  </Step>\n'
+    )
+    target = int(size_mb * 1024 * 1024)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<Transaction Name="BLS_TRX_BENCH">\n']
+    size = len(parts[0])
+    i = 0
+    while size < target:
+        chunk = step.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append('</Transaction>\n')
+    return "".join(parts)
+
+
+def pathological(n: int) -> str:
+    """Unterminated Name attributes without any '>' (regex backtracks per start)."""
+    return '<Parameter Name="' * n
+
+
+def regex_pairs(text: str):
+    return [(m.group(1), m.group(2), m.start(), m.end())
+            for m in re.finditer(PARAM_MAPPING_PATTERN, text, re.DOTALL | re.IGNORECASE)]
+
+
+def timed(fn, text):
+    start = time.perf_counter()
+    result = fn(text)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[5, 10, 25, 50], help='Sizes in MB')
+    parser.add_argument('--skip-regex-above', type=float, default=None,
+                        help='Only time the scan for sizes above this many MB')
+    parser.add_argument('--pathological', type=int, nargs='+', default=[500, 1000, 2000],
+                        help='Tag counts for the no-">" worst case')
+    args = parser.parse_args()
+
+    print(f"{'input':>22} {'pairs':>9} {'regex s':>9} {'scan s':>9} {'scan MB/s':>10}")
+    for size in args.sizes:
+        text = synthetic_transaction(size)
+        pairs, t_scan = timed(find_parameter_mappings, text)
+        if args.skip_regex_above is None or size <= args.skip_regex_above:
+            expected, t_regex = timed(regex_pairs, text)
+            assert pairs == expected, "scan and regex disagree"
+            regex_col = f"{t_regex:9.2f}"
+        else:
+            regex_col = f"{'-':>9}"
+        mb = len(text) / (1024 * 1024)
+        print(f"{f'transaction {mb:.0f} MB':>22} {len(pairs):>9} {regex_col} {t_scan:9.2f} {mb / t_scan:10.1f}")
+
+    for n in args.pathological:
+        text = pathological(n)
+        pairs, t_scan = timed(find_parameter_mappings, text)
+        expected, t_regex = timed(regex_pairs, text)
+        assert pairs == expected, "scan and regex disagree"
+        print(f"{f'no-> x{n}':>22} {len(pairs):>9} {t_regex:9.2f} {t_scan:9.4f} {'':>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: pattern registry (me_mii_patterns) vs per-pattern re.finditer
+- re.finditer: every pattern string of every family over every file
+- registry:    PatternFamily.finditer with the required-literal prefilter
+
+Both count the same matches; the speedup comes from skipped patterns.
+
+Usage:
+  python benchmarks/bench_patterns.py                          # Data/TVMES (1)
+  python benchmarks/bench_patterns.py --root path/to/tree --repeat 10
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Iterable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+from me_mii_patterns import FAMILIES, PatternFamily, ScanText
+
+
+def naive_scan(families: Iterable[PatternFamily], text: str) -> int:
+    """Reference: plain re.finditer per pattern string (pre-registry code)."""
+    n = 0
+    for fam in families:
+        for spec in fam.specs:
+            for _ in re.finditer(spec.pattern, text, fam.flags):
+                n += 1
+    return n
+
+
+def registry_scan(families: Iterable[PatternFamily], text: str) -> int:
+    st = ScanText(text)
+    return sum(1 for fam in families for _ in fam.finditer(st))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark: pattern registry vs per-pattern re.finditer")
+    parser.add_argument("--root", type=Path, default=Path("Data/TVMES (1)"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [fp.read_text(encoding="utf-8", errors="ignore")
+             for fp in sorted(args.root.rglob("*"))
+             if fp.is_file() and fp.suffix.lower() in {".java", ".js", ".xml", ".properties"}]
+    families = list(FAMILIES.values())
+    print(f"{len(texts)} files, {sum(map(len, texts))} chars, "
+          f"{sum(len(f) for f in families)} patterns in {len(families)} families")
+
+    timings = {}
+    for name, fn in (("re.finditer", naive_scan), ("registry", registry_scan)):
+        hits = 0
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            hits = sum(fn(families, t) for t in texts)
+        timings[name] = (time.perf_counter() - start) / args.repeat
+        print(f"{name:12s} {timings[name] * 1000:8.1f} ms/run  ({hits} matches)")
+    print(f"speedup: {timings['re.finditer'] / timings['registry']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
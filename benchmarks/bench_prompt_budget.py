@@ -0,0 +1,69 @@
+"""
+Benchmark: prompt size against the model window (prompt_budget)
+- consultant: build_prompt (top-5 whole files, 4000 chars each, question as
+  is) vs consult_prompt (question and chunks packed into num_ctx)
+- doc_agent:  generation prompt with the raw summary and lists vs the
+  budgeted one (_budget_prompt), then the consultant prompt around it
+
+The development summary is a synthetic `git log` of --lines lines (see
+bench_dev_context). Tokens are rag_index.estimate_tokens estimates.
+
+Usage:
+  python benchmarks/bench_prompt_budget.py                     # 2000-line change log
+  python benchmarks/bench_prompt_budget.py --lines 20000 --analysis-dir ./tvmes_enhanced_analysis
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+import rag_consultant as rc
+from bench_dev_context import make_log
+from doc_agent import DocumentationAgent
+from prompt_budget import ANSWER_TOKENS, NUM_CTX
+from rag_index import estimate_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=2000)
+    parser.add_argument('--analysis-dir', default='./tvmes_enhanced_analysis')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    out = Path(args.analysis_dir)
+    agent = DocumentationAgent(out)
+    names = ["SfcService", "TraceabilityService", "BaseController.js", "onPressAssemble()", "getTime"]
+    dev_summary = make_log(args.lines, names, random.Random(args.seed))
+    question = "SFC start sırasında websocket hata kodu nasıl yönetilir?"
+    limit = NUM_CTX - ANSWER_TOKENS
+    print(f"window: {NUM_CTX} tokens, {ANSWER_TOKENS} reserved for the answer -> {limit} for the prompt")
+
+    old = rc.build_prompt(rc.retrieve(question, rc.load_corpus(out), k=5), question)
+    report = {}
+    new = rc.consult_prompt(question, str(out), report=report)
+    print(f"consultant:  build_prompt {estimate_tokens(old):>8,}   consult_prompt {estimate_tokens(new):>6,} "
+          f"(dropped {report['dropped']:,})")
+
+    context = agent.extract_development_context(dev_summary)
+    insights = agent.extract_analysis_insights()
+    raw_prompt = (f"DEVELOPMENT SUMMARY:\n{dev_summary}\n\n"
+                  + "\n".join(f"- {key}: {', '.join(context[key])}" for key in context if context[key]))
+    raw = rc.build_prompt(rc.retrieve(raw_prompt, rc.load_corpus(out), k=5), raw_prompt)
+    doc_report = {}
+    start = time.perf_counter()
+    prompt = agent._budget_prompt("DEVELOPMENT SUMMARY:\n{dev_summary}\n- Controllers: {affected_controllers}\n"
+                                  "- Services: {affected_services}\n- Risk Areas: {risk_areas}",
+                                  dev_summary, context, doc_report)
+    final = rc.consult_prompt(prompt, str(out), report=report)
+    elapsed = time.perf_counter() - start
+    print(f"doc_agent:   raw prompt   {estimate_tokens(raw):>8,}   budgeted       {estimate_tokens(final):>6,} "
+          f"(summary dropped {doc_report['doc']['sections']['dev_summary']['dropped']:,}, "
+          f"{elapsed * 1000:.0f} ms, {insights['controllers']} controllers)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: consultant retrieval (rag_consultant)
+- refit:  load_corpus + retrieve (TF-IDF fitted over corpus + question per call)
+- build:  RagIndex.build + save (once per analysis output)
+- open:   RagIndex.open from disk in a fresh process state (manifest, vocabulary,
+          IDF, matrix), then per-question retrieve_budget (transform only,
+          best chunks up to rag_consultant.CONTEXT_TOKENS)
+- prompt: context tokens of the whole-file prompt (5 x first 4000 chars) vs
+          the chunk prompt
+
+A synthetic analysis output (SUMMARY.md, graph.json, sapui5_deep_analysis.json)
+of about --mb megabytes is written to a temporary folder first.
+
+Usage:
+  python benchmarks/bench_rag_index.py              # ~50 MB output, 20 questions
+  python benchmarks/bench_rag_index.py --mb 300 --questions 50
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root modules
+
+import rag_consultant as rc
+import rag_index
+from rag_index import RagIndex, estimate_tokens
+
+WORDS = ("order sfc resource routing operation workcenter material shoporder nc code "
+         "controller view fragment model binding websocket label error plant user").split()
+
+
+def write_output(out: Path, mb: int, rng: random.Random):
+    (out / "SUMMARY.md").write_text("# Summary\n" + "\n".join(
+        f"- Service{i} exposes /api/{rng.choice(WORDS)}/{i}" for i in range(2000)), encoding="utf-8")
+    edges = [{"src": f"com.sap.me.Service{i % 500}.m{i}()", "dst": f"REST:GET:/api/{rng.choice(WORDS)}/{i}",
+              "type": "SERVICE_EXPOSES_ENDPOINT", "meta": {}} for i in range(mb * 2600)]
+    (out / "graph.json").write_text(json.dumps(edges, indent=2), encoding="utf-8")
+    controllers = [{"file": f"webapp/controller/C{i}.controller.js",
+                    "functions": [f"on{rng.choice(WORDS).title()}{j}" for j in range(20)],
+                    "i18n": {f"{rng.choice(WORDS)}.label.{j}": " ".join(rng.choices(WORDS, k=8)) for j in range(10)}}
+                   for i in range(mb * 440)]
+    (out / "sapui5_deep_analysis.json").write_text(json.dumps({"controllers": controllers}, indent=2), encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mb', type=int, default=50, help='Approximate output size')
+    parser.add_argument('--questions', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    questions = [" ".join(rng.choices(WORDS, k=6)) + "?" for _ in range(args.questions)]
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        write_output(out, args.mb, rng)
+        size = sum(fp.stat().st_size for fp in out.iterdir()) / (1024 * 1024)
+        print(f"output: {size:.0f} MB, {len(questions)} questions")
+
+        start = time.perf_counter()
+        for q in questions[-3:]:
+            old = rc.retrieve(q, rc.load_corpus(out), k=5)
+        t_refit = (time.perf_counter() - start) / 3
+
+        start = time.perf_counter()
+        RagIndex.build(out).save()
+        t_build = time.perf_counter() - start
+
+        rag_index._open_indexes.clear()
+        start = time.perf_counter()
+        index = RagIndex.open(out)
+        t_open = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for q in questions:
+            new = RagIndex.open(out).retrieve_budget(q, rc.CONTEXT_TOKENS)  # as ask() does
+        t_query = (time.perf_counter() - start) / len(questions)
+
+        print(f"refit per question:   {t_refit:8.3f} s")
+        print(f"index build + save:   {t_build:8.3f} s (once)")
+        print(f"index open from disk: {t_open:8.3f} s")
+        print(f"indexed per question: {t_query:8.4f} s  ({t_refit / t_query:,.0f}x)")
+        print(f"chunks indexed:       {len(index.chunks):8,}")
+        print(f"prompt tokens:        whole files {estimate_tokens(rc.build_prompt(old, questions[-1])):,}"
+              f"  chunks {estimate_tokens(rc.build_prompt(new, questions[-1], limit=None)):,}"
+              f"  ({len(new)} chunks: {', '.join(p for p, _, _ in new[:3])} ...)")
+
+
+if __name__ == '__main__':
+    main()
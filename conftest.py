@@ -0,0 +1,77 @@
+"""
+Shared test fixtures
+- source_tree: a small copy of the example sources (Java, BLS XML, WSDL,
+  config) and of the TVMES SAPUI5 app (controllers, views, i18n, manifest)
+- scan_outputs: the advanced analyzer's collectors over a tree, as plain data
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parent
+EXAMPLE = REPO / "example_test"
+WEB = REPO / "Data" / "TVMES (1)" / "TVMES" / "WEB"
+WEB_FILES = (
+    "manifest.json",
+    "controller/App.controller.js",
+    "controller/BaseController.js",
+    "controller/Home.controller.js",
+    "controller/typeLabel.controller.js",
+    "view/App.view.xml",
+    "view/Home.view.xml",
+    "view/typeLabel.view.xml",
+    "fragments/URLViewer.fragment.xml",
+    "i18n/i18n_en.properties",
+)
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    root = tmp_path / "src"
+    shutil.copytree(EXAMPLE, root / "backend")
+    for name in WEB_FILES:
+        target = root / "webapp" / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(WEB / name, target)
+    return root
+
+
+@pytest.fixture
+def scan_outputs(monkeypatch):
+    """scan(root, workers=1, cache=None) -> outputs of the advanced analyzer's
+    stages (base, SAPUI5, deep SAPUI5, detection) as comparable data."""
+    import me_mii_folder_analyzer as fa
+    from me_mii_analyzer_advanced import DetectionCollector, SAPUI5DeepCollector
+    from me_mii_context import ContextStore
+    from me_mii_folder_analyzer_extended import ExtendedCollector
+    from me_mii_scanner import ScanEngine
+
+    # AST parser, no persistent Java cache (also for worker processes)
+    monkeypatch.setenv(fa.JAVA_PARSER_ENV, "ast")
+    monkeypatch.delenv(fa.JAVA_CACHE_ENV, raising=False)
+
+    def scan(root, workers=1, cache=None):
+        base = ExtendedCollector()
+        contexts = ContextStore()
+        deep = SAPUI5DeepCollector(contexts=contexts)
+        detection = DetectionCollector(contexts=contexts)
+        engine = ScanEngine(root)
+        base.register(engine)
+        engine.add(deep).add(detection)
+        engine.run(workers=workers, cache=cache)
+        base_result, sapui5_basic = base.result()
+        return {
+            "base": base_result.model_dump(),
+            "sapui5": sapui5_basic,
+            "deep": deep.result(),
+            "detection": contexts.resolve({
+                "db_accesses": detection.db_accesses,
+                "rest_endpoints": detection.rest_endpoints,
+                "bls_steps": detection.bls_steps,
+                "ui_components": detection.ui_components_total,
+            }),
+        }
+
+    return scan
@@ -3,25 +3,85 @@ Documentation Agent for SAP ME/MII Projects
 - Generates Technical Training Materials
 - Creates QA Test Scenarios
 - Based on development summaries and analysis data
+- Both LLM requests run concurrently (--concurrency, Ollama parallel slots)
+- Batch mode: doc_agent.py batch SUMMARIES.jsonl|.csv, one folder per summary
 """
 
+import csv
 import json
+import sys
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 # Import existing modules
-from rag_consultant import ask as rag_ask
+from rag_consultant import QUESTION_TOKENS, ask as rag_ask
+from prompt_budget import Estimator, PromptBudget
+from llm_cache import get_cache
+from llm_client import get_client
+from me_mii_graph_query import GraphIndex
+from rag_index import RagIndex, estimate_tokens
+
+# Concurrent LLM requests (match the Ollama server's OLLAMA_NUM_PARALLEL)
+DEFAULT_CONCURRENCY = 2
+
+# Development summary tokens: name, optional ".controller.js" / ".js" and an
+# optional call "(...)"; one pass over (possibly very long) change logs
+_DEV_TOKEN = re.compile(r'([A-Za-z_]\w*)((?:\.controller)?\.js)?(\([^()\n]{0,200}\))?')
+_HANDLER = re.compile(r'(?:on|get|set)[A-Z]\w*')
+_SERVICE_SUFFIXES = ('service', 'manager', 'helper')
+_NOT_FUNCTIONS = {'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'typeof'}
+RISK_KEYWORDS = ('security', 'authentication', 'authorization', 'websocket', 'api', 'error', 'validation')
+# At most this many names per context list (keeps prompts compact)
+CONTEXT_ITEMS = 20
+# Token budgets of a generation prompt; it is the consultant's question,
+# so the whole prompt stays within rag_consultant.QUESTION_TOKENS
+DOC_PROMPT_TOKENS = QUESTION_TOKENS
+DEV_SUMMARY_TOKENS = 1200
+CONTEXT_LIST_TOKENS = 150
+
+
+def _controller_base(name: str) -> str:
+    """'Home.controller.js' / 'HomeController.js' / 'HomeController' -> 'Home'."""
+    for suffix in ('.js', '.controller', 'Controller', 'controller'):
+        if name.endswith(suffix) and len(name) > len(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+
+def _rank(counts: Dict[str, int], known=()) -> List[str]:
+    """Names known to the analysis first, then by mentions, then first mention."""
+    order = {name: i for i, name in enumerate(counts)}
+    ranked = sorted(counts, key=lambda name: (name not in known, -counts[name], order[name]))
+    return ranked[:CONTEXT_ITEMS]
+
 
 class DocumentationAgent:
     """AI-powered documentation generator for SAP ME/MII projects"""
     
-    def __init__(self, analysis_dir: Path, model: str = "llama3.1:8b"):
+    def __init__(self, analysis_dir: Path, model: str = "me-mii-consultant", llm_host: str = "http://localhost:11434",
+                 concurrency: int = DEFAULT_CONCURRENCY, use_cache: bool = True,
+                 estimate: Estimator = estimate_tokens):
         self.analysis_dir = analysis_dir
         self.model = model
+        self.llm_host = llm_host
+        self.concurrency = max(1, concurrency)
+        # False: bypass the LLM response cache (always regenerate)
+        self.use_cache = use_cache
+        # Prompt token estimator (prompt_budget.tokenizer_estimator for a real tokenizer)
+        self.estimate = estimate
+        self.llm_pool: Optional[ThreadPoolExecutor] = None
+        self._ctrl_index: Optional[Dict[str, Any]] = None
+        # One keep-alive connection per concurrent request
+        if get_client(llm_host).pool_size < self.concurrency:
+            get_client(llm_host, pool_size=self.concurrency)
         self.analysis_data = {}
+        self.graph = None
         self.load_analysis_data()
     
     def load_analysis_data(self):
@@ -39,6 +99,9 @@ class DocumentationAgent:
                 self.summary_text = summary_path.read_text(encoding='utf-8')
             else:
                 self.summary_text = "Summary not available"
+
+            # Relation graph (graph.npz / graph.json) for impact analysis
+            self.graph = GraphIndex.load(self.analysis_dir)
                 
             return True
         except Exception as e:
@@ -52,67 +115,120 @@ class DocumentationAgent:
             'affected_controllers': [],
             'affected_services': [],
             'affected_functions': [],
+            'affected_endpoints': [],
+            'affected_transactions': [],
             'risk_areas': []
         }
         
-        # Extract controller changes
-        controller_patterns = [
-            r'(\w+Controller\.js)',
-            r'(\w+\.controller\.js)',
-            r'(\w+Controller)'
-        ]
-        
-        for pattern in controller_patterns:
-            matches = re.findall(pattern, dev_summary, re.IGNORECASE)
-            context['affected_controllers'].extend(matches)
-        
-        # Extract service changes
-        service_patterns = [
-            r'(\w+Service)',
-            r'(\w+Manager)',
-            r'(\w+Helper)'
-        ]
-        
-        for pattern in service_patterns:
-            matches = re.findall(pattern, dev_summary, re.IGNORECASE)
-            context['affected_services'].extend(matches)
-        
-        # Extract function changes
-        function_patterns = [
-            r'(\w+\(\))',
-            r'(\w+\([^)]*\))',
-            r'on(\w+)',
-            r'get(\w+)',
-            r'set(\w+)'
-        ]
-        
-        for pattern in function_patterns:
-            matches = re.findall(pattern, dev_summary, re.IGNORECASE)
-            context['affected_functions'].extend(matches)
+        # Controllers, services and functions in one tokenizer pass; ranked
+        # (known to the analysis first, then by mentions) and capped
+        controllers, services, functions = self._scan_summary(dev_summary)
+        context['affected_controllers'] = controllers
+        context['affected_services'] = services
+        context['affected_functions'] = functions
+        
+        # Impact over the relation graph: names in the summary that are graph
+        # nodes, plus the endpoints/transactions/classes that depend on them
+        if self.graph is not None:
+            impact = self.graph.impact(self.graph.find(dev_summary))
+            context['affected_endpoints'] = impact['endpoints'][:CONTEXT_ITEMS]
+            context['affected_transactions'] = impact['transactions'][:CONTEXT_ITEMS]
+            context['affected_services'].extend(
+                c for c in impact['classes'][:CONTEXT_ITEMS] if c not in context['affected_services'])
         
         # Identify risk areas
-        risk_keywords = ['security', 'authentication', 'authorization', 'websocket', 'api', 'error', 'validation']
-        for keyword in risk_keywords:
-            if keyword.lower() in dev_summary.lower():
-                context['risk_areas'].append(keyword)
+        lowered = dev_summary.lower()
+        context['risk_areas'] = [keyword for keyword in RISK_KEYWORDS if keyword in lowered]
         
         return context
     
-    def generate_training_material(self, dev_summary: str) -> str:
-        """Generate technical training material"""
+    def _controller_index(self) -> Dict[str, Any]:
+        """Controllers and functions of sapui5_deep_analysis.json by lower-case name (built once)."""
+        if self._ctrl_index is None:
+            controllers: Dict[str, str] = {}
+            functions: Dict[str, List[str]] = {}
+            for ctrl in self.analysis_data.get('controllers', []):
+                display = re.split(r'[\\/]', ctrl.get('file', ''))[-1]
+                if not display:
+                    continue
+                base = _controller_base(display)
+                controllers.setdefault(base.lower(), display)
+                for func in ctrl.get('functions', []):
+                    functions.setdefault(func, [])
+                    if display not in functions[func]:
+                        functions[func].append(display)
+            self._ctrl_index = {'controllers': controllers, 'functions': functions}
+        return self._ctrl_index
+    
+    def _scan_summary(self, dev_summary: str) -> Tuple[List[str], List[str], List[str]]:
+        """(controllers, services, functions) named in the summary.
+
+        Controllers found in the analysis get their file name; a known
+        controller function also counts as a mention of its controller.
+        """
+        index = self._controller_index()
+        known_controllers = index['controllers']
+        known_functions = index['functions']
+        controllers: Dict[str, int] = {}
+        services: Dict[str, int] = {}
+        functions: Dict[str, int] = {}
+        known = set()
+        # Classify distinct tokens only; Counter keeps first-mention order
+        for (name, suffix, call), n in Counter(_DEV_TOKEN.findall(dev_summary)).items():
+            lowered = name.lower()
+            if suffix == '.controller.js' or (lowered.endswith('controller') and lowered != 'controller'):
+                base = _controller_base(name + suffix).lower()
+                display = known_controllers.get(base) or known_controllers.get(lowered)
+                if display is not None:
+                    known.add(display)
+                key = display or name + suffix
+                controllers[key] = controllers.get(key, 0) + n
+                continue
+            if suffix:
+                continue  # other .js files
+            if lowered.endswith(_SERVICE_SUFFIXES) and lowered not in _SERVICE_SUFFIXES:
+                services[name] = services.get(name, 0) + n
+            if (call and lowered not in _NOT_FUNCTIONS) or _HANDLER.fullmatch(name) or name in known_functions:
+                functions[name] = functions.get(name, 0) + n
+                for display in known_functions.get(name, ()):
+                    known.add(display)
+                    controllers[display] = controllers.get(display, 0) + n
+        return (_rank(controllers, known), _rank(services), _rank(functions, known_functions))
+
+    def _budget_prompt(self, template: str, dev_summary: str, context: Dict[str, Any],
+                       report: Optional[Dict[str, Any]] = None) -> str:
+        """Fill the {dev_summary} / {affected_*} / {risk_areas} fields of a
+        generation prompt within DOC_PROMPT_TOKENS (the consultant's question
+        budget): summary head first, then the ranked lists, each capped."""
+        budget = PromptBudget(num_ctx=DOC_PROMPT_TOKENS, reserve=0, estimate=self.estimate)
+        budget.add('dev_summary', dev_summary.strip(), DEV_SUMMARY_TOKENS, priority=0)
+        for priority, key in enumerate(('affected_controllers', 'affected_services',
+                                        'affected_endpoints', 'affected_transactions', 'risk_areas'), 1):
+            budget.add_items(key, context[key], CONTEXT_LIST_TOKENS, priority=priority, sep=', ')
+        prompt = budget.render(template)
+        if report is not None:
+            report['doc'] = budget.report
+        return prompt
+    
+    def generate_training_material(self, dev_summary: str, context: Optional[Dict[str, Any]] = None,
+                                   insights: Optional[Dict[str, Any]] = None,
+                                   report: Optional[Dict[str, Any]] = None) -> str:
+        """Generate technical training material (context/insights: precomputed, else extracted here)"""
         
         # Extract development context
-        context = self.extract_development_context(dev_summary)
+        if context is None:
+            context = self.extract_development_context(dev_summary)
         
         # Get analysis insights
-        insights = self.extract_analysis_insights()
+        if insights is None:
+            insights = self.extract_analysis_insights()
         
         # Generate training material using RAG
-        training_prompt = f"""
+        training_prompt = self._budget_prompt(f"""
         Generate a comprehensive technical training material for SAP ME/MII project based on the following development summary and analysis data:
         
         DEVELOPMENT SUMMARY:
-        {dev_summary}
+        {{dev_summary}}
         
         ANALYSIS INSIGHTS:
         - Controllers: {insights['controllers']}
@@ -122,9 +238,11 @@ class DocumentationAgent:
         - BaseController Functions: {insights['basecontroller_functions']}
         
         CONTEXT:
-        - Affected Controllers: {', '.join(context['affected_controllers'])}
-        - Affected Services: {', '.join(context['affected_services'])}
-        - Risk Areas: {', '.join(context['risk_areas'])}
+        - Affected Controllers: {{affected_controllers}}
+        - Affected Services: {{affected_services}}
+        - Affected Endpoints: {{affected_endpoints}}
+        - Affected BLS Transactions: {{affected_transactions}}
+        - Risk Areas: {{risk_areas}}
         
         Please generate a structured training material with the following sections:
         
@@ -135,29 +253,37 @@ class DocumentationAgent:
         5. TROUBLESHOOTING GUIDE
         
         Format as Markdown with clear headings, code examples, and practical guidance.
-        """
+        """, dev_summary, context, report)
         
+        rag_report: Dict[str, Any] = {}
+        if report is not None:
+            report['rag'] = rag_report
         try:
-            training_material = rag_ask(training_prompt, output_dir=str(self.analysis_dir))
+            training_material = rag_ask(training_prompt, output_dir=str(self.analysis_dir), model=self.model,
+                                        host=self.llm_host, use_cache=self.use_cache, report=rag_report, estimate=self.estimate)
             return training_material
         except Exception as e:
             return f"Error generating training material: {e}"
     
-    def generate_qa_test_scenarios(self, dev_summary: str) -> str:
-        """Generate QA test scenarios"""
+    def generate_qa_test_scenarios(self, dev_summary: str, context: Optional[Dict[str, Any]] = None,
+                                   insights: Optional[Dict[str, Any]] = None,
+                                   report: Optional[Dict[str, Any]] = None) -> str:
+        """Generate QA test scenarios (context/insights: precomputed, else extracted here)"""
         
         # Extract development context
-        context = self.extract_development_context(dev_summary)
+        if context is None:
+            context = self.extract_development_context(dev_summary)
         
         # Get analysis insights
-        insights = self.extract_analysis_insights()
+        if insights is None:
+            insights = self.extract_analysis_insights()
         
         # Generate test scenarios using RAG
-        qa_prompt = f"""
+        qa_prompt = self._budget_prompt(f"""
         Generate comprehensive QA test scenarios for SAP ME/MII project based on the following development summary and analysis data:
         
         DEVELOPMENT SUMMARY:
-        {dev_summary}
+        {{dev_summary}}
         
         ANALYSIS INSIGHTS:
         - Controllers: {insights['controllers']}
@@ -167,9 +293,11 @@ class DocumentationAgent:
         - Critical Error Codes: {insights['critical_error_codes']}
         
         CONTEXT:
-        - Affected Controllers: {', '.join(context['affected_controllers'])}
-        - Affected Services: {', '.join(context['affected_services'])}
-        - Risk Areas: {', '.join(context['risk_areas'])}
+        - Affected Controllers: {{affected_controllers}}
+        - Affected Services: {{affected_services}}
+        - Affected Endpoints: {{affected_endpoints}}
+        - Affected BLS Transactions: {{affected_transactions}}
+        - Risk Areas: {{risk_areas}}
         
         Please generate test scenarios in the following format:
         
@@ -185,10 +313,14 @@ class DocumentationAgent:
         5. Error handling test scenarios
         
         Focus on critical business workflows and the changes mentioned in the development summary.
-        """
+        """, dev_summary, context, report)
         
+        rag_report: Dict[str, Any] = {}
+        if report is not None:
+            report['rag'] = rag_report
         try:
-            qa_scenarios = rag_ask(qa_prompt, output_dir=str(self.analysis_dir))
+            qa_scenarios = rag_ask(qa_prompt, output_dir=str(self.analysis_dir), model=self.model,
+                                   host=self.llm_host, use_cache=self.use_cache, report=rag_report, estimate=self.estimate)
             return qa_scenarios
         except Exception as e:
             return f"Error generating QA scenarios: {e}"
@@ -223,11 +355,40 @@ class DocumentationAgent:
     def generate_complete_documentation(self, dev_summary: str) -> Dict[str, str]:
         """Generate complete documentation package"""
         
-        print("🎓 Generating Technical Training Material...")
-        training_material = self.generate_training_material(dev_summary)
-        
-        print("✅ Generating QA Test Scenarios...")
-        qa_scenarios = self.generate_qa_test_scenarios(dev_summary)
+        # Context and insights once for both prompts
+        context = self.extract_development_context(dev_summary)
+        insights = self.extract_analysis_insights()
+        jobs = {
+            'training_material': ("🎓 Generating Technical Training Material...", self.generate_training_material),
+            'qa_scenarios': ("✅ Generating QA Test Scenarios...", self.generate_qa_test_scenarios),
+        }
+        timings = {}
+        prompt_tokens: Dict[str, Dict[str, Any]] = {key: {} for key in jobs}
+
+        def run(key):
+            label, generate = jobs[key]
+            print(label)
+            start = time.perf_counter()
+            result = generate(dev_summary, context, insights, prompt_tokens[key])
+            timings[key] = round(time.perf_counter() - start, 3)
+            return result
+
+        # Both LLM calls at once, up to the Ollama server's parallel slots
+        # (OLLAMA_NUM_PARALLEL); concurrency=1 runs them one after the other.
+        # In batch mode all items share self.llm_pool.
+        start = time.perf_counter()
+        if self.llm_pool is not None:
+            futures = {key: self.llm_pool.submit(run, key) for key in jobs}
+            results = {key: future.result() for key, future in futures.items()}
+        elif self.concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(jobs))) as pool:
+                futures = {key: pool.submit(run, key) for key in jobs}
+                results = {key: future.result() for key, future in futures.items()}
+        else:
+            results = {key: run(key) for key in jobs}
+        timings['total'] = round(time.perf_counter() - start, 3)
+        training_material = results['training_material']
+        qa_scenarios = results['qa_scenarios']
         
         # Generate summary
         summary = f"""
@@ -262,7 +423,14 @@ class DocumentationAgent:
                 'generated_at': datetime.now().isoformat(),
                 'dev_summary': dev_summary,
                 'analysis_dir': str(self.analysis_dir),
-                'model': self.model
+                'model': self.model,
+                # Shared Ollama client: requests, retries, latency of this process
+                'llm': get_client(self.llm_host).stats(),
+                'llm_cache': get_cache().stats(),
+                'concurrency': self.concurrency,
+                'timings_s': timings,
+                # Prompt tokens used / dropped: generation prompt and final consultant prompt
+                'prompt_tokens': prompt_tokens
             }
         }
     
@@ -271,7 +439,7 @@ class DocumentationAgent:
         if output_dir is None:
             output_dir = self.analysis_dir / 'documentation'
         
-        output_dir.mkdir(exist_ok=True)
+        output_dir.mkdir(parents=True, exist_ok=True)
         
         # Save training material
         training_path = output_dir / 'TRAINING_MATERIAL.md'
@@ -301,17 +469,186 @@ class DocumentationAgent:
         
         return output_dir
 
-def main():
-    """Main CLI function"""
-    parser = argparse.ArgumentParser(description='Documentation Agent for SAP ME/MII Projects')
-    parser.add_argument('dev_summary', help='Development summary or change log')
+
+def read_summaries(path: Path) -> List[Tuple[str, str]]:
+    """(item id, development summary) pairs from a JSONL or CSV file.
+
+    JSONL: one object per line with "summary" (or "dev_summary") and an
+    optional "id", or a bare JSON string. CSV: header with the same columns.
+    Items without an id are numbered; ids are made safe as folder names.
+    """
+    rows: List[Dict[str, Any]] = []
+    # utf-8-sig: Excel CSV exports start with a BOM, which would otherwise
+    # end up in the first header ("\ufeffsummary")
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            rows = list(csv.DictReader(f))
+        else:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ {path}:{lineno}: invalid JSON skipped ({e.msg})")
+                    continue
+                rows.append(obj if isinstance(obj, dict) else {'summary': obj})
+    items = []
+    seen = set()
+    for n, row in enumerate(rows, 1):
+        summary = row.get('summary') or row.get('dev_summary') or ''
+        if isinstance(summary, (int, float)) and not isinstance(summary, bool):
+            summary = str(summary)
+        if not isinstance(summary, str):
+            print(f"⚠️ {path}: item {n} skipped, summary is not text ({type(summary).__name__})")
+            continue
+        summary = summary.strip()
+        if not summary:
+            continue
+        item_id = re.sub(r'[^\w.-]+', '_', str(row.get('id') or '').strip()).strip('._') or f"item_{n:03d}"
+        while item_id in seen:
+            item_id += '_'
+        seen.add(item_id)
+        items.append((item_id, summary))
+    return items
+
+
+def run_batch(agent: DocumentationAgent, items: List[Tuple[str, str]], output_dir: Path) -> Dict[str, Any]:
+    """Document every (id, summary) item into output_dir/<id>/.
+
+    Analysis data, relation graph and RAG index are loaded once (by the
+    agent / first RagIndex.open); items run on agent.concurrency workers and
+    all LLM calls go through one pool of the same size, so at most that many
+    requests reach Ollama and at most two per worker wait in the queue.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    RagIndex.open(agent.analysis_dir)
+    index_s = round(time.perf_counter() - start, 3)
+
+    def document(item):
+        item_id, summary = item
+        item_start = time.perf_counter()
+        record = {'id': item_id, 'summary': summary[:100], 'output': str(output_dir / item_id)}
+        try:
+            documentation = agent.generate_complete_documentation(summary)
+            agent.save_documentation(documentation, output_dir / item_id)
+            failed = [key for key in ('training_material', 'qa_scenarios')
+                      if documentation[key].startswith('Error generating')]
+            record['status'] = 'error' if failed else 'ok'
+            if failed:
+                record['error'] = ', '.join(failed)
+            record['timings_s'] = documentation['metadata']['timings_s']
+        except Exception as e:
+            record['status'] = 'error'
+            record['error'] = str(e)
+        record['total_s'] = round(time.perf_counter() - item_start, 3)
+        return record
+
+    with ThreadPoolExecutor(max_workers=agent.concurrency) as llm_pool, \
+            ThreadPoolExecutor(max_workers=agent.concurrency) as workers:
+        agent.llm_pool = llm_pool
+        try:
+            records = list(workers.map(document, items))
+        finally:
+            agent.llm_pool = None
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'analysis_dir': str(agent.analysis_dir),
+        'model': agent.model,
+        'concurrency': agent.concurrency,
+        'items': len(records),
+        'ok': sum(1 for r in records if r['status'] == 'ok'),
+        'failed': sum(1 for r in records if r['status'] != 'ok'),
+        'index_s': index_s,
+        'total_s': round(time.perf_counter() - start, 3),
+        'llm': get_client(agent.llm_host).stats(),
+        'llm_cache': get_cache().stats(),
+        'results': records,
+    }
+
+
+def save_batch_report(report: Dict[str, Any], output_dir: Path) -> Path:
+    """Write batch_report.json and BATCH_REPORT.md (per-item timings) into output_dir."""
+    with open(output_dir / 'batch_report.json', 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    lines = [
+        "# Documentation Batch Report",
+        "",
+        f"**Generated on:** {report['generated_at']}",
+        f"**Analysis Data:** {report['analysis_dir']}",
+        f"**Items:** {report['items']} ({report['ok']} ok, {report['failed']} failed)",
+        f"**Total:** {report['total_s']} s (index {report['index_s']} s, concurrency {report['concurrency']})",
+        "",
+        "| ID | Status | Training (s) | QA (s) | Total (s) | Summary |",
+        "|----|--------|--------------|--------|-----------|---------|",
+    ]
+    for r in report['results']:
+        t = r.get('timings_s', {})
+        status = r['status'] if r['status'] == 'ok' else f"{r['status']}: {r.get('error', '')}"
+        summary = r['summary'].replace('|', '\\|').replace('\n', ' ')
+        lines.append(f"| {r['id']} | {status} | {t.get('training_material', '-')} | {t.get('qa_scenarios', '-')} "
+                     f"| {r['total_s']} | {summary} |")
+    report_path = output_dir / 'BATCH_REPORT.md'
+    report_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return report_path
+
+
+def _add_agent_args(parser: argparse.ArgumentParser):
     parser.add_argument('--analysis-dir', default='./tvmes_enhanced_analysis', 
                        help='Analysis directory path')
-    parser.add_argument('--model', default='llama3.1:8b', 
-                       help='Ollama model to use')
+    parser.add_argument('--model', default='me-mii-consultant', 
+                       help='Ollama model to use (default: the consultant Modelfile)')
     parser.add_argument('--output-dir', help='Output directory for documentation')
+    parser.add_argument('--host', default='http://localhost:11434', help='Ollama host URL')
+    parser.add_argument('--pool-size', type=int, default=None, help='Keep-alive connections to the Ollama host')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help='Concurrent LLM requests (Ollama parallel slots; 1 = sequential)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the LLM response cache')
+
+
+def batch_main(argv: List[str]):
+    """CLI: doc_agent.py batch SUMMARIES.(jsonl|csv) [options]"""
+    parser = argparse.ArgumentParser(prog='doc_agent.py batch',
+                                     description='Documentation for many development summaries in one run')
+    parser.add_argument('summaries', help='JSONL or CSV file of summaries (fields: id, summary)')
+    _add_agent_args(parser)
+    args = parser.parse_args(argv)
+
+    analysis_dir = Path(args.analysis_dir)
+    if not analysis_dir.exists():
+        print(f"❌ Analysis directory not found: {analysis_dir}")
+        return
+    items = read_summaries(Path(args.summaries))
+    if not items:
+        print(f"❌ No summaries found in: {args.summaries}")
+        return
+
+    get_client(args.host, pool_size=args.pool_size)
+    agent = DocumentationAgent(analysis_dir, args.model, llm_host=args.host, concurrency=args.concurrency,
+                               use_cache=not args.no_cache)
+    output_dir = Path(args.output_dir) if args.output_dir else analysis_dir / 'documentation_batch'
+
+    print(f"🤖 Documentation Batch: {len(items)} summaries, concurrency {agent.concurrency}")
+    report = run_batch(agent, items, output_dir)
+    report_path = save_batch_report(report, output_dir)
+    print(f"✅ {report['ok']}/{report['items']} documented in {report['total_s']} s")
+    print(f"📊 Report: {report_path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main CLI function"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['batch']:
+        return batch_main(argv[1:])
+    parser = argparse.ArgumentParser(description='Documentation Agent for SAP ME/MII Projects',
+                                     epilog='Many summaries at once: doc_agent.py batch SUMMARIES.jsonl|.csv')
+    parser.add_argument('dev_summary', help='Development summary or change log')
+    _add_agent_args(parser)
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Initialize agent
     analysis_dir = Path(args.analysis_dir)
@@ -319,7 +656,9 @@ def main():
         print(f"❌ Analysis directory not found: {analysis_dir}")
         return
     
-    agent = DocumentationAgent(analysis_dir, args.model)
+    get_client(args.host, pool_size=args.pool_size)
+    agent = DocumentationAgent(analysis_dir, args.model, llm_host=args.host, concurrency=args.concurrency,
+                               use_cache=not args.no_cache)
     
     print("🤖 Documentation Agent Starting...")
     print(f"📁 Analysis Directory: {analysis_dir}")
@@ -0,0 +1,150 @@
+"""
+Content-addressed LLM response cache (rag_consultant.ollama_chat)
+- Key: hash of (model, prompt, options); identical requests are answered
+  from the cache in milliseconds instead of a new generation
+- Local SQLite file shared by all processes (default
+  ~/.cache/sapdocai/llm.sqlite), safe to use from several threads
+- Eviction by age (max_age_s since the answer was generated) and by size
+  (least recently used answers first, down to max_bytes)
+- Read or write errors only cost the generation: get() misses, put() skips
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_LLM_CACHE = Path.home() / ".cache" / "sapdocai" / "llm.sqlite"
+MAX_BYTES = 256 * 1024 * 1024
+MAX_AGE_S = 30 * 24 * 3600
+
+_caches: Dict[str, "LLMCache"] = {}
+_caches_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_used ON responses(used);
+CREATE INDEX IF NOT EXISTS responses_created ON responses(created);
+"""
+
+
+def cache_key(model: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Content address of one request: blake2b of model, prompt and options."""
+    data = json.dumps([model, prompt, options or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LLMCache:
+    """SQLite store of LLM answers keyed by cache_key()."""
+
+    def __init__(self, path: Path = DEFAULT_LLM_CACHE, max_bytes: int = MAX_BYTES, max_age_s: float = MAX_AGE_S):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached answer of key, or None (missing or older than max_age_s)."""
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._conn()
+                row = db.execute("SELECT response FROM responses WHERE key = ? AND created >= ?",
+                                 (key, now - self.max_age_s)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+        except (OSError, sqlite3.Error):
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._conn()
+                db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                           (key, model, response, len(response.encode("utf-8")), now, now))
+                self._evict(db, now)
+        except (OSError, sqlite3.Error):
+            pass
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> int:
+        removed = db.execute("DELETE FROM responses WHERE created < ?", (now - self.max_age_s,)).rowcount
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            keys = []
+            for key, size in db.execute("SELECT key, size FROM responses ORDER BY used"):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            db.executemany("DELETE FROM responses WHERE key = ?", keys)
+            removed += len(keys)
+        return removed
+
+    def evict(self) -> int:
+        """Drop expired answers, then least recently used ones above max_bytes."""
+        try:
+            with self._lock:
+                return self._evict(self._conn(), time.time())
+        except (OSError, sqlite3.Error):
+            return 0
+
+    def clear(self):
+        try:
+            with self._lock:
+                self._conn().execute("DELETE FROM responses")
+        except (OSError, sqlite3.Error):
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            with self._lock:
+                entries, size = self._conn().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        except (OSError, sqlite3.Error):
+            entries, size = 0, 0
+        return {'entries': entries, 'bytes': size, 'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def get_cache(path: Optional[Path] = None) -> LLMCache:
+    """Shared cache of path (default: DEFAULT_LLM_CACHE) for this process."""
+    path = Path(path or DEFAULT_LLM_CACHE)
+    key = str(path.resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = LLMCache(path)
+        return cache
@@ -0,0 +1,142 @@
+"""
+Shared HTTP client for the LLM (Ollama) calls
+- One pooled requests.Session per host for the lifetime of the process, so
+  back-to-back calls (doc_agent, Streamlit doc/PDF flows, the chat) reuse
+  keep-alive connections instead of opening a TCP connection each
+- Retries with exponential backoff on connection errors and 5xx answers
+  (before any of the answer is read); read timeouts are not retried, the
+  model is busy and asking again only doubles the wait
+- Per-request timing: seconds to the response headers and in total, number
+  of attempts; see LLMClient.timings / LLMClient.stats()
+"""
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+POOL_SIZE = 4
+RETRIES = 3
+BACKOFF_S = 0.5          # 0, 1, 2 s between attempts (urllib3 backoff)
+RETRY_STATUS = (500, 502, 503, 504)
+MAX_TIMINGS = 1000
+
+_clients: Dict[str, "LLMClient"] = {}
+_clients_lock = threading.Lock()
+
+
+class RequestTiming(NamedTuple):
+    path: str
+    status: int          # 0: no response (connection error, timeout)
+    attempts: int
+    first_byte_s: float  # until the response headers
+    total_s: float       # until the body was read (streams: consumed)
+
+
+class _Retry(Retry):
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if isinstance(error, ReadTimeoutError):
+            raise error
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+class LLMClient:
+    """Pooled keep-alive session for one LLM host, safe to share between threads."""
+
+    def __init__(self, host: str, pool_size: int = POOL_SIZE, retries: int = RETRIES, backoff_s: float = BACKOFF_S):
+        self.host = host.rstrip("/")
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_s = backoff_s
+        retry = _Retry(total=retries, connect=retries, read=retries, status=retries,
+                       backoff_factor=backoff_s, status_forcelist=RETRY_STATUS,
+                       allowed_methods=None, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.timings: Deque[RequestTiming] = deque(maxlen=MAX_TIMINGS)
+        self._lock = threading.Lock()
+
+    def _send(self, path: str, payload: Dict[str, Any], timeout_s: float, stream: bool):
+        start = time.perf_counter()
+        try:
+            resp = self.session.post(f"{self.host}{path}", json=payload, timeout=timeout_s, stream=stream)
+        except requests.RequestException as e:
+            self._record(path, 0, 1 if isinstance(e, requests.ReadTimeout) else self.retries + 1,
+                         start, time.perf_counter())
+            raise
+        return resp, start, time.perf_counter()
+
+    def _record(self, path: str, status: int, attempts: int, start: float, first: float, end: Optional[float] = None):
+        timing = RequestTiming(path, status, attempts, first - start, (end or first) - start)
+        with self._lock:
+            self.timings.append(timing)
+
+    @staticmethod
+    def _attempts(resp: requests.Response) -> int:
+        retries = getattr(resp.raw, "retries", None)
+        return len(retries.history) + 1 if retries is not None else 1
+
+    def post_json(self, path: str, payload: Dict[str, Any], timeout_s: float = 600) -> Dict[str, Any]:
+        """POST payload, return the JSON answer (HTTPError on 4xx/5xx after retries)."""
+        resp, start, first = self._send(path, payload, timeout_s, stream=False)
+        self._record(path, resp.status_code, self._attempts(resp), start, first, time.perf_counter())
+        resp.raise_for_status()
+        return resp.json()
+
+    def stream_json(self, path: str, payload: Dict[str, Any], timeout_s: float = 600) -> Iterator[Dict[str, Any]]:
+        """POST payload, yield the NDJSON answer object by object.
+
+        The connection goes back to the pool once the stream is consumed or
+        the generator is closed; the timing is recorded then.
+        """
+        resp, start, first = self._send(path, payload, timeout_s, stream=True)
+        try:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if line:
+                    yield json.loads(line)
+        finally:
+            resp.close()
+            self._record(path, resp.status_code, self._attempts(resp), start, first, time.perf_counter())
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary of the recorded requests (count, errors, retries, latency)."""
+        with self._lock:
+            timings = list(self.timings)
+        totals = sorted(t.total_s for t in timings)
+        return {
+            'requests': len(timings),
+            'errors': sum(1 for t in timings if not 200 <= t.status < 300),
+            'retries': sum(t.attempts - 1 for t in timings),
+            'first_byte_s_avg': round(sum(t.first_byte_s for t in timings) / len(timings), 3) if timings else 0.0,
+            'total_s_avg': round(sum(totals) / len(totals), 3) if totals else 0.0,
+            'total_s_p50': round(totals[len(totals) // 2], 3) if totals else 0.0,
+            'total_s_max': round(totals[-1], 3) if totals else 0.0,
+        }
+
+    def close(self):
+        self.session.close()
+
+
+def get_client(host: str, pool_size: Optional[int] = None, retries: Optional[int] = None) -> LLMClient:
+    """Shared client of host; a different pool_size / retries replaces it.
+
+    The replaced client is not closed: other threads may still be using it,
+    its connections go away once the last reference is dropped.
+    """
+    key = host.rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if (client is None or (pool_size is not None and pool_size != client.pool_size)
+                or (retries is not None and retries != client.retries)):
+            client = LLMClient(key, pool_size=pool_size or POOL_SIZE,
+                               retries=RETRIES if retries is None else retries)
+            _clients[key] = client
+        return client
@@ -9,17 +9,31 @@ SAP ME/MII Advanced Analyzer with Deep SAPUI5 Analysis
 """
 from pathlib import Path
 import json
+import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import xml.etree.ElementTree as ET
+from bisect import bisect_left
 
 # Base analyzer'ı import et
 import me_mii_folder_analyzer_extended as base_analyzer
+from me_mii_scanner import Collector, FileContent, FileEntry, ScanEngine, file_text, line_index
+from me_mii_cache import AnalysisCache
+from me_mii_folder_analyzer import DEFAULT_JAVA_CACHE_DIR, JAVA_PARSERS, configure_java_parser
+from me_mii_context import ContextStore, context_recorder
+from me_mii_json_stream import JsonLinesWriter, dump_json
+import me_mii_patterns as pat
+from me_mii_patterns import scan_text
 
-def parse_controller_deep(fp: Path) -> Dict[str, Any]:
+# Aşamaların ilgilendiği dosya uzantıları (tarama sırasında sınıflandırma)
+DEEP_SUFFIXES = {'.js', '.xml', '.properties'}
+DETECTION_SUFFIXES = {'.java', '.js', '.xml', '.properties'}
+
+def parse_controller_deep(fp: Path, content: Optional[FileContent] = None) -> Dict[str, Any]:
     """Controller dosyasını detaylı analiz et"""
     try:
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
+        ctx = context_recorder(text, content)
         
         info = {
             "file": str(fp),
@@ -37,57 +51,37 @@ def parse_controller_deep(fp: Path) -> Dict[str, Any]:
             "me_mii_patterns": []
         }
         
+        st = scan_text(text, content)
+        
         # Function definitions
-        func_pattern = r'(\w+)\s*:\s*function\s*\([^)]*\)\s*\{'
-        for match in re.finditer(func_pattern, text):
+        for _, match in pat.CTRL_FUNCTIONS.finditer(st):
             info["functions"].append(match.group(1))
         
         # Event handlers (on* methods)
-        event_pattern = r'(on\w+)\s*:\s*function'
-        for match in re.finditer(event_pattern, text):
+        for _, match in pat.CTRL_EVENT_HANDLERS.finditer(st):
             info["event_handlers"].append(match.group(1))
         
         # API calls (jQuery.ajax, fetch, $.get, $.post)
-        api_patterns = [
-            r'jQuery\.ajax\s*\(\s*\{[^}]*url\s*:\s*["\']([^"\']+)["\']',
-            r'\.ajax\s*\(\s*\{[^}]*url\s*:\s*["\']([^"\']+)["\']',
-            r'fetch\s*\(\s*["\']([^"\']+)["\']',
-            r'\.get\s*\(\s*["\']([^"\']+)["\']',
-            r'\.post\s*\(\s*["\']([^"\']+)["\']',
-        ]
-        
-        for pattern in api_patterns:
-            for match in re.finditer(pattern, text):
-                info["api_calls"].append(match.group(1))
+        for _, match in pat.CTRL_API_CALLS.finditer(st):
+            info["api_calls"].append(match.group(1))
         
         # OData Model creation
-        odata_model_pattern = r'new\s+sap\.ui\.model\.odata\.v[24]\.ODataModel\s*\(\s*["\']([^"\']+)["\']'
-        for match in re.finditer(odata_model_pattern, text):
+        for _, match in pat.CTRL_ODATA_MODELS.finditer(st):
             info["odata_models"].append(match.group(1))
         
         # OData operations (read, create, update, delete)
-        odata_ops = [
-            (r'\.read\s*\(\s*["\']([^"\']+)["\']', 'READ'),
-            (r'\.create\s*\(\s*["\']([^"\']+)["\']', 'CREATE'),
-            (r'\.update\s*\(\s*["\']([^"\']+)["\']', 'UPDATE'),
-            (r'\.remove\s*\(\s*["\']([^"\']+)["\']', 'DELETE'),
-        ]
-        
-        for pattern, op_type in odata_ops:
-            for match in re.finditer(pattern, text):
-                info["odata_operations"].append({
-                    "type": op_type,
-                    "path": match.group(1)
-                })
+        for spec, match in pat.CTRL_ODATA_OPS.finditer(st):
+            info["odata_operations"].append({
+                "type": spec.label,
+                "path": match.group(1)
+            })
         
         # Message Toast / MessageBox
-        message_pattern = r'MessageToast\.show\s*\(\s*["\']([^"\']+)["\']'
-        for match in re.finditer(message_pattern, text):
+        for _, match in pat.CTRL_MESSAGE_TOASTS.finditer(st):
             info["message_toasts"].append(match.group(1))
         
         # Navigation (navTo)
-        nav_pattern = r'\.navTo\s*\(\s*["\']([^"\']+)["\']'
-        for match in re.finditer(nav_pattern, text):
+        for _, match in pat.CTRL_NAVIGATIONS.finditer(st):
             info["navigations"].append(match.group(1))
         
         # Validations
@@ -95,68 +89,24 @@ def parse_controller_deep(fp: Path) -> Dict[str, Any]:
             info["validations"].append("Has validation logic")
         
         # SAP ME API Detection
-        sap_me_patterns = [
-            r'com\.sap\.me\.(\w+)',
-            r'sap\.me\.(\w+)',
-            r'ME\.(\w+)',
-            r'ShopFloorControl\.(\w+)',
-            r'SFC\.(\w+)',
-            r'Order\.(\w+)',
-            r'Resource\.(\w+)',
-            r'WorkCenter\.(\w+)',
-            r'Operation\.(\w+)',
-            r'Routing\.(\w+)'
-        ]
-        
-        for pattern in sap_me_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                api_class = match.group(1)
-                info["sap_me_apis"].append({
-                    "class": api_class,
-                    "pattern": pattern,
-                    "context": text[max(0, match.start()-50):match.end()+50]
-                })
+        for spec, match in pat.SAP_ME_APIS.finditer(st):
+            api_class = match.group(1)
+            info["sap_me_apis"].append({
+                "class": api_class,
+                "pattern": spec.label,
+                "context": ctx.ref(match.start(), match.end(), 50)
+            })
         
         # SFC/Order/Resource Parameter Flow Detection
-        sfc_patterns = [
-            r'SFC\s*=\s*["\']?([^"\'\s]+)["\']?',
-            r'Order\s*=\s*["\']?([^"\'\s]+)["\']?',
-            r'Resource\s*=\s*["\']?([^"\'\s]+)["\']?',
-            r'WorkCenter\s*=\s*["\']?([^"\'\s]+)["\']?',
-            r'Operation\s*=\s*["\']?([^"\'\s]+)["\']?',
-            r'getSFC\(\)',
-            r'getOrder\(\)',
-            r'getResource\(\)',
-            r'setSFC\(',
-            r'setOrder\(',
-            r'setResource\('
-        ]
-        
-        for pattern in sfc_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                info["sfc_operations"].append({
-                    "operation": match.group(0),
-                    "pattern": pattern,
-                    "context": text[max(0, match.start()-30):match.end()+30]
-                })
+        for spec, match in pat.SFC_OPERATIONS.finditer(st):
+            info["sfc_operations"].append({
+                "operation": match.group(0),
+                "pattern": spec.label,
+                "context": ctx.ref(match.start(), match.end(), 30)
+            })
         
         # ME/MII Specific Patterns
-        me_mii_patterns = [
-            r'ShopFloorControl',
-            r'ManufacturingExecution',
-            r'ProductionOrder',
-            r'WorkInstruction',
-            r'QualityInspection',
-            r'MaterialConsumption',
-            r'LaborTracking',
-            r'EquipmentIntegration',
-            r'DataCollection',
-            r'Traceability'
-        ]
-        
-        for pattern in me_mii_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                info["me_mii_patterns"].append(pattern)
+        info["me_mii_patterns"].extend(pat.ME_MII_PATTERNS.matching_labels(st))
         
         return info if any([info["functions"], info["api_calls"], info["odata_models"], 
                           info["sap_me_apis"], info["sfc_operations"], info["me_mii_patterns"]]) else None
@@ -165,11 +115,13 @@ def parse_controller_deep(fp: Path) -> Dict[str, Any]:
         return None
 
 
-def parse_view_xml(fp: Path) -> Dict[str, Any]:
+def parse_view_xml(fp: Path, content: Optional[FileContent] = None) -> Dict[str, Any]:
     """View XML dosyasını analiz et"""
     try:
-        tree = ET.parse(fp)
-        root = tree.getroot()
+        if content is not None:
+            root = ET.fromstring(content.data)
+        else:
+            root = ET.parse(fp).getroot()
         
         info = {
             "file": str(fp),
@@ -233,10 +185,106 @@ def parse_view_xml(fp: Path) -> Dict[str, Any]:
         return None
 
 
-def parse_xml_file(fp: Path) -> Dict[str, Any]:
+def find_parameter_mappings(text: str) -> List[Tuple[str, str, int, int]]:
+    """Input -> Output parameter pairs as (from, to, start, end).
+
+    Gives the same pairs as
+    ``re.finditer(r'<Parameter[^>]*Name="([^"]*)"[^>]*>.*?<Parameter[^>]*Name="([^"]*)"[^>]*>',
+    text, re.DOTALL | re.IGNORECASE)`` — consecutive ``<Parameter ... Name="...">``
+    tags paired left to right — but in one linear pass over the tag and
+    attribute positions instead of backtracking over the text in between.
+    """
+    # Case-insensitive search on a lower-cased copy with the same offsets
+    # ('İ' is the only character whose lower() is longer; it cannot be part
+    # of "<parameter" / 'name="' anyway)
+    low = text.replace('İ', '\0').lower() if not text.isascii() else text.lower()
+    find = text.find
+    lfind = low.find
+    rfind = low.rfind
+    last_gt = text.rfind('>')
+
+    def choices(p: int, gt: int, k: int):
+        """(value, tag end) choices of the tag at p in the regex's order:
+        [^>]* is greedy, so the last Name=" before the first '>' comes first."""
+        lo = p + 10
+        while k >= lo:
+            value_start = k + 6
+            value_end = find('"', value_start)
+            # [^>]*> after the value needs one more '>'
+            if 0 <= value_end < last_gt:
+                end = gt if value_end < gt else find('>', value_end + 1)
+                yield text[value_start:value_end], end + 1
+            k = rfind('name="', lo, k + 5)
+
+    # One pass over the tags: first Name choice of each tag, paired with the
+    # next named tag that starts after it. Tags are visited in order, so the
+    # first '>' after a tag (and the last Name=" before it) is reused while it
+    # lies ahead — amortized linear even when many tags share one '>'
+    tags = []
+    first = []
+    pairs = []
+    pos = 0
+    pending = -1  # index of the tag waiting for its partner
+    gt = -1
+    last_name = -1
+    p = lfind('<parameter')
+    while p >= 0:
+        choice = None
+        if p + 10 <= last_gt:
+            if gt < p + 10:
+                gt = find('>', p + 10)
+                last_name = rfind('name="', p + 10, gt)
+            if last_name >= p + 10:
+                value_end = find('"', last_name + 6)
+                if 0 <= value_end < last_gt:
+                    end = gt if value_end < gt else find('>', value_end + 1)
+                    choice = (text[last_name + 6:value_end], end + 1)
+                else:
+                    choice = next(choices(p, gt, last_name), None)
+        if choice is not None:
+            if pending < 0:
+                if p >= pos:
+                    pending = len(tags)
+            elif p >= first[pending][1]:
+                pairs.append((first[pending][0], choice[0], tags[pending], choice[1]))
+                pos = choice[1]
+                pending = -1
+        tags.append(p)
+        first.append(choice)
+        p = lfind('<parameter', p + 10)
+
+    if pending < 0:
+        return pairs
+
+    # Unpaired tail: the regex backtracks to earlier Name attributes of the
+    # tag (only in malformed tags) and then retries from the following tags
+    n = len(tags)
+    next_named = [n] * (n + 1)
+    for i in range(n - 1, pending - 1, -1):
+        next_named[i] = i if first[i] is not None else next_named[i + 1]
+
+    for i in range(pending, n):
+        p = tags[i]
+        if p < pos or first[i] is None:
+            continue
+        j = n
+        gt_p = find('>', p + 10)
+        for from_name, from_end in choices(p, gt_p, rfind('name="', p + 10, gt_p)):
+            j = next_named[bisect_left(tags, from_end)]
+            if j < n:
+                break
+        if j < n:
+            to_name, to_end = first[j]
+            pairs.append((from_name, to_name, p, to_end))
+            pos = to_end
+    return pairs
+
+
+def parse_xml_file(fp: Path, content: Optional[FileContent] = None) -> Dict[str, Any]:
     """XML dosyasını ME/MII özel analizi ile parse et"""
     try:
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
+        ctx = context_recorder(text, content)
         
         info = {
             "file": str(fp),
@@ -262,12 +310,12 @@ def parse_xml_file(fp: Path) -> Dict[str, Any]:
                     info["bls_steps"].append({
                         "action": match.group(1),
                         "target": match.group(2),
-                        "context": text[max(0, match.start()-100):match.end()+100]
+                        "context": ctx.ref(match.start(), match.end(), 100)
                     })
                 else:
                     info["bls_steps"].append({
                         "name": match.group(1),
-                        "context": text[max(0, match.start()-100):match.end()+100]
+                        "context": ctx.ref(match.start(), match.end(), 100)
                     })
         
         # SFC/Order/Resource Parameter Flow Detection
@@ -287,13 +335,13 @@ def parse_xml_file(fp: Path) -> Dict[str, Any]:
                         "parameter": match.group(1),
                         "value": match.group(2),
                         "pattern": pattern,
-                        "context": text[max(0, match.start()-50):match.end()+50]
+                        "context": ctx.ref(match.start(), match.end(), 50)
                     })
                 else:
                     info["sfc_flow"].append({
                         "operation": match.group(0),
                         "pattern": pattern,
-                        "context": text[max(0, match.start()-50):match.end()+50]
+                        "context": ctx.ref(match.start(), match.end(), 50)
                     })
         
         # ME/MII Specific Operations
@@ -318,12 +366,11 @@ def parse_xml_file(fp: Path) -> Dict[str, Any]:
                 info["me_mii_operations"].append(op)
         
         # Parameter Mapping (Input -> Output flow)
-        param_mapping_pattern = r'<Parameter[^>]*Name="([^"]*)"[^>]*>.*?<Parameter[^>]*Name="([^"]*)"[^>]*>'
-        for match in re.finditer(param_mapping_pattern, text, re.DOTALL | re.IGNORECASE):
+        for from_name, to_name, start, end in find_parameter_mappings(text):
             info["parameter_mapping"].append({
-                "from": match.group(1),
-                "to": match.group(2),
-                "context": text[max(0, match.start()-100):match.end()+100]
+                "from": from_name,
+                "to": to_name,
+                "context": ctx.ref(start, end, 100)
             })
         
         return info if any([info["bls_steps"], info["sfc_flow"], info["me_mii_operations"]]) else None
@@ -332,10 +379,10 @@ def parse_xml_file(fp: Path) -> Dict[str, Any]:
         return None
 
 
-def parse_i18n_properties(fp: Path) -> Dict[str, str]:
+def parse_i18n_properties(fp: Path, content: Optional[FileContent] = None) -> Dict[str, str]:
     """i18n properties dosyasını parse et"""
     try:
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
         i18n_dict = {}
         
         for line in text.split('\n'):
@@ -350,86 +397,32 @@ def parse_i18n_properties(fp: Path) -> Dict[str, str]:
         return {}
 
 
-def detect_database_access(fp: Path) -> List[Dict[str, Any]]:
+def detect_database_access(fp: Path, content: Optional[FileContent] = None) -> List[Dict[str, Any]]:
     """Dosyada veritabanı erişimlerini tespit et (i18n dosyalarını hariç tut)"""
     try:
         # i18n dosyalarını hariç tut
         if fp.name.endswith('.properties') or 'i18n' in str(fp).lower():
             return []
             
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
+        lines = line_index(text, content)
+        ctx = context_recorder(text, content)
         db_accesses = []
         
-        # Gerçek database erişim kalıpları
-        jdbc_patterns = [
-            r'jdbc:(\w+)://([^/\s]+)(?:/([^\s]+))?',
-            r'Connection\s*\.\s*createStatement',
-            r'PreparedStatement',
-            r'ResultSet',
-            r'Statement\s*\.\s*execute',
-            r'Statement\s*\.\s*executeQuery',
-            r'Statement\s*\.\s*executeUpdate'
-        ]
-        
-        # Gerçek SQL komutları (i18n metinlerini hariç tut)
-        sql_patterns = [
-            r'(?:^|\s)SELECT\s+.*?\s+FROM\s+(\w+)',
-            r'(?:^|\s)INSERT\s+INTO\s+(\w+)',
-            r'(?:^|\s)UPDATE\s+(\w+)\s+SET',
-            r'(?:^|\s)DELETE\s+FROM\s+(\w+)',
-            r'(?:^|\s)CREATE\s+TABLE\s+(\w+)',
-            r'(?:^|\s)ALTER\s+TABLE\s+(\w+)',
-            r'(?:^|\s)DROP\s+TABLE\s+(\w+)'
-        ]
-        
-        # Database connection patterns
-        conn_patterns = [
-            r'DataSource',
-            r'ConnectionPool',
-            r'getConnection',
-            r'DriverManager',
-            r'SQLException'
-        ]
-        
-        # SAP specific patterns
-        sap_db_patterns = [
-            r'SAP\s*DB',
-            r'HANA',
-            r'ABAP\s*Database',
-            r'Open\s*SQL',
-            r'Native\s*SQL',
-            r'CDS\s*View',
-            r'Core\s*Data\s*Services'
-        ]
-        
-        # ME/MII specific database patterns
-        me_mii_db_patterns = [
-            r'fetchBySQL\s*\(',
-            r'executeSQL\s*\(',
-            r'me_executeTransaction\s*\(',
-            r'executeTransaction\s*\(',
-            r'fetchBySQL\s*\(',
-            r'getData\s*\(',
-            r'getDataBySQL\s*\('
-        ]
-        
-        all_patterns = jdbc_patterns + sql_patterns + conn_patterns + sap_db_patterns + me_mii_db_patterns
-        
-        for pattern in all_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                # i18n metinlerini filtrele
-                match_text = match.group(0).lower()
-                if any(keyword in match_text for keyword in ['error.label', 'notification.label', 'message.label']):
-                    continue
-                    
-                db_accesses.append({
-                    "type": "Database Access",
-                    "pattern": pattern,
-                    "match": match.group(0),
-                    "line": text[:match.start()].count('\n') + 1,
-                    "context": text[max(0, match.start()-50):match.end()+50]
-                })
+        # Gerçek database erişim kalıpları (JDBC, SQL, connection, SAP, ME/MII)
+        for spec, match in pat.DB_ACCESS.finditer(scan_text(text, content)):
+            # i18n metinlerini filtrele
+            match_text = match.group(0).lower()
+            if any(keyword in match_text for keyword in pat.I18N_NOISE):
+                continue
+                
+            db_accesses.append({
+                "type": "Database Access",
+                "pattern": spec.label,
+                "match": match.group(0),
+                "line": lines.line(match.start()),
+                "context": ctx.ref(match.start(), match.end(), 50)
+            })
         
         return db_accesses
         
@@ -437,59 +430,32 @@ def detect_database_access(fp: Path) -> List[Dict[str, Any]]:
         return []
 
 
-def detect_rest_endpoints(fp: Path) -> List[Dict[str, Any]]:
+def detect_rest_endpoints(fp: Path, content: Optional[FileContent] = None) -> List[Dict[str, Any]]:
     """REST endpoint'lerini tespit et (i18n dosyalarını hariç tut)"""
     try:
         # i18n dosyalarını hariç tut
         if fp.name.endswith('.properties') or 'i18n' in str(fp).lower():
             return []
             
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
+        lines = line_index(text, content)
+        ctx = context_recorder(text, content)
         endpoints = []
         
-        # REST patterns
-        rest_patterns = [
-            r'@RequestMapping\s*\(\s*["\']([^"\']+)["\']',
-            r'@GetMapping\s*\(\s*["\']([^"\']+)["\']',
-            r'@PostMapping\s*\(\s*["\']([^"\']+)["\']',
-            r'@PutMapping\s*\(\s*["\']([^"\']+)["\']',
-            r'@DeleteMapping\s*\(\s*["\']([^"\']+)["\']',
-            r'@Path\s*\(\s*["\']([^"\']+)["\']',
-            r'@GET\s+@Path\s*\(\s*["\']([^"\']+)["\']',
-            r'@POST\s+@Path\s*\(\s*["\']([^"\']+)["\']',
-            r'@PUT\s+@Path\s*\(\s*["\']([^"\']+)["\']',
-            r'@DELETE\s+@Path\s*\(\s*["\']([^"\']+)["\']'
-        ]
-        
-        # SAPUI5/JavaScript endpoint patterns
-        js_endpoint_patterns = [
-            r'\.ajax\s*\(\s*\{[^}]*url\s*:\s*["\']([^"\']+)["\']',
-            r'fetch\s*\(\s*["\']([^"\']+)["\']',
-            r'new\s+sap\.ui\.model\.odata\.v2\.ODataModel\s*\(\s*["\']([^"\']+)["\']',
-            r'new\s+sap\.ui\.model\.odata\.v4\.ODataModel\s*\(\s*["\']([^"\']+)["\']',
-            r'\.read\s*\(\s*["\']([^"\']+)["\']',
-            r'\.create\s*\(\s*["\']([^"\']+)["\']',
-            r'\.update\s*\(\s*["\']([^"\']+)["\']',
-            r'\.remove\s*\(\s*["\']([^"\']+)["\']'
-        ]
-        
-        all_patterns = rest_patterns + js_endpoint_patterns
-        
-        for pattern in all_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                # i18n metinlerini filtrele
-                match_text = match.group(0).lower()
-                if any(keyword in match_text for keyword in ['error.label', 'notification.label', 'message.label']):
-                    continue
-                    
-                endpoints.append({
-                    "type": "REST Endpoint",
-                    "pattern": pattern,
-                    "path": match.group(1) if len(match.groups()) > 0 else match.group(0),
-                    "line": text[:match.start()].count('\n') + 1,
-                    "context": text[max(0, match.start()-50):match.end()+50]
-                })
+        # REST + SAPUI5/JavaScript endpoint patterns
+        for spec, match in pat.REST_ENDPOINTS.finditer(scan_text(text, content)):
+            # i18n metinlerini filtrele
+            match_text = match.group(0).lower()
+            if any(keyword in match_text for keyword in pat.I18N_NOISE):
+                continue
+                
+            endpoints.append({
+                "type": "REST Endpoint",
+                "pattern": spec.label,
+                "path": match.group(1) if len(match.groups()) > 0 else match.group(0),
+                "line": lines.line(match.start()),
+                "context": ctx.ref(match.start(), match.end(), 50)
+            })
         
         return endpoints
         
@@ -497,51 +463,32 @@ def detect_rest_endpoints(fp: Path) -> List[Dict[str, Any]]:
         return []
 
 
-def detect_bls_steps(fp: Path) -> List[Dict[str, Any]]:
+def detect_bls_steps(fp: Path, content: Optional[FileContent] = None) -> List[Dict[str, Any]]:
     """BLS/Transaction adımlarını tespit et (i18n dosyalarını hariç tut)"""
     try:
         # i18n dosyalarını hariç tut
         if fp.name.endswith('.properties') or 'i18n' in str(fp).lower():
             return []
             
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
+        lines = line_index(text, content)
+        ctx = context_recorder(text, content)
         bls_steps = []
         
         # Gerçek BLS step patterns (ME/MII specific)
-        bls_patterns = [
-            r'tracer\.executeTransaction\s*\(\s*["\']([^"\']+)["\']',
-            r'me_executeTransaction\s*\(\s*["\']([^"\']+)["\']',
-            r'executeTransaction\s*\(\s*["\']([^"\']+)["\']',
-            r'<Service\s+name\s*=\s*["\']([^"\']*BLS[^"\']*)["\']',
-            r'<Service\s+name\s*=\s*["\']([^"\']*TRX[^"\']*)["\']',
-            r'BLS_TRX_\w+',
-            r'TRX_\w+',
-            r'BLS_\w+',
-            r'BLS\s*Step',
-            r'Transaction\s*Step',
-            r'Business\s*Logic\s*Step',
-            r'ME\s*Step',
-            r'MII\s*Step',
-            r'Workflow\s*Step',
-            r'Process\s*Step',
-            r'Activity\s*Step'
-        ]
-        
-        for pattern in bls_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                # i18n metinlerini filtrele
-                match_text = match.group(0).lower()
-                if any(keyword in match_text for keyword in ['error.label', 'notification.label', 'message.label', 'checkbox cannot be changed']):
-                    continue
-                    
-                bls_steps.append({
-                    "type": "BLS Step",
-                    "pattern": pattern,
-                    "step": match.group(0),
-                    "line": text[:match.start()].count('\n') + 1,
-                    "context": text[max(0, match.start()-50):match.end()+50]
-                })
+        for spec, match in pat.BLS_STEPS.finditer(scan_text(text, content)):
+            # i18n metinlerini filtrele
+            match_text = match.group(0).lower()
+            if any(keyword in match_text for keyword in pat.BLS_NOISE):
+                continue
+                
+            bls_steps.append({
+                "type": "BLS Step",
+                "pattern": spec.label,
+                "step": match.group(0),
+                "line": lines.line(match.start()),
+                "context": ctx.ref(match.start(), match.end(), 50)
+            })
         
         return bls_steps
         
@@ -549,13 +496,13 @@ def detect_bls_steps(fp: Path) -> List[Dict[str, Any]]:
         return []
 
 
-def detect_ui_components(fp: Path) -> Dict[str, Any]:
+def detect_ui_components(fp: Path, content: Optional[FileContent] = None) -> Dict[str, Any]:
     """SAPUI5 UI bileşenlerini tespit et"""
     try:
         if not fp.suffix.lower() in ['.xml', '.view.xml', '.fragment.xml']:
             return {}
             
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
         
         # UI component patterns
         ui_components = {
@@ -571,113 +518,10 @@ def detect_ui_components(fp: Path) -> Dict[str, Any]:
             "trees": 0
         }
         
-        # Button patterns
-        button_patterns = [
-            r'<Button',
-            r'<sap\.m\.Button',
-            r'<core:Button',
-            r'<Button\s+',
-            r'<sap\.m\.Button\s+'
-        ]
-        
-        # Table patterns
-        table_patterns = [
-            r'<Table',
-            r'<sap\.m\.Table',
-            r'<core:Table',
-            r'<List',
-            r'<sap\.m\.List'
-        ]
-        
-        # Form patterns
-        form_patterns = [
-            r'<Form',
-            r'<sap\.ui\.layout\.form\.Form',
-            r'<SimpleForm',
-            r'<sap\.ui\.layout\.form\.SimpleForm'
-        ]
-        
-        # Input patterns
-        input_patterns = [
-            r'<Input',
-            r'<sap\.m\.Input',
-            r'<TextArea',
-            r'<sap\.m\.TextArea',
-            r'<ComboBox',
-            r'<sap\.m\.ComboBox',
-            r'<Select',
-            r'<sap\.m\.Select'
-        ]
-        
-        # Dialog patterns
-        dialog_patterns = [
-            r'<Dialog',
-            r'<sap\.m\.Dialog',
-            r'<Popover',
-            r'<sap\.m\.Popover'
-        ]
-        
-        # Panel patterns
-        panel_patterns = [
-            r'<Panel',
-            r'<sap\.m\.Panel',
-            r'<Page',
-            r'<sap\.m\.Page'
-        ]
-        
-        # Tab patterns
-        tab_patterns = [
-            r'<TabContainer',
-            r'<sap\.m\.TabContainer',
-            r'<Tab',
-            r'<sap\.m\.Tab'
-        ]
-        
-        # Chart patterns
-        chart_patterns = [
-            r'<Chart',
-            r'<sap\.viz\.Chart',
-            r'<VizFrame',
-            r'<sap\.viz\.VizFrame'
-        ]
-        
-        # Tree patterns
-        tree_patterns = [
-            r'<Tree',
-            r'<sap\.m\.Tree',
-            r'<TreeTable',
-            r'<sap\.ui\.table\.TreeTable'
-        ]
-        
-        # Count patterns
-        pattern_groups = [
-            (button_patterns, "buttons"),
-            (table_patterns, "tables"),
-            (form_patterns, "forms"),
-            (input_patterns, "inputs"),
-            (dialog_patterns, "dialogs"),
-            (panel_patterns, "panels"),
-            (tab_patterns, "tabs"),
-            (chart_patterns, "charts"),
-            (tree_patterns, "trees")
-        ]
-        
-        for patterns, component_type in pattern_groups:
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-                ui_components[component_type] += len(list(matches))
-        
-        # Lists are counted separately
-        list_patterns = [
-            r'<List',
-            r'<sap\.m\.List',
-            r'<StandardListItem',
-            r'<sap\.m\.StandardListItem'
-        ]
-        
-        for pattern in list_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            ui_components["lists"] += len(list(matches))
+        # Count patterns (lists are counted separately, see me_mii_patterns)
+        st = scan_text(text, content)
+        for component_type, family in pat.UI_COMPONENTS:
+            ui_components[component_type] += family.count(st)
         
         return ui_components
         
@@ -685,43 +529,95 @@ def detect_ui_components(fp: Path) -> Dict[str, Any]:
         return {}
 
 
-def analyze_sapui5_deep(root: Path) -> Dict[str, Any]:
-    """Derinlemesine SAPUI5 analizi"""
-    
-    result = {
-        "controllers": [],
-        "views": [],
-        "fragments": [],
-        "i18n": {},
-        "models": [],
-        "services": {
-            "odata": [],
-            "rest": []
-        },
-        "ui_components": {
-            "buttons": 0,
-            "tables": 0,
-            "forms": 0,
-            "inputs": 0,
-            "dialogs": 0
-        },
-        "navigation_flow": [],
-        "data_bindings": [],
-        "event_handlers": [],
-        "sap_me_apis": [],
-        "sfc_operations": [],
-        "me_mii_patterns": [],
-        "xml_analysis": [],
-        "parameter_flows": []
-    }
-    
-    for fp in root.rglob("*"):
-        if not fp.is_file():
-            continue
+class SAPUI5DeepCollector(Collector):
+    """Per-file accumulator behind analyze_sapui5_deep; fed by a ScanEngine."""
+
+    suffixes = DEEP_SUFFIXES
+
+    def __init__(self, sink=None, contexts: Optional[ContextStore] = None):
+        # sink: optional JsonLinesWriter; gets one record per artifact while merging
+        self.sink = sink
+        # contexts: snippet references of all stages are bound to one file table
+        self.contexts = contexts if contexts is not None else ContextStore()
+        self.data = {
+            "controllers": [],
+            "views": [],
+            "fragments": [],
+            "i18n": {},
+            "models": [],
+            "services": {
+                "odata": [],
+                "rest": []
+            },
+            "ui_components": {
+                "buttons": 0,
+                "tables": 0,
+                "forms": 0,
+                "inputs": 0,
+                "dialogs": 0
+            },
+            "navigation_flow": [],
+            "data_bindings": [],
+            "event_handlers": [],
+            "sap_me_apis": [],
+            "sfc_operations": [],
+            "me_mii_patterns": [],
+            "xml_analysis": [],
+            "parameter_flows": []
+        }
+
+    @classmethod
+    def parse(cls, entry: FileEntry):
+        fp = entry.path
         
         # Controller files
-        if fp.suffix == '.js' and 'controller' in fp.parts:
-            controller_data = parse_controller_deep(fp)
+        if entry.suffix == '.js' and 'controller' in entry.parts:
+            return ("controller", parse_controller_deep(fp, entry.content))
+        
+        # XML dosyaları için ME/MII analizi
+        elif entry.suffix == '.xml':
+            return ("xml", parse_xml_file(fp, entry.content))
+        
+        # View files
+        elif entry.suffix == '.xml' and 'view' in entry.parts:
+            return ("view", parse_view_xml(fp, entry.content))
+        
+        # Fragment files
+        elif entry.suffix == '.xml' and 'fragment' in entry.parts:
+            return ("fragment", str(fp))
+        
+        # i18n files
+        elif entry.name.endswith('.properties') and 'i18n' in entry.parts:
+            return ("i18n", parse_i18n_properties(fp, entry.content))
+        
+        return None
+
+    def merge(self, fragment):
+        if fragment is None:
+            return
+        kind, data = fragment
+        result = self.data
+        
+        # Snippet referanslarını dosya tablosuna bağla
+        contexts = self.contexts
+        n_files = len(contexts.files)
+        if kind == "controller" and data:
+            data = dict(data,
+                        sap_me_apis=contexts.bind_items(data["file"], data["sap_me_apis"]),
+                        sfc_operations=contexts.bind_items(data["file"], data["sfc_operations"]))
+        elif kind == "xml" and data:
+            data = dict(data,
+                        bls_steps=contexts.bind_items(data["file"], data["bls_steps"]),
+                        sfc_flow=contexts.bind_items(data["file"], data["sfc_flow"]),
+                        parameter_mapping=contexts.bind_items(data["file"], data["parameter_mapping"]))
+        
+        if self.sink is not None and data:
+            for fid in range(n_files, len(contexts.files)):
+                self.sink.write({"kind": "context_file", "data": dict(contexts.file_record(fid), id=fid)})
+            self.sink.write({"kind": kind, "data": data})
+        
+        if kind == "controller":
+            controller_data = data
             if controller_data:
                 result["controllers"].append(controller_data)
                 result["event_handlers"].extend(controller_data["event_handlers"])
@@ -750,9 +646,8 @@ def analyze_sapui5_deep(root: Path) -> Dict[str, Any]:
                     if pattern not in result["me_mii_patterns"]:
                         result["me_mii_patterns"].append(pattern)
         
-        # XML dosyaları için ME/MII analizi
-        elif fp.suffix == '.xml':
-            xml_data = parse_xml_file(fp)
+        elif kind == "xml":
+            xml_data = data
             if xml_data:
                 result["xml_analysis"].append(xml_data)
                 
@@ -765,9 +660,8 @@ def analyze_sapui5_deep(root: Path) -> Dict[str, Any]:
                     if op not in result["me_mii_patterns"]:
                         result["me_mii_patterns"].append(op)
         
-        # View files
-        elif fp.suffix == '.xml' and 'view' in fp.parts:
-            view_data = parse_view_xml(fp)
+        elif kind == "view":
+            view_data = data
             if view_data:
                 result["views"].append(view_data)
                 result["data_bindings"].extend(view_data["bindings"])
@@ -786,21 +680,80 @@ def analyze_sapui5_deep(root: Path) -> Dict[str, Any]:
                     elif 'dialog' in ctrl_type:
                         result["ui_components"]["dialogs"] += 1
         
-        # Fragment files
-        elif fp.suffix == '.xml' and 'fragment' in fp.parts:
-            result["fragments"].append(str(fp))
+        elif kind == "fragment":
+            result["fragments"].append(data)
         
-        # i18n files
-        elif fp.name.endswith('.properties') and 'i18n' in fp.parts:
-            i18n_data = parse_i18n_properties(fp)
-            result["i18n"].update(i18n_data)
-    
-    return result
+        elif kind == "i18n":
+            result["i18n"].update(data)
+
+    def result(self) -> Dict[str, Any]:
+        # [file_id, offset, length] referansları snippet metnine çözülür: JSON
+        # (RAG corpus, indirilen zip) kaynak ağacından bağımsız kalır
+        return self.contexts.resolve(self.data)
+
+
+def analyze_sapui5_deep(root: Path) -> Dict[str, Any]:
+    """Derinlemesine SAPUI5 analizi"""
+    collector = SAPUI5DeepCollector()
+    ScanEngine(root).add(collector).run()
+    return collector.result()
+
+
+class DetectionCollector(Collector):
+    """DB / REST / BLS / UI component detectors over source files."""
+
+    suffixes = DETECTION_SUFFIXES
+
+    def __init__(self, contexts: Optional[ContextStore] = None):
+        self.contexts = contexts if contexts is not None else ContextStore()
+        self.db_accesses = []
+        self.rest_endpoints = []
+        self.bls_steps = []
+        self.ui_components_total = {
+            "buttons": 0,
+            "tables": 0,
+            "forms": 0,
+            "inputs": 0,
+            "dialogs": 0,
+            "lists": 0,
+            "panels": 0,
+            "tabs": 0,
+            "charts": 0,
+            "trees": 0
+        }
+
+    @classmethod
+    def parse(cls, entry: FileEntry):
+        file_path = entry.path
+        content = entry.content
+        return (
+            str(file_path),
+            detect_database_access(file_path, content),
+            detect_rest_endpoints(file_path, content),
+            detect_bls_steps(file_path, content),
+            detect_ui_components(file_path, content),
+        )
 
+    def merge(self, fragment):
+        path, db_accesses, rest_endpoints, bls_steps, ui_components = fragment
+        bind = self.contexts.bind_items
+        self.db_accesses.extend(bind(path, db_accesses))
+        self.rest_endpoints.extend(bind(path, rest_endpoints))
+        self.bls_steps.extend(bind(path, bls_steps))
+        
+        # UI Components tespiti
+        for component_type, count in ui_components.items():
+            self.ui_components_total[component_type] += count
 
-def build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses=None, rest_endpoints=None, bls_steps=None, ui_components=None) -> str:
+
+def build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses=None, rest_endpoints=None, bls_steps=None, ui_components=None,
+                           contexts: Optional[ContextStore] = None) -> str:
     """Gelişmiş özet rapor"""
     
+    # Snippet metinleri sadece raporda gösterilenler için dosyadan üretilir
+    if contexts is None:
+        contexts = ContextStore(sapui5_deep.get('context_files'))
+    
     lines = []
     lines.append("# SAP ME/MII Advanced Analysis Report\n")
     
@@ -862,7 +815,7 @@ def build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses=N
             for access in accesses[:5]:  # Show first 5
                 lines.append(f"- **Line {access.get('line', '?')}:** {access.get('match', access.get('step', 'Unknown'))}")
                 if 'context' in access:
-                    context = access['context'].strip()
+                    context = contexts.text(access['context']).strip()
                     if len(context) > 100:
                         context = context[:100] + "..."
                     lines.append(f"  ```")
@@ -880,7 +833,7 @@ def build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses=N
         for endpoint in rest_endpoints[:10]:  # Show first 10
             lines.append(f"- **{endpoint.get('path', 'Unknown')}** (Line {endpoint.get('line', '?')})")
             if 'context' in endpoint:
-                context = endpoint['context'].strip()
+                context = contexts.text(endpoint['context']).strip()
                 if len(context) > 100:
                     context = context[:100] + "..."
                 lines.append(f"  ```")
@@ -898,7 +851,7 @@ def build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses=N
         for step in bls_steps[:10]:  # Show first 10
             lines.append(f"- **{step.get('step', 'Unknown')}** (Line {step.get('line', '?')})")
             if 'context' in step:
-                context = step['context'].strip()
+                context = contexts.text(step['context']).strip()
                 if len(context) > 100:
                     context = context[:100] + "..."
                 lines.append(f"  ```")
@@ -949,7 +902,7 @@ def build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses=N
     # Navigation Flow
     if sapui5_deep['navigation_flow']:
         lines.append("## 🗺️ Navigation Flow\n")
-        unique_navs = list(set(sapui5_deep['navigation_flow']))
+        unique_navs = list(dict.fromkeys(sapui5_deep['navigation_flow']))  # sıra korunur (deterministik çıktı)
         for nav in unique_navs[:10]:
             lines.append(f"- → {nav}")
         lines.append("")
@@ -1069,58 +1022,62 @@ def main_advanced():
     @click.command()
     @click.option('--root', type=click.Path(path_type=Path, exists=True), required=True)
     @click.option('--out', type=click.Path(path_type=Path), default=Path('./out_advanced'))
-    def run(root: Path, out: Path):
+    @click.option('--workers', type=click.IntRange(min=1), default=os.cpu_count() or 1, show_default=True,
+                  help='Worker processes for per-file parsing (1 = single process).')
+    @click.option('--cache/--no-cache', default=True, show_default=True,
+                  help='Incremental mode: re-parse only files changed since the last run in --out.')
+    @click.option('--jsonl', is_flag=True, default=False,
+                  help='Also write sapui5_deep_analysis.jsonl (one record per artifact, streamed during the scan).')
+    @click.option('--java-parser', type=click.Choice(JAVA_PARSERS), default='ast', show_default=True,
+                  help='Java extraction: full javalang AST, or tokenizer-only (faster, no AST).')
+    @click.option('--java-cache/--no-java-cache', default=True, show_default=True,
+                  help=f'Reuse Java parse results by content hash ({DEFAULT_JAVA_CACHE_DIR}).')
+    def run(root: Path, out: Path, workers: int, cache: bool, jsonl: bool, java_parser: str, java_cache: bool):
         print(f"[bold green]SAP ME/MII Advanced Analyzer[/bold green] — scanning: [cyan]{root}[/cyan]")
         out.mkdir(parents=True, exist_ok=True)
-        
-        # Base analiz
-        print("[1/3] Running base analysis...")
-        base_result, sapui5_basic = base_analyzer.analyze_folder_extended(root)
-        
-        # Deep SAPUI5 analiz
-        print("[2/4] Deep SAPUI5 analysis...")
-        sapui5_deep = analyze_sapui5_deep(root)
-        
-        # Veritabanı ve endpoint tespiti
-        print("[3/5] Database and endpoint detection...")
-        db_accesses = []
-        rest_endpoints = []
-        bls_steps = []
-        ui_components_total = {
-            "buttons": 0,
-            "tables": 0,
-            "forms": 0,
-            "inputs": 0,
-            "dialogs": 0,
-            "lists": 0,
-            "panels": 0,
-            "tabs": 0,
-            "charts": 0,
-            "trees": 0
-        }
-        
-        # Tüm dosyaları tara
-        for file_path in root.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in ['.java', '.js', '.xml', '.properties']:
-                db_accesses.extend(detect_database_access(file_path))
-                rest_endpoints.extend(detect_rest_endpoints(file_path))
-                bls_steps.extend(detect_bls_steps(file_path))
-                
-                # UI Components tespiti
-                ui_components = detect_ui_components(file_path)
-                for component_type, count in ui_components.items():
-                    ui_components_total[component_type] += count
+        configure_java_parser(java_parser, DEFAULT_JAVA_CACHE_DIR if java_cache else None)
+        
+        # Tek tarama: base, deep SAPUI5 ve tespit aşamaları aynı dosya akışını paylaşır
+        print(f"[1/2] Scanning files (base + deep SAPUI5 + detection, workers={workers})...")
+        base_collector = base_analyzer.ExtendedCollector()
+        deep_sink = JsonLinesWriter(out / 'sapui5_deep_analysis.jsonl').open() if jsonl else None
+        contexts = ContextStore()
+        deep_collector = SAPUI5DeepCollector(sink=deep_sink, contexts=contexts)
+        detection = DetectionCollector(contexts=contexts)
+        engine = ScanEngine(root)
+        base_collector.register(engine)
+        engine.add(deep_collector).add(detection)
+        scan_cache = None
+        if cache:
+            scan_cache = AnalysisCache.load(out, root, [type(c) for c in engine.collectors],
+                                            settings={"java_parser": java_parser})
+        try:
+            engine.run(workers=workers, cache=scan_cache)
+        except BaseException:
+            if deep_sink is not None:
+                deep_sink.abort()
+            raise
+        if deep_sink is not None:
+            deep_sink.close()
+        if scan_cache is not None:
+            scan_cache.save()
+            print(f"      incremental cache: {scan_cache.hits} reused, {scan_cache.misses} parsed")
+        
+        base_result, sapui5_basic = base_collector.result()
+        sapui5_deep = deep_collector.result()
+        db_accesses = detection.db_accesses
+        rest_endpoints = detection.rest_endpoints
+        bls_steps = detection.bls_steps
+        ui_components_total = detection.ui_components_total
         
         # Rapor oluştur
-        print("[4/5] Generating reports...")
-        summary = build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses, rest_endpoints, bls_steps, ui_components_total)
+        print("[2/2] Generating reports...")
+        summary = build_advanced_summary(base_result, sapui5_basic, sapui5_deep, db_accesses, rest_endpoints, bls_steps, ui_components_total,
+                                         contexts=contexts)
         (out / 'ADVANCED_SUMMARY.md').write_text(summary, encoding='utf-8')
         
-        # Deep SAPUI5 JSON
-        (out / 'sapui5_deep_analysis.json').write_text(
-            json.dumps(sapui5_deep, indent=2, ensure_ascii=False),
-            encoding='utf-8'
-        )
+        # Deep SAPUI5 JSON (bölüm bölüm yazılır, tüm doküman string olarak kurulmaz)
+        dump_json(sapui5_deep, out / 'sapui5_deep_analysis.json')
         
         # Base outputs
         base_summary = base_analyzer.build_extended_summary(base_result, sapui5_basic)
@@ -1129,6 +1086,8 @@ def main_advanced():
         print(f"\n[bold]Done.[/bold] Outputs -> {out.resolve()}")
         print(" - ADVANCED_SUMMARY.md (Enhanced!)")
         print(" - sapui5_deep_analysis.json (Enhanced!)")
+        if deep_sink is not None:
+            print(f" - sapui5_deep_analysis.jsonl ({deep_sink.count} records)")
         print(" - SUMMARY.md")
         print(" - sapui5_details.json")
         print(f"\n[bold green]Analysis Quality Improvements:[/bold green]")
@@ -0,0 +1,230 @@
+"""
+SAP ME/MII Incremental Analysis Cache
+- Persistent per-file manifest in the output directory
+- path, size, mtime and content hash of every analysed file
+- Serialized per-file parse results of each Collector stage
+
+On the next run unchanged files are served from the manifest and only new
+or modified files are parsed again; the aggregate outputs are rebuilt from
+the cached fragments by the collectors' merge step.
+
+A file is considered unchanged when size and mtime match, or (after a
+touch/checkout) when its content hash matches. The manifest is discarded
+when the scanned root, the analyzer code or the parse settings change.
+
+ContentCache is a second, content-addressed store (one small JSON file per
+content hash) for expensive per-file parses such as the Java AST; it is
+shared by all roots and output directories. prune() drops entries unused
+for max_age_s, then the least recently used ones above max_bytes.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from me_mii_scanner import FileEntry
+
+CACHE_FILENAME = ".analysis_manifest.json"
+CACHE_VERSION = 1
+
+# ContentCache limits (entries of an older parser salt are never read again)
+CONTENT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+CONTENT_CACHE_MAX_AGE_S = 30 * 24 * 3600
+
+
+def code_fingerprint(collector_types: Iterable[type], settings: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of the modules that define the collectors' parse logic (and of
+    the settings that change parse results, e.g. the Java parser mode)."""
+    # Shared pattern registry and Java extraction are part of the parse logic as well
+    modules = {__name__, "me_mii_scanner", "me_mii_patterns", "me_mii_java"}
+    for ct in collector_types:
+        for klass in ct.__mro__:
+            modules.add(klass.__module__)
+    return module_fingerprint(modules, CACHE_VERSION, settings)
+
+
+def module_fingerprint(modules: Iterable[str], *salt: Any) -> str:
+    """Hash of the source files of the given (loaded) modules and salt."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(salt, sort_keys=True, default=str).encode())
+    for name in sorted(modules):
+        mod = sys.modules.get(name)
+        src = getattr(mod, "__file__", None)
+        if not src or not src.endswith(".py"):
+            continue
+        try:
+            h.update(Path(src).read_bytes())
+        except OSError:
+            h.update(name.encode())
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """Per-file fragment cache used by ScanEngine.run(cache=...)."""
+
+    def __init__(self, path: Path, root: Path, fingerprint: str, files: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.root = str(root)
+        self.fingerprint = fingerprint
+        self._old: Dict[str, Any] = files or {}
+        self._new: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, out_dir: Path, root: Path, collector_types: Iterable[type],
+             settings: Optional[Dict[str, Any]] = None) -> "AnalysisCache":
+        path = Path(out_dir) / CACHE_FILENAME
+        fingerprint = code_fingerprint(collector_types, settings)
+        files = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") == fingerprint and data.get("root") == str(root):
+                files = data.get("files") or {}
+        except (OSError, ValueError):
+            files = None
+        return cls(path, root, fingerprint, files)
+
+    def lookup(self, entry: FileEntry, collector_types: Tuple[type, ...],
+               indices: Tuple[int, ...]) -> Optional[List[Tuple[int, Any]]]:
+        """Cached fragments for entry, or None if it must be parsed again."""
+        key = str(entry.path)
+        rec = self._old.get(key)
+        if rec is None:
+            self.misses += 1
+            return None
+
+        stored = rec.get("fragments", {})
+        names = [collector_types[i].__name__ for i in indices]
+        if any(n not in stored for n in names):
+            self.misses += 1
+            return None
+
+        if rec.get("size") != entry.size or rec.get("mtime") != entry.mtime:
+            # Touched or rewritten: only the content decides
+            try:
+                digest = entry.content.digest()
+            except OSError:
+                digest = None
+            if digest is None or digest != rec.get("hash"):
+                self.misses += 1
+                return None
+            rec = dict(rec, size=entry.size, mtime=entry.mtime)
+
+        self.hits += 1
+        self._new[key] = rec
+        return [(i, collector_types[i].load_fragment(stored[n])) for i, n in zip(indices, names)]
+
+    def store(self, entry: FileEntry, collector_types: Tuple[type, ...],
+              fragments: List[Tuple[int, Any]], digest: Optional[str]):
+        if digest is None:
+            return
+        self._new[str(entry.path)] = {
+            "size": entry.size,
+            "mtime": entry.mtime,
+            "hash": digest,
+            "fragments": {collector_types[i].__name__: collector_types[i].dump_fragment(frag)
+                          for i, frag in fragments},
+        }
+
+    def save(self):
+        """Write the manifest (only files seen in this run are kept)."""
+        data = {
+            "version": CACHE_VERSION,
+            "root": self.root,
+            "fingerprint": self.fingerprint,
+            "files": self._new,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+
+class ContentCache:
+    """Persistent parse results keyed by file content hash.
+
+    Entries live in ``directory/<2 hex>/<key>.json``; the key mixes the
+    content digest with ``salt`` (parser code and settings), so stale
+    entries are never read; they age out in prune(). A hit refreshes the
+    entry's mtime, which serves as its last-use time. Writes are atomic and
+    independent per entry, so worker processes can share one directory.
+    """
+
+    def __init__(self, directory: Path, salt: str, max_bytes: int = CONTENT_CACHE_MAX_BYTES,
+                 max_age_s: float = CONTENT_CACHE_MAX_AGE_S):
+        self.directory = Path(directory)
+        self.salt = salt
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, digest: str) -> Path:
+        key = hashlib.blake2b(f"{self.salt}:{digest}".encode(), digest_size=16).hexdigest()
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Stored record for digest, or None on a miss."""
+        path = self._path(digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return record
+
+    def prune(self) -> int:
+        """Delete entries (of any salt) unused for max_age_s, then least
+        recently used ones until the directory is under max_bytes; returns
+        the number of entries removed."""
+        now = time.time()
+        entries = []
+        try:
+            for path in self.directory.glob("*/*.json"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        except OSError:
+            return 0
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age_s and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def put(self, digest: str, record: Dict[str, Any]):
+        path = self._path(digest)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            # A read-only or full cache directory only costs the re-parse
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,179 @@
+"""
+SAP ME/MII Context Snippets
+- ContextRecorder (parse side, one per file): turns a match span into a
+  reference instead of copying the surrounding text; identical spans and
+  identical snippet texts are interned to one reference; total snippet
+  bytes per file are capped
+- ContextStore (merge side, one per run): numbers the files and binds
+  per-file references to them; snippet text is produced on demand, only
+  while the file still matches the size/mtime/hash recorded when bound
+
+References in the outputs:
+  local  [offset, length]           (as returned by the parsers)
+  bound  [file_id, offset, length]  (after ContextStore.bind_items)
+  text   str                        (after ContextStore.resolve, exported JSON)
+Offsets are character offsets into the file's decoded text (FileContent.text).
+A context of None means the file's snippet budget was exhausted.
+"""
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from me_mii_scanner import FileContent
+
+# Snippet budget per file (UTF-8 bytes) and upper bound for a single snippet
+MAX_CONTEXT_BYTES_PER_FILE = 64 * 1024
+MAX_SNIPPET_CHARS = 400
+
+_CURRENT = object()  # file_id(): take the file's signature now
+
+
+class ContextRecorder:
+    """Interning, byte-capped snippet capture for one file's text."""
+
+    __slots__ = ("text", "max_bytes", "used", "dropped", "_spans", "_interned")
+
+    def __init__(self, text: str, max_bytes: int = MAX_CONTEXT_BYTES_PER_FILE):
+        self.text = text
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.dropped = 0
+        self._spans: Dict[Tuple[int, int], Optional[List[int]]] = {}
+        self._interned: Dict[str, List[int]] = {}
+
+    def ref(self, start: int, end: int, pad: int) -> Optional[List[int]]:
+        """Reference to text[start-pad:end+pad] (clipped to MAX_SNIPPET_CHARS)."""
+        s = max(0, start - pad)
+        e = min(len(self.text), end + pad, s + MAX_SNIPPET_CHARS)
+        key = (s, e)
+        if key in self._spans:
+            return self._spans[key]
+
+        snippet = self.text[s:e]
+        ref = self._interned.get(snippet)
+        if ref is None:
+            size = len(snippet.encode("utf-8"))
+            if self.used + size > self.max_bytes:
+                self.dropped += 1
+                self._spans[key] = None
+                return None
+            self.used += size
+            ref = [s, e - s]
+            self._interned[snippet] = ref
+        self._spans[key] = ref
+        return ref
+
+
+def context_recorder(text: str, content: Optional[FileContent] = None) -> ContextRecorder:
+    """Recorder for a file; shared via the content handle so all parsers of
+    the file draw from one budget and one intern table."""
+    if content is not None:
+        return content.derived("context_recorder", lambda: ContextRecorder(text))
+    return ContextRecorder(text)
+
+
+class ContextStore:
+    """File table for bound references and on-demand snippet text."""
+
+    def __init__(self, files: Optional[Iterable[Any]] = None, cache_files: int = 8):
+        self.files: List[str] = []
+        # size/mtime/hash of each file when its references were bound
+        self.signatures: List[Optional[Dict[str, Any]]] = []
+        self._ids: Dict[str, int] = {}
+        self._texts: "OrderedDict[int, str]" = OrderedDict()
+        self._cache_files = cache_files
+        for f in files or []:
+            # to_json() records; plain paths carry no signature and never resolve
+            if isinstance(f, dict):
+                self.file_id(f.get("path", ""), {k: f.get(k) for k in ("size", "mtime", "hash")})
+            else:
+                self.file_id(f, None)
+
+    def file_id(self, path: str, signature: Any = _CURRENT) -> int:
+        """Id of path; a new file gets its current signature unless one is given."""
+        path = str(path)
+        fid = self._ids.get(path)
+        if fid is None:
+            fid = self._ids[path] = len(self.files)
+            self.files.append(path)
+            self.signatures.append(_signature(Path(path)) if signature is _CURRENT else signature)
+        return fid
+
+    def bind_items(self, path: str, items: List[Dict[str, Any]], key: str = "context") -> List[Dict[str, Any]]:
+        """Copies of items with local references of path bound to its file id.
+
+        The input items are not modified (they may also live in the
+        incremental cache).
+        """
+        if not items:
+            return items
+        fid = self.file_id(path)
+        out = []
+        for item in items:
+            ref = item.get(key)
+            if ref is not None and len(ref) == 2:
+                item = dict(item)
+                item[key] = [fid, ref[0], ref[1]]
+            out.append(item)
+        return out
+
+    def _file_text(self, fid: int) -> str:
+        text = self._texts.get(fid)
+        if text is None:
+            text = ""
+            try:
+                sig = self.signatures[fid]
+                fp = Path(self.files[fid])
+                st = os.stat(fp)
+                content = FileContent(fp)
+                # References are offsets into the bound content: an edited
+                # file (same size and mtime, or same hash) must not be sliced
+                if sig and ((st.st_size, st.st_mtime_ns) == (sig.get("size"), sig.get("mtime"))
+                            or content.digest() == sig.get("hash")):
+                    text = content.text
+            except (OSError, IndexError):
+                pass
+            self._texts[fid] = text
+            if len(self._texts) > self._cache_files:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(fid)
+        return text
+
+    def text(self, ref: Any) -> str:
+        """Snippet text for a bound reference (plain strings pass through)."""
+        if ref is None:
+            return ""
+        if isinstance(ref, str):
+            return ref
+        fid, offset, length = ref
+        return self._file_text(fid)[offset:offset + length]
+
+    def resolve(self, obj: Any, key: str = "context") -> Any:
+        """Copy of obj (nested lists/dicts) with every reference under key
+        replaced by its snippet text, e.g. for an exported JSON that must
+        not depend on the source tree."""
+        if isinstance(obj, list):
+            return [self.resolve(v, key) for v in obj]
+        if isinstance(obj, dict):
+            out = {k: self.resolve(v, key) for k, v in obj.items()}
+            ref = obj.get(key)
+            if isinstance(ref, list) and len(ref) == 3:
+                out[key] = self.text(ref)
+            return out
+        return obj
+
+    def file_record(self, fid: int) -> Dict[str, Any]:
+        return dict(self.signatures[fid] or {}, path=self.files[fid])
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        return [self.file_record(fid) for fid in range(len(self.files))]
+
+
+def _signature(fp: Path) -> Optional[Dict[str, Any]]:
+    try:
+        st = os.stat(fp)
+        return {"size": st.st_size, "mtime": st.st_mtime_ns, "hash": FileContent(fp).digest()}
+    except OSError:
+        return None
@@ -7,11 +7,12 @@ What it does (MVP):
   • Java (.java) → classes, methods, @Path, @GET/@POST, JDBC heuristics, outbound HTTP calls
   • XML (.xml) → MII BLS/Transaction steps (Action/Target), simple WSDL endpoint extraction
   • Properties/Config (.properties, .yaml, .yml, .json) → endpoints/DSNs heuristics
-- Build a relationship graph (NetworkX)
+- Build a relationship graph (interned node table, columnar edges; NetworkX on demand)
 - Generate:
   • SUMMARY.md (architecture & integration overview)
   • TRAINING.md (role-based training outline + FAQ skeleton)
-  • graph.mmd (Mermaid) and graph.json (edges)
+  • graph.mmd (Mermaid), graph.json (edges) and graph.npz (columnar node/edge
+    tables, memory-mapped by me_mii_graph_store.load_graph)
 
 Usage:
   pip install -r requirements.txt
@@ -21,6 +22,7 @@ Requirements (create requirements.txt):
   javalang
   lxml
   networkx
+  numpy
   pydantic
   click
   rich
@@ -35,13 +37,18 @@ import re
 import os
 import json
 import pathlib
+from array import array
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterator, List, NamedTuple, Optional, Dict, Any, Tuple
 
 import click
 from rich import print
 from pydantic import BaseModel, Field
-import networkx as nx
+
+from me_mii_cache import ContentCache, module_fingerprint
+from me_mii_graph_store import save_graph
+from me_mii_java import JavaDecl, extract_ast, extract_fast
+from me_mii_scanner import Collector, FileContent, FileEntry, LineIndex, ScanEngine, file_text
 
 # Optional deps guarded
 try:
@@ -90,6 +97,61 @@ class AnalysisResult(BaseModel):
     endpoints: List[Dict[str, Any]] = Field(default_factory=list)
     db_usages: List[Dict[str, Any]] = Field(default_factory=list)
 
+def _model_dump(model: BaseModel) -> Dict[str, Any]:
+    # pydantic v2 / v1
+    return model.model_dump() if hasattr(model, "model_dump") else model.dict()
+
+def _model_construct(model: type, **fields) -> BaseModel:
+    # pydantic v2 / v1; no validation (fields come from the records below)
+    return model.model_construct(**fields) if hasattr(model, "model_construct") else model.construct(**fields)
+
+# -----------------------------
+# Pipeline Records
+# -----------------------------
+# Parsers, collectors and the caches pass these tuple-backed records (no
+# per-object validation, no __dict__; JSON-serialisable as plain lists).
+# The pydantic models above are built from them once, in
+# FolderCollector.result(). Records are not modified after construction.
+class JavaMethodRec(NamedTuple):
+    name: str
+    params: List[str]
+    endpoints: List[Dict[str, Any]]  # {method, path}
+    sql_usages: List[str]
+    http_calls: List[str]
+
+    def export(self) -> JavaMethod:
+        return _model_construct(JavaMethod, name=self.name, params=self.params, endpoints=self.endpoints,
+                                sql_usages=self.sql_usages, http_calls=self.http_calls)
+
+class JavaClassRec(NamedTuple):
+    name: str
+    package: Optional[str]
+    methods: List[JavaMethodRec]
+    file: Optional[str]
+
+    @classmethod
+    def load(cls, data, file: Optional[str] = None) -> "JavaClassRec":
+        name, package, methods = data[:3]
+        return cls(name, package, [JavaMethodRec(*m) for m in methods], data[3] if file is None else file)
+
+    def export(self) -> JavaClass:
+        return _model_construct(JavaClass, name=self.name, package=self.package,
+                                methods=[m.export() for m in self.methods], file=self.file)
+
+class BLSRec(NamedTuple):
+    action: Optional[str]
+    target: Optional[str]
+    name: Optional[str]
+
+    def export(self) -> BLSNode:
+        return _model_construct(BLSNode, action=self.action, target=self.target, name=self.name)
+
+class RelationRec(NamedTuple):
+    src: str
+    dst: str
+    type: str
+    meta: Dict[str, Any]  # may be shared by all records of a file
+
 # -----------------------------
 # Utilities
 # -----------------------------
@@ -109,108 +171,277 @@ CONFIG_DSN_PAT = re.compile(r"\bjdbc:[^\s]+\b", re.IGNORECASE)
 
 SUPPORTED_XML_HINTS = ("BLS", "Transaction", "WSDL")
 
+# XML files at or above this size are parsed in streaming mode (no element tree)
+XML_STREAM_THRESHOLD = 8 * 1024 * 1024
+XML_PARAM_TAGS = ("Parameter", "Input", "Output")
+# Byte versions of the WSDL patterns for the streaming mode (memory-mapped files)
+WSDL_SVC_PAT_B = re.compile(WSDL_SVC_PAT.pattern.encode(), re.IGNORECASE)
+WSDL_PORT_PAT_B = re.compile(WSDL_PORT_PAT.pattern.encode(), re.IGNORECASE)
+WSDL_ADDRESS_PAT_B = re.compile(WSDL_ADDRESS_PAT.pattern.encode(), re.IGNORECASE)
+
+# Java extraction: "ast" (javalang parse) or "fast" (tokenizer only, see me_mii_java).
+# Settings are read from the environment so worker processes inherit them
+# (configure_java_parser sets both).
+JAVA_PARSERS = ("ast", "fast")
+JAVA_PARSER_ENV = "ME_MII_JAVA_PARSER"
+JAVA_CACHE_ENV = "ME_MII_JAVA_CACHE"
+DEFAULT_JAVA_CACHE_DIR = Path.home() / ".cache" / "sapdocai" / "java"
+HTTP_METHODS = {"GET", "POST", "PUT", "DELETE", "PATCH"}
+
+CONFIG_SUFFIXES = {".properties", ".yaml", ".yml", ".json"}
+FOLDER_SUFFIXES = {".java", ".xml"} | CONFIG_SUFFIXES
+
 # -----------------------------
 # Parsers
 # -----------------------------
 
-def parse_java_file(fp: Path) -> Optional[JavaClass]:
-    try:
-        text = fp.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
+def configure_java_parser(parser: str = "ast", cache_dir: Optional[Path] = None):
+    """Select the Java extraction mode and the persistent parse cache
+    (None disables it) for this process and the worker processes it starts.
+    The cache is pruned once here (entries of older parser versions age out)."""
+    if parser not in JAVA_PARSERS:
+        raise ValueError(f"unknown Java parser: {parser!r} (expected one of {JAVA_PARSERS})")
+    os.environ[JAVA_PARSER_ENV] = parser
+    if cache_dir is not None:
+        os.environ[JAVA_CACHE_ENV] = str(cache_dir)
+        java_parse_cache(parser).prune()
+    else:
+        os.environ.pop(JAVA_CACHE_ENV, None)
+
+
+_java_caches: Dict[Tuple[str, str], ContentCache] = {}
+
+
+def java_parse_cache(parser: str) -> Optional[ContentCache]:
+    """Content-hash cache of parse_java_file results, if configured."""
+    directory = os.environ.get(JAVA_CACHE_ENV)
+    if not directory:
         return None
+    cache = _java_caches.get((directory, parser))
+    if cache is None:
+        # Entries depend on the extraction code, the javalang version and the mode
+        salt = module_fingerprint({__name__, "me_mii_java"}, "java", parser,
+                                  getattr(javalang, "__version__", None) if HAS_JAVALANG else None)
+        cache = _java_caches[(directory, parser)] = ContentCache(Path(directory), salt)
+    return cache
+
+
+def _java_class(fp: Path, text: str, decl: JavaDecl) -> JavaClassRec:
+    """Class record with endpoint/SQL/HTTP heuristics from an extracted declaration."""
+    jc = JavaClassRec(decl.name, decl.package, [], str(fp))
+    for m in decl.methods:
+        jm = JavaMethodRec(m.name, list(m.params), [], [], [])
+        # annotations → HTTP method & @Path
+        http_methods = [a for a, _ in m.annotations if a in HTTP_METHODS]
+        path = next((arg for a, arg in m.annotations if a == "Path" and arg is not None), None)
+        if http_methods and path is not None:
+            jm.endpoints.append({"method": http_methods[0], "path": path})
+        # heuristics: SQL & HTTP calls, searched in place within the method body
+        if m.body is not None:
+            start, end = m.body
+            if SQL_PAT.search(text, start, end) or JDBC_PAT.search(text, start, end):
+                jm.sql_usages.append("heuristic")
+            for u in JAVA_HTTP_PAT.findall(text, start, end):
+                jm.http_calls.append(u)
+        jc.methods.append(jm)
+    return jc
+
+
+def _parse_java_heuristic(fp: Path, text: str) -> JavaClassRec:
+    """Regex fallback without javalang."""
+    # class name
+    m = re.search(r"class\s+(\w+)", text)
+    name = m.group(1) if m else fp.stem
+    pkg = None
+    m2 = re.search(r"package\s+([\w\.]+);", text)
+    if m2:
+        pkg = m2.group(1)
+    jc = JavaClassRec(name, pkg, [], str(fp))
+    # crude method detection
+    matches = list(re.finditer(r"(public|protected|private)\s+[\w\<\>\[\]]+\s+(\w+)\s*\(([^)]*)\)\s*\{", text))
+    for i, mm in enumerate(matches):
+        meth_name = mm.group(2)
+        params = [p.strip().split()[-1] if " " in p.strip() else p.strip() for p in mm.group(3).split(',') if p.strip()]
+        jm = JavaMethodRec(meth_name, params, [], [], [])
+        # annotations
+        # find annotations above this method (up to 3 lines back, not past the previous method)
+        start = max(0, mm.start() - 300, matches[i - 1].end() if i else 0)
+        http_match = HTTP_ANN_PAT.search(text, start, mm.start())
+        path_match = PATH_ANN_PAT.search(text, start, mm.start())
+        if http_match and path_match:
+            jm.endpoints.append({"method": http_match.group(1), "path": path_match.group(1)})
+        # sql/http (up to the next method)
+        end = min(mm.end() + 1200, matches[i + 1].start() if i + 1 < len(matches) else len(text))
+        if SQL_PAT.search(text, mm.end(), end) or JDBC_PAT.search(text, mm.end(), end):
+            jm.sql_usages.append("heuristic")
+        for u in JAVA_HTTP_PAT.findall(text, mm.end(), end):
+            jm.http_calls.append(u)
+        jc.methods.append(jm)
+    return jc
+
+
+def parse_java_text(fp: Path, text: str, parser: str = "ast") -> Optional[JavaClassRec]:
+    """First class of a Java source (None if it declares no class).
+
+    "ast" falls back to the token-based extractor when javalang cannot
+    parse the file, so a syntax error no longer drops the class.
+    """
+    if not HAS_JAVALANG:
+        return _parse_java_heuristic(fp, text)
 
-    if HAS_JAVALANG:
+    lines = LineIndex(text)
+    extractors = (extract_ast, extract_fast) if parser == "ast" else (extract_fast,)
+    for extract in extractors:
         try:
-            tree = javalang.parse.parse(text)
+            decl = extract(text, lines)
         except Exception:
-            tree = None
-    else:
-        tree = None
+            continue
+        return _java_class(fp, text, decl) if decl is not None else None
+    return _parse_java_heuristic(fp, text)
 
-    cls: Optional[JavaClass] = None
 
-    if tree is not None:  # AST path
-        # package
-        pkg = None
-        try:
-            if hasattr(tree, 'package') and tree.package:
-                pkg = tree.package.name
-        except Exception:
-            pkg = None
+def parse_java_file(fp: Path, content: Optional[FileContent] = None,
+                    parser: Optional[str] = None) -> Optional[JavaClassRec]:
+    parser = parser or os.environ.get(JAVA_PARSER_ENV) or "ast"
+    if content is None:
+        content = FileContent(fp)
+    try:
+        text = content.text
+    except Exception:
+        return None
 
-        # classes
-        classes = []
-        try:
-            for path, node in tree.filter(javalang.tree.ClassDeclaration):  # type: ignore
-                jc = JavaClass(name=node.name, package=pkg, methods=[], file=str(fp))
-                for m in node.methods:
-                    jm = JavaMethod(name=m.name, params=[getattr(p.type, 'name', str(p.type)) for p in (m.parameters or [])])
-                    # annotations → HTTP method & @Path
-                    ann_names = [getattr(a, 'name', '') for a in (m.annotations or [])]
-                    http_methods = [a for a in ann_names if a in {"GET","POST","PUT","DELETE","PATCH"}]
-                    m_text_slice = text[m.position.offset if hasattr(m, 'position') and m.position else 0:]
-                    path_match = PATH_ANN_PAT.search(m_text_slice)
-                    if http_methods and path_match:
-                        jm.endpoints.append({"method": http_methods[0], "path": path_match.group(1)})
-                    # heuristics: SQL & HTTP calls in method body
-                    body_hint = m_text_slice[:2000]
-                    if SQL_PAT.search(body_hint) or JDBC_PAT.search(body_hint):
-                        jm.sql_usages.append("heuristic")
-                    for u in JAVA_HTTP_PAT.findall(body_hint):
-                        jm.http_calls.append(u)
-                    jc.methods.append(jm)
-                classes.append(jc)
-        except Exception:
-            classes = []
+    cache = java_parse_cache(parser)
+    if cache is None:
+        return parse_java_text(fp, text, parser)
 
-        if classes:
-            # pick first class if multiple (usually 1 per file in enterprise code)
-            cls = classes[0]
-    else:
-        # Heuristic fallback without AST
-        # class name
-        m = re.search(r"class\s+(\w+)", text)
-        name = m.group(1) if m else fp.stem
-        pkg = None
-        m2 = re.search(r"package\s+([\w\.]+);", text)
-        if m2:
-            pkg = m2.group(1)
-        jc = JavaClass(name=name, package=pkg, methods=[], file=str(fp))
-        # crude method detection
-        for mm in re.finditer(r"(public|protected|private)\s+[\w\<\>\[\]]+\s+(\w+)\s*\(([^)]*)\)\s*\{", text):
-            meth_name = mm.group(2)
-            params = [p.strip().split()[-1] if " " in p.strip() else p.strip() for p in mm.group(3).split(',') if p.strip()]
-            jm = JavaMethod(name=meth_name, params=params)
-            # annotations
-            # find annotations above this method (up to 3 lines back)
-            start = max(0, mm.start() - 300)
-            ann_block = text[start:mm.start()]
-            http_match = HTTP_ANN_PAT.search(ann_block)
-            path_match = PATH_ANN_PAT.search(ann_block)
-            if http_match and path_match:
-                jm.endpoints.append({"method": http_match.group(1), "path": path_match.group(1)})
-            # sql/http
-            body_hint = text[mm.end():mm.end()+1200]
-            if SQL_PAT.search(body_hint) or JDBC_PAT.search(body_hint):
-                jm.sql_usages.append("heuristic")
-            for u in JAVA_HTTP_PAT.findall(body_hint):
-                jm.http_calls.append(u)
-            jc.methods.append(jm)
-        cls = jc
+    digest = content.digest()
+    record = cache.get(digest)
+    if record is not None:
+        data = record.get("class")
+        # Same content may live at another path: the file field is not cached
+        return JavaClassRec.load(data, file=str(fp)) if data is not None else None
 
+    cls = parse_java_text(fp, text, parser)
+    cache.put(digest, {"class": list(cls[:3]) if cls is not None else None})
     return cls
 
 
-def parse_xml_file(fp: Path) -> Tuple[List[BLSNode], List[Relation], List[Dict[str, Any]]]:
+def _bls_records(fp: Path, steps, params, bls_nodes: List[BLSRec], rels: List[RelationRec]):
+    """BLS step/relation records from (action, target, name) step tuples and
+    parameter names, both in document order."""
+    meta = {"file": str(fp)}
+    for step in steps:
+        bls_nodes.append(BLSRec._make(step))
+        if step[1]:
+            rels.append(RelationRec(step[2] or "BLS_STEP", step[1], "BLS_CALLS_TARGET", meta))
+
+    # Params IO (optional)
+    for pname in params:
+        if pname:
+            rels.append(RelationRec("PARAM", pname, "BLS_PARAM", meta))
+
+
+class _BLSElementTarget:
+    """lxml parser target: collects Step/Parameter/Input/Output attributes
+    from start events, so no element tree is built at all."""
+
+    def __init__(self):
+        self.root_tag: Optional[str] = None
+        self.steps: List[Tuple] = []
+        self.params: List[Optional[str]] = []
+
+    def start(self, tag, attrib):
+        if self.root_tag is None:
+            self.root_tag = tag
+        if tag == "Step":
+            self.steps.append((attrib.get("Action"), attrib.get("Target"), attrib.get("Name") or attrib.get("Id")))
+        elif tag in XML_PARAM_TAGS:
+            self.params.append(attrib.get("Name") or attrib.get("Id"))
+
+    def close(self):
+        return self
+
+
+def stream_bls_elements(source, recover: bool = False) -> Tuple[Optional[str], List[Tuple], List[Optional[str]]]:
+    """Single streaming pass over an XML file (path or binary file object).
+
+    Returns (root_tag, steps, params): ``//Step`` as (Action, Target, Name or
+    Id) tuples and ``//Parameter|//Input|//Output`` as Name or Id, in
+    document order. libxml2 reports elements to a parser target as it reads,
+    so memory does not grow with the file size.
+    """
+    target = _BLSElementTarget()
+    etree.parse(source, etree.XMLParser(target=target, recover=recover))
+    return target.root_tag, target.steps, target.params
+
+
+def _parse_xml_stream(fp: Path, content: FileContent, bls_nodes: List[BLSRec], rels: List[RelationRec],
+                      wsdl_eps: List[Dict[str, Any]]):
+    """parse_xml_file for large files: byte-level scans over a memory map and
+    a streaming parse instead of a decoded string and a full tree."""
+    buf = content.view(use_mmap=True)
+
+    def has(needle: bytes, flags: int = 0) -> bool:
+        return re.search(re.escape(needle), buf, flags) is not None
+
+    def group(m, i: int) -> str:
+        return m.group(i).decode("utf-8", errors="ignore")
+
+    # WSDL quick extraction
+    if has(b"definitions") and has(b"wsdl", re.IGNORECASE):
+        for m in WSDL_SVC_PAT_B.finditer(buf):
+            wsdl_eps.append({"type": "SOAP-Service", "service": group(m, 1), "file": str(fp)})
+        for m in WSDL_PORT_PAT_B.finditer(buf):
+            wsdl_eps.append({"type": "SOAP-Port", "name": group(m, 1), "binding": group(m, 2), "file": str(fp)})
+        for m in WSDL_ADDRESS_PAT_B.finditer(buf):
+            wsdl_eps.append({"type": "SOAP-Address", "location": group(m, 1), "file": str(fp)})
+
+    try:
+        root_tag, steps, params = stream_bls_elements(str(fp))
+    except Exception:
+        # try a more lenient parser
+        try:
+            root_tag, steps, params = stream_bls_elements(str(fp), recover=True)
+        except Exception:
+            return
+    if root_tag is None:
+        return
+
+    tag_up = root_tag.upper()
+    is_mii = any(hint in tag_up for hint in SUPPORTED_XML_HINTS) or any(has(h.encode()) for h in SUPPORTED_XML_HINTS)
+    if is_mii:
+        _bls_records(fp, steps, params, bls_nodes, rels)
+
+
+def parse_xml_file(fp: Path, content: Optional[FileContent] = None,
+                   stream: Optional[bool] = None) -> Tuple[List[BLSRec], List[RelationRec], List[Dict[str, Any]]]:
     """Return (bls_nodes, relations, endpoints_from_wsdl)
     Detects simple MII BLS/Transaction elements and WSDL endpoints (if any).
+
+    Files of XML_STREAM_THRESHOLD bytes or more (or ``stream=True``) are
+    parsed by a streaming lxml parser target in constant memory; for UTF-8 files the
+    result is the same as the in-memory path.
     """
-    bls_nodes: List[BLSNode] = []
-    rels: List[Relation] = []
+    bls_nodes: List[BLSRec] = []
+    rels: List[RelationRec] = []
     wsdl_eps: List[Dict[str, Any]] = []
 
+    if HAS_LXML and stream is not False:
+        try:
+            size = content.size if content is not None and content.size is not None else fp.stat().st_size
+        except OSError:
+            return bls_nodes, rels, wsdl_eps
+        if stream or size >= XML_STREAM_THRESHOLD:
+            handle = content if content is not None else FileContent(fp, size)
+            try:
+                _parse_xml_stream(fp, handle, bls_nodes, rels, wsdl_eps)
+            finally:
+                if content is None:
+                    handle.close()
+            return bls_nodes, rels, wsdl_eps
+
     try:
-        text = fp.read_text(encoding="utf-8", errors="ignore")
+        text = file_text(fp, content)
     except Exception:
         return bls_nodes, rels, wsdl_eps
 
@@ -229,7 +460,7 @@ def parse_xml_file(fp: Path) -> Tuple[List[BLSNode], List[Relation], List[Dict[s
         # MII BLS/Transaction rough detection
         if "<BLS" in text or "<Transaction" in text:
             for step in re.finditer(r"<Step[^>]*Action=\"([^\"]*)\"[^>]*Target=\"([^\"]*)\"[^>]*/?>", text):
-                bls_nodes.append(BLSNode(action=step.group(1), target=step.group(2), name=None))
+                bls_nodes.append(BLSRec(step.group(1), step.group(2), None))
         return bls_nodes, rels, wsdl_eps
 
     # lxml-based parsing
@@ -248,28 +479,18 @@ def parse_xml_file(fp: Path) -> Tuple[List[BLSNode], List[Relation], List[Dict[s
 
     if is_mii:
         # Typical MII BLS/Transaction elements
-        for step in root.xpath("//Step"):
-            action = step.get("Action")
-            target = step.get("Target")
-            name = step.get("Name") or step.get("Id")
-            node = BLSNode(action=action, target=target, name=name)
-            bls_nodes.append(node)
-            if target:
-                rels.append(Relation(src=name or "BLS_STEP", dst=target, type="BLS_CALLS_TARGET", meta={"file": str(fp)}))
-
-        # Params IO (optional)
-        for par in root.xpath("//Parameter|//Input|//Output"):
-            pname = par.get("Name") or par.get("Id")
-            if pname:
-                rels.append(Relation(src="PARAM", dst=pname, type="BLS_PARAM", meta={"file": str(fp)}))
+        steps = ((step.get("Action"), step.get("Target"), step.get("Name") or step.get("Id"))
+                 for step in root.xpath("//Step"))
+        params = (par.get("Name") or par.get("Id") for par in root.xpath("//Parameter|//Input|//Output"))
+        _bls_records(fp, steps, params, bls_nodes, rels)
 
     return bls_nodes, rels, wsdl_eps
 
 
-def parse_config_file(fp: Path) -> Tuple[List[str], List[str]]:
+def parse_config_file(fp: Path, content: Optional[FileContent] = None) -> Tuple[List[str], List[str]]:
     """Return (urls, dsns) heuristically from config-like files."""
     try:
-        text = fp.read_text(encoding="utf-8", errors="ignore")
+        text = file_text(fp, content)
     except Exception:
         return [], []
     return CONFIG_URL_PAT.findall(text), CONFIG_DSN_PAT.findall(text)
@@ -278,104 +499,290 @@ def parse_config_file(fp: Path) -> Tuple[List[str], List[str]]:
 # Graph & Exporters
 # -----------------------------
 class RelGraph:
-    def __init__(self):
-        self.G = nx.DiGraph()
+    """Relationship graph with an interned node table and columnar edges.
+
+    Nodes get integer ids in first-seen order; the table keeps each node key
+    once, its kind (prefix of keys like "REST:GET:/x", "HTTP:...", "" for
+    plain names) and the file it was first seen in. Edges are array('I')
+    columns (src, dst, type, meta) with one edge per (src, dst) pair:
+    re-adding updates the type and merges the meta, as nx.DiGraph.add_edge
+    does, and iteration follows nx.DiGraph.edges() order (by source node,
+    then first insertion). A NetworkX graph is only built on request
+    (``to_networkx()`` / ``G``).
+    """
+
+    NODE_KINDS = ("", "REST", "HTTP", "SQL", "DSN", "SOAP")
 
-    def add_edge(self, u: str, v: str, etype: str, **meta):
-        if u and v:
-            self.G.add_edge(u, v, type=etype, **meta)
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._kinds = array("B")
+        self._node_files = array("I")         # 0 = unknown
+        self._files: List[Optional[str]] = [None]
+        self._file_ids: Dict[str, int] = {}
+        self._src = array("I")
+        self._dst = array("I")
+        self._type = array("I")
+        self._meta = array("I")               # 0 = no meta
+        self._edge_ids: Dict[int, int] = {}   # src << 32 | dst -> edge index
+        self._types: List[str] = []
+        self._type_ids: Dict[str, int] = {}
+        self._metas: List[Dict[str, Any]] = [{}]
+        self._meta_ids: Dict[Tuple, int] = {}
+        self._nx = None
+
+    # -----------------------------
+    # Interning
+    # -----------------------------
+    def _intern(self, table: List, ids: Dict, value) -> int:
+        i = ids.get(value)
+        if i is None:
+            i = ids[value] = len(table)
+            table.append(value)
+        return i
+
+    def node_id(self, key: str, file: Optional[str] = None) -> int:
+        i = self._ids.get(key)
+        if i is None:
+            i = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            prefix = key.split(":", 1)[0] if ":" in key else ""
+            self._kinds.append(self.NODE_KINDS.index(prefix) if prefix in self.NODE_KINDS else 0)
+            self._node_files.append(self._intern(self._files, self._file_ids, file) if file else 0)
+        return i
+
+    def _meta_id(self, meta: Dict[str, Any]) -> int:
+        if not meta:
+            return 0
+        try:
+            return self._intern(self._metas, self._meta_ids, tuple(meta.items()))
+        except TypeError:  # unhashable values: not shared
+            self._metas.append(dict(meta))
+            return len(self._metas) - 1
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    def add_edge(self, u: str, v: str, etype: str, *, node_file: Optional[str] = None, **meta):
+        if not (u and v):
+            return
+        file = node_file or meta.get("file")
+        s = self.node_id(u, file)
+        d = self.node_id(v, file)
+        t = self._intern(self._types, self._type_ids, etype)
+        key = s << 32 | d
+        e = self._edge_ids.get(key)
+        if e is None:
+            self._edge_ids[key] = len(self._src)
+            self._src.append(s)
+            self._dst.append(d)
+            self._type.append(t)
+            self._meta.append(self._meta_id(meta))
+        else:
+            self._type[e] = t
+            if meta:
+                self._meta[e] = self._meta_id({**self.meta(self._meta[e]), **meta})
+        self._nx = None
 
-    def add_endpoint(self, owner: str, method: str, path: str):
+    def add_endpoint(self, owner: str, method: str, path: str, file: Optional[str] = None):
         node = f"REST:{method}:{path}"
-        self.add_edge(owner, node, "SERVICE_EXPOSES_ENDPOINT")
+        self.add_edge(owner, node, "SERVICE_EXPOSES_ENDPOINT", node_file=file)
 
-    def add_http_call(self, owner: str, url: str):
-        self.add_edge(owner, f"HTTP:{url}", "SERVICE_CALLS_HTTP")
+    def add_http_call(self, owner: str, url: str, file: Optional[str] = None):
+        self.add_edge(owner, f"HTTP:{url}", "SERVICE_CALLS_HTTP", node_file=file)
 
-    def add_sql_usage(self, owner: str, hint: str):
-        self.add_edge(owner, f"SQL:{hint}", "METHOD_TOUCHES_SQL")
+    def add_sql_usage(self, owner: str, hint: str, file: Optional[str] = None):
+        self.add_edge(owner, f"SQL:{hint}", "METHOD_TOUCHES_SQL", node_file=file)
 
     def add_bls_rel(self, src: str, dst: str, meta: Dict[str, Any]):
         self.add_edge(src, dst, "BLS_CALLS_TARGET", **meta)
 
+    # -----------------------------
+    # Reading
+    # -----------------------------
+    def __len__(self) -> int:
+        return len(self._src)
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self._keys)
+
+    def node(self, i: int) -> Tuple[str, str, Optional[str]]:
+        """(kind, label, file) of node i; the key is kind + ":" + label."""
+        key = self._keys[i]
+        kind = self.NODE_KINDS[self._kinds[i]]
+        return kind, key[len(kind) + 1:] if kind else key, self._files[self._node_files[i]]
+
+    def meta(self, meta_id: int) -> Dict[str, Any]:
+        return dict(self._metas[meta_id])
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, str, Dict[str, Any]]]:
+        """(src, dst, type, meta) in nx.DiGraph.edges() order."""
+        keys, types, src, dst, etype, emeta = self._keys, self._types, self._src, self._dst, self._type, self._meta
+        # Stable sort: by source node, insertion order within a source
+        for e in sorted(range(len(src)), key=src.__getitem__):
+            yield keys[src[e]], keys[dst[e]], types[etype[e]], self.meta(emeta[e])
+
+    def columns(self) -> Dict[str, Any]:
+        """Node table and edge columns (iter_edges() order) for the graph.npz export."""
+        order = sorted(range(len(self._src)), key=self._src.__getitem__)
+        cols = {name: array("I", map(col.__getitem__, order))
+                for name, col in (("src", self._src), ("dst", self._dst), ("type", self._type), ("meta", self._meta))}
+        cols.update(keys=self._keys, kinds=self._kinds, kind_names=self.NODE_KINDS, node_files=self._node_files,
+                    files=self._files, types=self._types, metas=self._metas)
+        return cols
+
+    def to_networkx(self):
+        """Equivalent nx.DiGraph (node attributes: kind, file where known)."""
+        import networkx as nx
+        G = nx.DiGraph()
+        for i, key in enumerate(self._keys):
+            kind, _, file = self.node(i)
+            attrs = {}
+            if kind:
+                attrs["kind"] = kind
+            if file:
+                attrs["file"] = file
+            G.add_node(key, **attrs)
+        for u, v, t, meta in self.iter_edges():
+            G.add_edge(u, v, type=t, **meta)
+        return G
+
+    @property
+    def G(self):
+        """Lazily built NetworkX view (rebuilt after further edges)."""
+        if self._nx is None:
+            self._nx = self.to_networkx()
+        return self._nx
+
     def to_mermaid(self) -> str:
         lines = ["graph LR"]
-        for u, v, d in self.G.edges(data=True):
-            et = d.get("type", "rel")
+        for u, v, et, _ in self.iter_edges():
             lines.append(f'  "{u}" -->|{et}| "{v}"')
         return "\n".join(lines)
 
     def to_edges(self) -> List[Dict[str, Any]]:
-        edges = []
-        for u, v, d in self.G.edges(data=True):
-            edges.append({"src": u, "dst": v, "type": d.get("type", "rel"), "meta": {k:v for k,v in d.items() if k!="type"}})
-        return edges
+        return [{"src": u, "dst": v, "type": et, "meta": meta} for u, v, et, meta in self.iter_edges()]
 
 # -----------------------------
 # Pipeline (folder-based)
 # -----------------------------
 
-def analyze_folder(root: Path) -> AnalysisResult:
-    classes: List[JavaClass] = []
-    bls_nodes: List[BLSNode] = []
-    relations: List[Relation] = []
-    endpoints: List[Dict[str, Any]] = []
-    db_usages: List[Dict[str, Any]] = []
+class FolderCollector(Collector):
+    """Per-file accumulator behind analyze_folder; fed by a ScanEngine."""
 
-    graph = RelGraph()
+    suffixes = FOLDER_SUFFIXES
 
-    for fp in root.rglob("*"):
-        if not fp.is_file():
-            continue
+    def __init__(self):
+        self.classes: List[JavaClassRec] = []
+        self.bls_nodes: List[BLSRec] = []
+        self.relations: List[RelationRec] = []
+        self.endpoints: List[Dict[str, Any]] = []
+        self.db_usages: List[Dict[str, Any]] = []
+        self.graph = RelGraph()
+
+    @classmethod
+    def parse(cls, entry: FileEntry):
+        fp = entry.path
+        ext = entry.ext
+        if ext == ".java":
+            return ("java", str(fp), parse_java_file(fp, entry.content))
+        elif ext == ".xml":
+            return ("xml", str(fp), parse_xml_file(fp, entry.content))
+        elif ext in CONFIG_SUFFIXES:
+            return ("config", str(fp), parse_config_file(fp, entry.content))
+        return None
 
-        ext = fp.suffix.lower()
+    @classmethod
+    def dump_fragment(cls, fragment):
+        # Records are tuples: they serialise as JSON lists as they are
+        return list(fragment) if fragment is not None else None
+
+    @classmethod
+    def load_fragment(cls, data):
+        if data is None:
+            return None
+        kind, fp, payload = data
+        if kind == "java":
+            payload = JavaClassRec.load(payload) if payload is not None else None
+        elif kind == "xml":
+            bls, rels, wsdl_eps = payload
+            metas: Dict[str, Dict[str, Any]] = {}
+            payload = ([BLSRec._make(b) for b in bls],
+                       [RelationRec(src, dst, rtype, metas.setdefault(json.dumps(meta, sort_keys=True), meta))
+                        for src, dst, rtype, meta in rels],
+                       wsdl_eps)
+        return (kind, fp, payload)
+
+    def merge(self, fragment):
+        if fragment is None:
+            return
+        kind, fp, data = fragment
+        graph = self.graph
         # Java
-        if ext == ".java":
-            jc = parse_java_file(fp)
+        if kind == "java":
+            jc = data
             if jc:
-                classes.append(jc)
+                self.classes.append(jc)
                 owner = f"{jc.package}.{jc.name}" if jc.package else jc.name
                 for m in jc.methods:
                     m_owner = f"{owner}.{m.name}()"
                     for ep in m.endpoints:
-                        graph.add_endpoint(m_owner, ep.get("method","GET"), ep.get("path","/"))
-                        endpoints.append({"class": owner, **ep})
+                        graph.add_endpoint(m_owner, ep.get("method","GET"), ep.get("path","/"), file=jc.file)
+                        self.endpoints.append({"class": owner, **ep})
                     if m.sql_usages:
-                        graph.add_sql_usage(m_owner, "heuristic")
-                        db_usages.append({"owner": m_owner, "type": "sql_heuristic"})
+                        graph.add_sql_usage(m_owner, "heuristic", file=jc.file)
+                        self.db_usages.append({"owner": m_owner, "type": "sql_heuristic"})
                     for url in m.http_calls:
-                        graph.add_http_call(m_owner, url)
+                        graph.add_http_call(m_owner, url, file=jc.file)
         # XML (MII BLS/Transaction, WSDL)
-        elif ext == ".xml":
-            bls, rels, wsdl_eps = parse_xml_file(fp)
+        elif kind == "xml":
+            bls, rels, wsdl_eps = data
             if bls:
-                bls_nodes.extend(bls)
+                self.bls_nodes.extend(bls)
             if rels:
-                relations.extend(rels)
+                self.relations.extend(rels)
                 for r in rels:
                     graph.add_bls_rel(r.src, r.dst, r.meta)
             for ep in wsdl_eps:
-                endpoints.append({"class": str(fp), **ep})
+                self.endpoints.append({"class": fp, **ep})
         # Configs
-        elif ext in {".properties", ".yaml", ".yml", ".json"}:
-            urls, dsns = parse_config_file(fp)
+        elif kind == "config":
+            urls, dsns = data
             for u in urls:
-                graph.add_http_call(str(fp), u)
-                endpoints.append({"class": str(fp), "type": "CFG-URL", "url": u})
+                graph.add_http_call(fp, u, file=fp)
+                self.endpoints.append({"class": fp, "type": "CFG-URL", "url": u})
             for dsn in dsns:
-                graph.add_edge(str(fp), f"DSN:{dsn}", "CFG_DSN")
-                db_usages.append({"owner": str(fp), "dsn": dsn})
-
-    # Collect relations from graph (as list)
-    rel_edges = [Relation(src=e[0], dst=e[1], type=e[2].get("type","rel"), meta={k:v for k,v in e[2].items() if k!="type"}) for e in graph.G.edges(data=True)]
-
-    return AnalysisResult(
-        classes=classes,
-        bls=bls_nodes,
-        relations=rel_edges,
-        endpoints=endpoints,
-        db_usages=db_usages,
-    )
+                graph.add_edge(fp, f"DSN:{dsn}", "CFG_DSN", node_file=fp)
+                self.db_usages.append({"owner": fp, "dsn": dsn})
+
+    def result(self) -> AnalysisResult:
+        """Export: pydantic models from the pipeline records."""
+        # Collect relations from graph (as list)
+        rel_edges = [_model_construct(Relation, src=u, dst=v, type=t, meta=meta) for u, v, t, meta in self.graph.iter_edges()]
+
+        if hasattr(AnalysisResult, "model_validate"):
+            # pydantic v2 reads the records by attribute in one compiled pass
+            return AnalysisResult.model_validate(dict(
+                classes=self.classes,
+                bls=self.bls_nodes,
+                relations=rel_edges,
+                endpoints=self.endpoints,
+                db_usages=self.db_usages,
+            ), from_attributes=True)
+        return AnalysisResult(
+            classes=[c.export() for c in self.classes],
+            bls=[b.export() for b in self.bls_nodes],
+            relations=rel_edges,
+            endpoints=self.endpoints,
+            db_usages=self.db_usages,
+        )
+
+
+def analyze_folder(root: Path) -> AnalysisResult:
+    collector = FolderCollector()
+    ScanEngine(root).add(collector).run()
+    return collector.result()
 
 # -----------------------------
 # Document Builders
@@ -480,49 +887,48 @@ def build_training_doc(res: AnalysisResult) -> str:
 @click.option('--root', type=click.Path(path_type=Path, exists=True, file_okay=False), required=True, help='Analyze this folder recursively.')
 @click.option('--out', type=click.Path(path_type=Path, file_okay=False), default=Path('./out'), help='Output directory for docs/graph files.')
 @click.option('--mermaid', is_flag=True, default=True, help='Export Mermaid graph file (graph.mmd).')
-@click.option('--jsonedges', is_flag=True, default=True, help='Export raw edges as JSON (graph.json).')
-def main(root: Path, out: Path, mermaid: bool, jsonedges: bool):
+@click.option('--jsonedges', is_flag=True, default=True, help='Export raw edges as JSON (graph.json) and columnar tables (graph.npz).')
+@click.option('--java-parser', type=click.Choice(JAVA_PARSERS), default='ast', show_default=True,
+              help='Java extraction: full javalang AST, or tokenizer-only (faster, no AST).')
+@click.option('--java-cache/--no-java-cache', default=True, show_default=True,
+              help=f'Reuse Java parse results by content hash ({DEFAULT_JAVA_CACHE_DIR}).')
+def main(root: Path, out: Path, mermaid: bool, jsonedges: bool, java_parser: str, java_cache: bool):
     print(f"[bold green]SAP ME/MII Folder Analyzer[/bold green] — scanning: [cyan]{root}[/cyan]")
     out.mkdir(parents=True, exist_ok=True)
+    configure_java_parser(java_parser, DEFAULT_JAVA_CACHE_DIR if java_cache else None)
 
-    res = analyze_folder(root)
+    collector = FolderCollector()
+    ScanEngine(root).add(collector).run()
+    res = collector.result()
     summary = build_summary_doc(res)
     training = build_training_doc(res)
 
     (out / 'SUMMARY.md').write_text(summary, encoding='utf-8')
     (out / 'TRAINING.md').write_text(training, encoding='utf-8')
 
-    # Graph exports
-    G = nx.DiGraph()
-    for r in res.relations:
-        G.add_edge(r.src, r.dst, type=r.type, **r.meta)
-
-    # Add endpoint & sql hints to graph as well for visualization completeness
+    # Graph exports: the scan's graph (same edges as res.relations) plus
+    # endpoint & sql hints for visualization completeness
+    graph = collector.graph
     for e in res.endpoints:
         if e.get('type') == 'CFG-URL' and e.get('url'):
-            G.add_edge(e.get('class','CFG'), f"HTTP:{e['url']}", type='CFG_URL')
+            graph.add_edge(e.get('class','CFG'), f"HTTP:{e['url']}", 'CFG_URL')
         elif e.get('type','').startswith('SOAP'):
             node = e.get('location') or e.get('service') or e.get('name') or 'SOAP'
-            G.add_edge(e.get('class','WSDL'), f"SOAP:{node}", type='SOAP_DEF')
+            graph.add_edge(e.get('class','WSDL'), f"SOAP:{node}", 'SOAP_DEF')
         else:
             owner = e.get('class','JAVA')
-            G.add_edge(owner, f"REST:{e.get('method','GET')}:{e.get('path','/')} ", type='SERVICE_EXPOSES_ENDPOINT')
+            graph.add_edge(owner, f"REST:{e.get('method','GET')}:{e.get('path','/')} ", 'SERVICE_EXPOSES_ENDPOINT')
 
     # Mermaid export
     if mermaid:
-        lines = ["graph LR"]
-        for u,v,d in G.edges(data=True):
-            lines.append(f'  "{u}" -->|{d.get("type","rel")}| "{v}"')
-        (out / 'graph.mmd').write_text("\n".join(lines), encoding='utf-8')
+        (out / 'graph.mmd').write_text(graph.to_mermaid(), encoding='utf-8')
 
     # JSON edges
     if jsonedges:
-        edges = []
-        for u,v,d in G.edges(data=True):
-            edges.append({"src": u, "dst": v, "type": d.get('type','rel'), "meta": {k:v for k,v in d.items() if k!="type"}})
-        (out / 'graph.json').write_text(json.dumps(edges, indent=2, ensure_ascii=False), encoding='utf-8')
+        (out / 'graph.json').write_text(json.dumps(graph.to_edges(), indent=2, ensure_ascii=False), encoding='utf-8')
+        save_graph(graph, out)
 
-    print(f"\n[bold]Done.[/bold] Outputs -> {out.resolve()}\n - SUMMARY.md\n - TRAINING.md\n - graph.mmd\n - graph.json\n")
+    print(f"\n[bold]Done.[/bold] Outputs -> {out.resolve()}\n - SUMMARY.md\n - TRAINING.md\n - graph.mmd\n - graph.json\n - graph.npz\n")
 
 
 if __name__ == '__main__':
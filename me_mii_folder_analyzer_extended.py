@@ -10,14 +10,18 @@ import json
 import re
 import subprocess
 import sys
+from typing import Optional
 
 # Ana analyzer'ı import et
 import me_mii_folder_analyzer as base_analyzer
+from me_mii_graph_store import save_graph
+from me_mii_scanner import Collector, FileContent, FileEntry, ScanEngine, file_text
 
-def parse_manifest_json(fp: Path):
+def parse_manifest_json(fp: Path, content: Optional[FileContent] = None):
     """SAPUI5/Fiori manifest.json dosyasını parse et"""
     try:
-        data = json.loads(fp.read_text(encoding='utf-8'))
+        raw = content.data.decode('utf-8') if content is not None else fp.read_text(encoding='utf-8')
+        data = json.loads(raw)
         
         info = {
             "type": "SAPUI5/Fiori",
@@ -78,10 +82,10 @@ def parse_manifest_json(fp: Path):
         return None
 
 
-def parse_javascript_file(fp: Path):
+def parse_javascript_file(fp: Path, content: Optional[FileContent] = None):
     """JavaScript dosyasını basit parse et (controller, API calls, vb.)"""
     try:
-        text = fp.read_text(encoding='utf-8', errors='ignore')
+        text = file_text(fp, content)
         
         info = {
             "file": str(fp),
@@ -119,49 +123,65 @@ def parse_javascript_file(fp: Path):
         return None
 
 
-def analyze_folder_extended(root: Path):
-    """Genişletilmiş analiz - base + JavaScript/SAPUI5"""
-    
-    # Base analiz
-    print(f"[1/2] Running base analysis...")
-    base_result = base_analyzer.analyze_folder(root)
-    
-    # Ek analizler
-    print(f"[2/2] Analyzing JavaScript/SAPUI5 files...")
-    
-    js_files = []
-    manifest_files = []
-    sapui5_info = {
-        "manifests": [],
-        "controllers": [],
-        "api_calls": [],
-        "odata_services": [],
-        "routes": [],
-        "views": []
-    }
-    
-    for fp in root.rglob("*"):
-        if not fp.is_file():
-            continue
-        
+class ExtendedCollector(Collector):
+    """Base collector + JavaScript/SAPUI5 artifacts, fed by a ScanEngine."""
+
+    def __init__(self):
+        self.base = base_analyzer.FolderCollector()
+        self.sapui5_info = {
+            "manifests": [],
+            "controllers": [],
+            "api_calls": [],
+            "odata_services": [],
+            "routes": [],
+            "views": []
+        }
+
+    def register(self, engine: ScanEngine) -> ScanEngine:
+        return engine.add(self.base).add(self)
+
+    @classmethod
+    def accepts(cls, entry: FileEntry) -> bool:
+        return entry.name == "manifest.json" or entry.ext == ".js"
+
+    @classmethod
+    def parse(cls, entry: FileEntry):
         # manifest.json
-        if fp.name == "manifest.json":
-            manifest_data = parse_manifest_json(fp)
+        if entry.name == "manifest.json":
+            return ("manifest", parse_manifest_json(entry.path, entry.content))
+        # JavaScript files
+        return ("js", parse_javascript_file(entry.path, entry.content))
+
+    def merge(self, fragment):
+        kind, data = fragment
+        sapui5_info = self.sapui5_info
+
+        if kind == "manifest":
+            manifest_data = data
             if manifest_data:
                 sapui5_info["manifests"].append(manifest_data)
                 sapui5_info["routes"].extend(manifest_data["routes"])
                 sapui5_info["views"].extend(manifest_data["views"])
-        
-        # JavaScript files
-        elif fp.suffix.lower() == ".js":
-            js_data = parse_javascript_file(fp)
+
+        else:
+            js_data = data
             if js_data:
                 if js_data["type"] == "SAPUI5 Controller":
                     sapui5_info["controllers"].append(js_data)
                 sapui5_info["api_calls"].extend(js_data["api_calls"])
                 sapui5_info["odata_services"].extend(js_data["odata_services"])
+
+    def result(self):
+        return self.base.result(), self.sapui5_info
+
+
+def analyze_folder_extended(root: Path):
+    """Genişletilmiş analiz - base + JavaScript/SAPUI5 (tek tarama)"""
     
-    return base_result, sapui5_info
+    print(f"[1/1] Running base + JavaScript/SAPUI5 analysis...")
+    collector = ExtendedCollector()
+    collector.register(ScanEngine(root)).run()
+    return collector.result()
 
 
 def build_extended_summary(base_result, sapui5_info):
@@ -201,7 +221,7 @@ def build_extended_summary(base_result, sapui5_info):
     
     if sapui5_info["api_calls"]:
         sapui5_section += f"### API Çağrıları ({len(sapui5_info['api_calls'])} adet)\n"
-        unique_apis = list(set(sapui5_info["api_calls"]))
+        unique_apis = list(dict.fromkeys(sapui5_info["api_calls"]))
         for api in unique_apis[:10]:
             sapui5_section += f"- {api}\n"
         if len(unique_apis) > 10:
@@ -210,7 +230,7 @@ def build_extended_summary(base_result, sapui5_info):
     
     if sapui5_info["odata_services"]:
         sapui5_section += f"### OData Servisleri ({len(sapui5_info['odata_services'])} adet)\n"
-        unique_odata = list(set(sapui5_info["odata_services"]))
+        unique_odata = list(dict.fromkeys(sapui5_info["odata_services"]))
         for odata in unique_odata:
             sapui5_section += f"- {odata}\n"
         sapui5_section += "\n"
@@ -230,9 +250,14 @@ def main_extended():
     @click.command()
     @click.option('--root', type=click.Path(path_type=Path, exists=True, file_okay=False), required=True)
     @click.option('--out', type=click.Path(path_type=Path, file_okay=False), default=Path('./out'))
-    def run(root: Path, out: Path):
+    @click.option('--java-parser', type=click.Choice(base_analyzer.JAVA_PARSERS), default='ast', show_default=True,
+                  help='Java extraction: full javalang AST, or tokenizer-only (faster, no AST).')
+    @click.option('--java-cache/--no-java-cache', default=True, show_default=True,
+                  help='Reuse Java parse results by content hash.')
+    def run(root: Path, out: Path, java_parser: str, java_cache: bool):
         print(f"[bold green]SAP ME/MII Extended Analyzer[/bold green] — scanning: [cyan]{root}[/cyan]")
         out.mkdir(parents=True, exist_ok=True)
+        base_analyzer.configure_java_parser(java_parser, base_analyzer.DEFAULT_JAVA_CACHE_DIR if java_cache else None)
         
         # Analiz
         base_result, sapui5_info = analyze_folder_extended(root)
@@ -252,36 +277,31 @@ def main_extended():
         )
         
         # Graph (base)
-        import networkx as nx
-        G = nx.DiGraph()
+        graph = base_analyzer.RelGraph()
         for r in base_result.relations:
-            G.add_edge(r.src, r.dst, type=r.type, **r.meta)
+            graph.add_edge(r.src, r.dst, r.type, **r.meta)
         
         # SAPUI5 ilişkilerini ekle
         for route in sapui5_info["routes"]:
-            G.add_edge(f"Route:{route['name']}", f"View:{route['target']}", type="ROUTE_TO_VIEW")
+            graph.add_edge(f"Route:{route['name']}", f"View:{route['target']}", "ROUTE_TO_VIEW")
         
-        for api in set(sapui5_info["api_calls"]):
-            G.add_edge("SAPUI5_App", f"API:{api}", type="CALLS_API")
+        for api in dict.fromkeys(sapui5_info["api_calls"]):
+            graph.add_edge("SAPUI5_App", f"API:{api}", "CALLS_API")
         
         # Mermaid
-        lines = ["graph LR"]
-        for u, v, d in G.edges(data=True):
-            lines.append(f'  "{u}" -->|{d.get("type","rel")}| "{v}"')
-        (out / 'graph.mmd').write_text("\n".join(lines), encoding='utf-8')
+        (out / 'graph.mmd').write_text(graph.to_mermaid(), encoding='utf-8')
         
         # JSON
-        edges = []
-        for u, v, d in G.edges(data=True):
-            edges.append({"src": u, "dst": v, "type": d.get('type','rel'), "meta": {k:v for k,v in d.items() if k!="type"}})
-        (out / 'graph.json').write_text(json.dumps(edges, indent=2, ensure_ascii=False), encoding='utf-8')
+        (out / 'graph.json').write_text(json.dumps(graph.to_edges(), indent=2, ensure_ascii=False), encoding='utf-8')
+        save_graph(graph, out)
         
         print(f"\n[bold]Done.[/bold] Outputs -> {out.resolve()}")
         print(" - SUMMARY.md")
         print(" - TRAINING.md")
         print(" - sapui5_details.json")
         print(" - graph.mmd")
-        print(" - graph.json\n")
+        print(" - graph.json")
+        print(" - graph.npz\n")
     
     run()
 
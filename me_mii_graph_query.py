@@ -0,0 +1,468 @@
+"""
+SAP ME/MII Graph Query — impact analysis over the relation graph
+- GraphIndex: forward/reverse adjacency (CSR) of graph.npz / graph.json,
+  strongly connected components and a transitive-closure index (one
+  reachability bitset per component, up and down), so reachability is a bit
+  test and upstream/downstream sets are a bitset decode
+- Queries: upstream / downstream (optionally depth- and type-limited),
+  reachable, shortest_path, impact ("what is affected if X changes?")
+- Names: exact node keys, or the names developers use (class simple name,
+  method, Class.method, BLS step/target, REST path, table names in SQL hints)
+
+Usage:
+  python me_mii_graph_query.py impact --graph ./out ORDERS TestService
+  python me_mii_graph_query.py path --graph ./out Step1_GetOrder GetOrderDetails
+  python me_mii_graph_query.py downstream --graph ./out TestService --depth 1 --json
+"""
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import click
+import numpy as np
+from rich import print
+
+from me_mii_graph_store import GraphStore, load_graph
+
+# Components above this count are queried by BFS only (closure bitsets are
+# O(components^2) bits in the worst case)
+CLOSURE_LIMIT = 20000
+
+ENDPOINT_TYPES = ("SERVICE_EXPOSES_ENDPOINT", "SOAP_DEF")
+BLS_TYPES = ("BLS_CALLS_TARGET",)
+
+# Node categories of an impact report
+CATEGORIES = ("endpoints", "transactions", "methods", "sql", "http", "config", "other", "classes")
+
+_SQL_WORDS = frozenset((
+    "select", "from", "where", "update", "insert", "into", "delete", "set", "values", "join",
+    "inner", "outer", "left", "right", "and", "not", "null", "order", "group", "by", "having",
+    "heuristic", "jdbc",
+))
+_IDENT = re.compile(r"[A-Za-z_][\w$]*")
+_TOKEN = re.compile(r"[\w$./{}:-]+(?:\(\))?")  # "run()" stays one token, "f(x)" is f, x
+_QUALIFIED = re.compile(r"[A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*")
+
+
+def _csr(src: np.ndarray, dst: np.ndarray, n: int) -> Tuple[List[int], List[int], List[int]]:
+    """(indptr, neighbours, edge ids) grouped by src, as Python lists for BFS."""
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr.tolist(), dst[order].tolist(), order.tolist()
+
+
+def _bits(x: int, nbytes: int) -> np.ndarray:
+    """Positions of the set bits of x."""
+    if not x:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.unpackbits(np.frombuffer(x.to_bytes(nbytes, "little"), dtype=np.uint8),
+                                        bitorder="little"))
+
+
+class GraphIndex:
+    """Query indexes over a GraphStore (see me_mii_graph_store.load_graph)."""
+
+    def __init__(self, store: GraphStore, closure_limit: int = CLOSURE_LIMIT):
+        self.store = store
+        n = store.number_of_nodes
+        self.keys: List[str] = store.keys.tolist()
+        self.ids: Dict[str, int] = {k: i for i, k in enumerate(self.keys)}
+        src = np.asarray(store.src, dtype=np.int64)
+        dst = np.asarray(store.dst, dtype=np.int64)
+        self._etype = np.asarray(store.type).tolist()
+        self._types = store.types
+        self._out = _csr(src, dst, n)
+        self._in = _csr(dst, src, n)
+        self._categories = self._categorize(src, dst)
+        self._names = self._name_index()
+        self._components(closure_limit)
+
+    @classmethod
+    def load(cls, path, closure_limit: int = CLOSURE_LIMIT) -> Optional["GraphIndex"]:
+        """Index of an output folder, graph.npz or graph.json; None if unavailable."""
+        store = load_graph(path)
+        return cls(store, closure_limit) if store is not None else None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # -----------------------------
+    # Build
+    # -----------------------------
+    def _categorize(self, src: np.ndarray, dst: np.ndarray) -> List[str]:
+        kinds = {"REST": "endpoints", "SOAP": "endpoints", "SQL": "sql", "DSN": "sql", "HTTP": "http"}
+        store = self.store
+        node_kinds = np.asarray(store.kinds).tolist()
+        cats = [kinds.get(store.kind_names[k], "other") for k in node_kinds]
+        bls = [i for i, t in enumerate(self._types) if t in BLS_TYPES]
+        if bls:
+            mask = np.isin(np.asarray(store.type), bls)
+            for i in np.union1d(src[mask], dst[mask]).tolist():
+                cats[i] = "transactions"
+        for i, key in enumerate(self.keys):
+            if cats[i] == "other":
+                if key.endswith(")") and "(" in key:
+                    cats[i] = "methods"
+                elif "/" in key or "\\" in key:
+                    cats[i] = "config"
+                elif _QUALIFIED.fullmatch(key):
+                    cats[i] = "classes"  # plain (package.)Class name, e.g. import/extends edges
+        return cats
+
+    def _name_index(self) -> Dict[str, List[int]]:
+        names: Dict[str, List[int]] = {}
+
+        def add(name: str, i: int):
+            ids = names.setdefault(name.lower(), [])
+            if not ids or ids[-1] != i:
+                ids.append(i)
+
+        for i, key in enumerate(self.keys):
+            add(key, i)
+            cat = self._categories[i]
+            label = key.split(":", 1)[1] if cat in ("endpoints", "sql", "http") else key
+            if cat == "methods":
+                owner, _, method = key[:key.index("(")].rpartition(".")
+                simple = owner.rpartition(".")[2]
+                for name in (owner, simple, method, f"{simple}.{method}", f"{method}()"):
+                    if name:
+                        add(name, i)
+            elif cat == "classes":
+                add(key.rpartition(".")[2], i)  # simple name of a qualified class
+            elif cat == "endpoints":
+                add(label.strip(), i)
+                add(label.split(":", 1)[-1].strip(), i)  # REST path without the HTTP method
+            elif cat == "sql":
+                for word in _IDENT.findall(label):
+                    if len(word) > 2 and word.lower() not in _SQL_WORDS:
+                        add(word, i)
+            elif cat == "config":
+                add(re.split(r"[\\/]", key)[-1], i)
+        return names
+
+    def _components(self, closure_limit: int):
+        """Tarjan SCCs (iterative); closure bitsets if the condensation is small enough."""
+        n = len(self.keys)
+        indptr, succ, _ = self._out
+        index = [-1] * n
+        low = [0] * n
+        comp = [-1] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        counter = 0
+        ncomp = 0
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            work = [(root, indptr[root])]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                v, pos = work[-1]
+                end = indptr[v + 1]
+                while pos < end:
+                    w = succ[pos]
+                    pos += 1
+                    if index[w] < 0:
+                        work[-1] = (v, pos)
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, indptr[w]))
+                        break
+                    if on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                else:
+                    work.pop()
+                    if work and low[v] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[v]
+                    if low[v] == index[v]:
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = False
+                            comp[w] = ncomp
+                            if w == v:
+                                break
+                        ncomp += 1
+        self._comp = comp
+        members: List[List[int]] = [[] for _ in range(ncomp)]
+        for v, c in enumerate(comp):
+            members[c].append(v)
+        self._members = members
+        self._down: Optional[List[int]] = None
+        self._up: Optional[List[int]] = None
+        if ncomp > closure_limit:
+            return
+
+        # Tarjan emits components in reverse topological order: successors first
+        in_ptr, pred, _ = self._in
+        down = [0] * ncomp
+        for c in range(ncomp):
+            bits = 1 << c
+            for v in members[c]:
+                for w in succ[indptr[v]:indptr[v + 1]]:
+                    if comp[w] != c:
+                        bits |= down[comp[w]]
+            down[c] = bits
+        up = [0] * ncomp
+        for c in range(ncomp - 1, -1, -1):
+            bits = 1 << c
+            for v in members[c]:
+                for w in pred[in_ptr[v]:in_ptr[v + 1]]:
+                    if comp[w] != c:
+                        bits |= up[comp[w]]
+            up[c] = bits
+        self._down, self._up = down, up
+
+    # -----------------------------
+    # Names
+    # -----------------------------
+    def resolve(self, name: str) -> List[str]:
+        """Node keys for an exact key or a known name (case-insensitive)."""
+        if name in self.ids:
+            return [name]
+        return [self.keys[i] for i in self._names.get(name.strip().lower(), ())]
+
+    def find(self, text: str) -> List[str]:
+        """Node keys named anywhere in free text (e.g. a change summary).
+
+        Method mentions match with or without "()": "run()", "run",
+        "TestService.run()" and the full key.
+        """
+        seen: Dict[int, None] = {}
+        for token in _TOKEN.findall(text):
+            token = token.strip(".:-")
+            if len(token) < 3:
+                continue
+            for candidate in (token, token.rstrip("()")) if token.endswith("()") else (token,):
+                for i in self._names.get(candidate.lower(), ()):
+                    seen.setdefault(i, None)
+        return [self.keys[i] for i in seen]
+
+    def _seeds(self, names) -> List[int]:
+        if isinstance(names, str):
+            names = [names]
+        seeds: Dict[int, None] = {}
+        for name in names:
+            for key in self.resolve(name):
+                seeds.setdefault(self.ids[key], None)
+        return list(seeds)
+
+    # -----------------------------
+    # Traversal
+    # -----------------------------
+    def _closure(self, seeds: Sequence[int], bitsets: List[int]) -> Set[int]:
+        bits = 0
+        for v in seeds:
+            bits |= bitsets[self._comp[v]]
+        members = self._members
+        return {v for c in _bits(bits, (len(members) + 7) // 8).tolist() for v in members[c]}
+
+    def _bfs(self, seeds: Sequence[int], adjacency, depth: Optional[int], types: Optional[Set[int]]) -> Set[int]:
+        indptr, nbrs, edges = adjacency
+        etype = self._etype
+        seen = set(seeds)
+        frontier = list(seeds)
+        level = 0
+        while frontier and (depth is None or level < depth):
+            nxt = []
+            for v in frontier:
+                for pos in range(indptr[v], indptr[v + 1]):
+                    w = nbrs[pos]
+                    if w not in seen and (types is None or etype[edges[pos]] in types):
+                        seen.add(w)
+                        nxt.append(w)
+            frontier = nxt
+            level += 1
+        return seen
+
+    def _reach(self, seeds: Sequence[int], up: bool, depth: Optional[int], types: Optional[Iterable[str]]) -> Set[int]:
+        bitsets = self._up if up else self._down
+        if depth is None and types is None and bitsets is not None:
+            return self._closure(seeds, bitsets)
+        type_ids = None
+        if types is not None:
+            types = set(types)
+            type_ids = {i for i, t in enumerate(self._types) if t in types}
+        return self._bfs(seeds, self._in if up else self._out, depth, type_ids)
+
+    def downstream(self, names, depth: Optional[int] = None, types: Optional[Iterable[str]] = None) -> List[str]:
+        """Nodes reachable from names (what they call, expose, touch)."""
+        seeds = self._seeds(names)
+        return self._keys_of(self._reach(seeds, False, depth, types) - set(seeds))
+
+    def upstream(self, names, depth: Optional[int] = None, types: Optional[Iterable[str]] = None) -> List[str]:
+        """Nodes that reach names (everything depending on them)."""
+        seeds = self._seeds(names)
+        return self._keys_of(self._reach(seeds, True, depth, types) - set(seeds))
+
+    def reachable(self, src: str, dst: str) -> bool:
+        """True if some node named src reaches some node named dst."""
+        sources, targets = self._seeds(src), set(self._seeds(dst))
+        if not sources or not targets:
+            return False
+        if self._down is not None:
+            comp, down = self._comp, self._down
+            return any(down[comp[s]] >> comp[t] & 1 for s in sources for t in targets)
+        return self._search(sources, targets) is not None
+
+    def shortest_path(self, src: str, dst: str) -> Optional[List[str]]:
+        """Fewest-edges directed path between nodes named src and dst (keys), or None."""
+        sources, targets = self._seeds(src), set(self._seeds(dst))
+        if not sources or not targets:
+            return None
+        if self._down is not None and not self.reachable(src, dst):
+            return None
+        path = self._search(sources, targets)
+        return [self.keys[v] for v in path] if path is not None else None
+
+    def _search(self, sources: List[int], targets: Set[int]) -> Optional[List[int]]:
+        """BFS path from sources to the nearest target.
+
+        Tarjan numbers components successors-first, so a node whose
+        component number is below every target's cannot reach one.
+        """
+        indptr, nbrs, _ = self._out
+        comp = self._comp
+        floor = min(comp[t] for t in targets)
+        parent = {s: -1 for s in sources}
+        queue = deque(sources)
+        while queue:
+            v = queue.popleft()
+            if v in targets:
+                path = []
+                while v >= 0:
+                    path.append(v)
+                    v = parent[v]
+                return path[::-1]
+            for w in nbrs[indptr[v]:indptr[v + 1]]:
+                if w not in parent and comp[w] >= floor:
+                    parent[w] = v
+                    queue.append(w)
+        return None
+
+    # -----------------------------
+    # Impact
+    # -----------------------------
+    def impact(self, names) -> Dict[str, List[str]]:
+        """What is affected if the named nodes change.
+
+        Affected = the nodes themselves plus everything upstream of them; the
+        endpoints include those exposed by affected methods. ``uses`` lists
+        what the changed nodes depend on (downstream).
+        """
+        seeds = self._seeds(names)
+        affected = self._reach(seeds, True, None, None)
+        indptr, nbrs, _ = self._out
+        exposed = {w for v in affected for w in nbrs[indptr[v]:indptr[v + 1]]
+                   if self._categories[w] == "endpoints"}
+        report: Dict[str, List[str]] = {"changed": [self.keys[i] for i in seeds]}
+        groups: Dict[str, Set[int]] = {cat: set() for cat in CATEGORIES}
+        for v in affected | exposed:
+            groups[self._categories[v]].add(v)
+        for cat in CATEGORIES:
+            report[cat] = self._keys_of(groups[cat])
+        report["classes"] = list(dict.fromkeys(report["classes"] + [key[:key.index("(")].rpartition(".")[0] or key
+                                                                    for key in report["methods"]]))
+        report["uses"] = self._keys_of(self._reach(seeds, False, None, None) - set(seeds))
+        return report
+
+    def _keys_of(self, ids: Iterable[int]) -> List[str]:
+        return [self.keys[i] for i in sorted(ids)]
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _index(graph: Path) -> GraphIndex:
+    index = GraphIndex.load(graph)
+    if index is None:
+        raise click.ClickException(f"No graph.npz / graph.json found at {graph}")
+    return index
+
+
+def _show(data, as_json: bool):
+    if as_json:
+        click.echo(json.dumps(data, indent=2, ensure_ascii=False))
+    elif isinstance(data, dict):
+        for name, items in data.items():
+            if items:
+                print(f"[bold]{name}[/bold] ({len(items)})")
+                for item in items:
+                    print(f"  - {item}")
+    elif isinstance(data, list):
+        for item in data:
+            print(f"  - {item}")
+    else:
+        print(data)
+
+
+_graph_option = click.option('--graph', type=click.Path(path_type=Path, exists=True), default=Path('./out'),
+                             help='Analyzer output folder, graph.npz or graph.json.')
+_json_option = click.option('--json', 'as_json', is_flag=True, default=False, help='Print JSON.')
+
+
+@click.group()
+def cli():
+    """Impact analysis queries over the analyzer's relation graph."""
+
+
+@cli.command()
+@_graph_option
+@_json_option
+@click.argument('names', nargs=-1, required=True)
+def impact(graph: Path, as_json: bool, names):
+    """Endpoints, BLS transactions and methods affected if NAMES change."""
+    _show(_index(graph).impact(names), as_json)
+
+
+@cli.command()
+@_graph_option
+@_json_option
+@click.option('--depth', type=int, default=None, help='Maximum number of hops.')
+@click.option('--type', 'types', multiple=True, help='Only follow edges of this type (repeatable).')
+@click.argument('names', nargs=-1, required=True)
+def upstream(graph: Path, as_json: bool, depth: Optional[int], types, names):
+    """Nodes that reach NAMES."""
+    _show(_index(graph).upstream(names, depth, types or None), as_json)
+
+
+@cli.command()
+@_graph_option
+@_json_option
+@click.option('--depth', type=int, default=None, help='Maximum number of hops.')
+@click.option('--type', 'types', multiple=True, help='Only follow edges of this type (repeatable).')
+@click.argument('names', nargs=-1, required=True)
+def downstream(graph: Path, as_json: bool, depth: Optional[int], types, names):
+    """Nodes reachable from NAMES."""
+    _show(_index(graph).downstream(names, depth, types or None), as_json)
+
+
+@cli.command()
+@_graph_option
+@_json_option
+@click.argument('src')
+@click.argument('dst')
+def path(graph: Path, as_json: bool, src: str, dst: str):
+    """Shortest directed path from SRC to DST."""
+    _show(_index(graph).shortest_path(src, dst), as_json)
+
+
+@cli.command()
+@_graph_option
+@_json_option
+@click.argument('src')
+@click.argument('dst')
+def reach(graph: Path, as_json: bool, src: str, dst: str):
+    """Whether SRC reaches DST."""
+    _show(_index(graph).reachable(src, dst), as_json)
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,279 @@
+"""
+SAP ME/MII Graph Store (graph.npz)
+- Columnar binary export of the relationship graph, written next to graph.json
+  nodes: key, kind, file   edges: src, dst, type, meta (uint32 ids)
+  strings (keys, files, edge types, JSON metas) as one UTF-8 blob + offsets,
+  so the file holds plain numeric arrays only (no pickled objects)
+- load_graph: memory-maps the columns of the (uncompressed) .npz, so counts
+  and metrics are array reductions instead of decoding every edge dict;
+  falls back to np.load, then to graph.json (older outputs)
+
+Edges are stored in graph.json order, so GraphStore.to_edges() == json.load(graph.json).
+"""
+import json
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+GRAPH_NPZ = "graph.npz"
+GRAPH_JSON = "graph.json"
+FORMAT_VERSION = 1
+
+_SEP = "\x00"
+
+
+# -----------------------------
+# String tables
+# -----------------------------
+def _pack_strings(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(blob uint8, offsets int64[len + 1]); items are NUL-separated in the blob."""
+    encoded = [v.encode("utf-8", "surrogatepass") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) + 1 for b in encoded], out=offsets[1:])
+    blob = np.frombuffer((_SEP.encode().join(encoded) + _SEP.encode()) if encoded else b"", dtype=np.uint8)
+    return blob, offsets
+
+
+class _Strings:
+    """Read-only string table over a (blob, offsets) pair; decoded on demand."""
+
+    __slots__ = ("_blob", "_offsets", "_all")
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+        self._all: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if self._all is not None:
+            return self._all[i]
+        start, stop = int(self._offsets[i]), int(self._offsets[i + 1]) - 1
+        return self._blob[start:stop].tobytes().decode("utf-8", "surrogatepass")
+
+    def tolist(self) -> List[str]:
+        if self._all is None:
+            n = len(self)
+            items = self._blob.tobytes().decode("utf-8", "surrogatepass").split(_SEP)[:n] if n else []
+            if len(items) != n:  # NUL inside a value
+                items = [self[i] for i in range(n)]
+            self._all = items
+        return self._all
+
+
+# -----------------------------
+# .npz I/O
+# -----------------------------
+def _mmap_npz(path: Path) -> Dict[str, np.ndarray]:
+    """Arrays of an uncompressed .npz as read-only memory maps.
+
+    np.load ignores mmap_mode for .npz archives; stored (ZIP_STORED) members
+    are contiguous in the file, so each .npy payload can be mapped in place.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED or not info.filename.endswith(".npy"):
+                raise ValueError(f"{info.filename}: not an uncompressed .npy member")
+            fh.seek(info.header_offset)
+            local = fh.read(30)
+            name_len, extra_len = struct.unpack("<HH", local[26:30])
+            fh.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(fh)
+            if dtype.hasobject:
+                raise ValueError(f"{info.filename}: object arrays are not supported")
+            name = info.filename[:-4]
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=fh.tell(),
+                                         shape=shape, order="F" if fortran else "C")
+    return arrays
+
+
+def _load_npz(path: Path) -> Dict[str, np.ndarray]:
+    try:
+        return _mmap_npz(path)
+    except Exception:
+        with np.load(path, allow_pickle=False) as npz:
+            return {k: npz[k] for k in npz.files}
+
+
+# -----------------------------
+# Store
+# -----------------------------
+class GraphStore:
+    """Read-only node/edge tables of a relationship graph.
+
+    Same reading API as RelGraph (len, number_of_nodes, node, iter_edges,
+    to_edges) plus column reductions (type_counts, kind_counts, used_keys).
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        version = int(arrays["version"][0]) if "version" in arrays else -1
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported graph store version {version}")
+        self.arrays = arrays
+        self.src = arrays["edge_src"]
+        self.dst = arrays["edge_dst"]
+        self.type = arrays["edge_type"]
+        self.meta_ids = arrays["edge_meta"]
+        self.kinds = arrays["node_kind"]
+        self.node_files = arrays["node_file"]
+        self.keys = _Strings(arrays["key_blob"], arrays["key_offsets"])
+        self.files = _Strings(arrays["file_blob"], arrays["file_offsets"])
+        self.types = _Strings(arrays["type_blob"], arrays["type_offsets"]).tolist()
+        self.kind_names = _Strings(arrays["kind_blob"], arrays["kind_offsets"]).tolist()
+        self._metas = _Strings(arrays["meta_blob"], arrays["meta_offsets"])
+        self._meta_cache: Dict[int, Dict[str, Any]] = {}
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    @classmethod
+    def from_graph(cls, graph) -> "GraphStore":
+        """Columns of a RelGraph (me_mii_folder_analyzer)."""
+        cols = graph.columns()
+        arrays: Dict[str, np.ndarray] = {"version": np.array([FORMAT_VERSION], dtype=np.uint32)}
+        for name, col in (("edge_src", "src"), ("edge_dst", "dst"), ("edge_type", "type"),
+                          ("edge_meta", "meta"), ("node_file", "node_files")):
+            arrays[name] = np.frombuffer(cols[col], dtype=np.uint32) if len(cols[col]) else np.zeros(0, np.uint32)
+        arrays["node_kind"] = np.frombuffer(cols["kinds"], dtype=np.uint8) if len(cols["kinds"]) else np.zeros(0, np.uint8)
+        tables = {
+            "key": cols["keys"],
+            "file": [f or "" for f in cols["files"]],
+            "type": cols["types"],
+            "kind": list(cols["kind_names"]),
+            "meta": [json.dumps(m, ensure_ascii=False) for m in cols["metas"]],
+        }
+        for name, values in tables.items():
+            arrays[f"{name}_blob"], arrays[f"{name}_offsets"] = _pack_strings(values)
+        return cls(arrays)
+
+    @classmethod
+    def from_edges(cls, edges: List[Any]) -> "GraphStore":
+        """From graph.json records: {src, dst, type, meta}, older
+        {source, target, relation} dicts, or [src, dst, type] lists."""
+        from me_mii_folder_analyzer import RelGraph
+
+        graph = RelGraph()
+        for e in edges:
+            if isinstance(e, dict):
+                meta = e.get("meta")
+                graph.add_edge(str(e.get("src", e.get("source", "")) or ""),
+                               str(e.get("dst", e.get("target", "")) or ""),
+                               str(e.get("type", e.get("relation", "")) or ""),
+                               **(meta if isinstance(meta, dict) else {}))
+            elif isinstance(e, (list, tuple)) and len(e) >= 2:
+                graph.add_edge(str(e[0]), str(e[1]), str(e[2]) if len(e) > 2 else "")
+        return cls.from_graph(graph)
+
+    def save(self, path: Path):
+        """Uncompressed .npz (memory-mappable), replaced atomically."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.savez(fh, **{k: np.ascontiguousarray(v) for k, v in self.arrays.items()})
+        os.replace(tmp, path)
+
+    # -----------------------------
+    # Reading
+    # -----------------------------
+    def __len__(self) -> int:
+        return len(self.src)
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.keys)
+
+    def node(self, i: int) -> Tuple[str, str, Optional[str]]:
+        """(kind, label, file) of node i; the key is kind + ":" + label."""
+        key = self.keys[i]
+        kind = self.kind_names[self.kinds[i]]
+        return kind, key[len(kind) + 1:] if kind else key, self.files[int(self.node_files[i])] or None
+
+    def meta(self, meta_id: int) -> Dict[str, Any]:
+        meta = self._meta_cache.get(meta_id)
+        if meta is None:
+            meta = self._meta_cache[meta_id] = json.loads(self._metas[meta_id])
+        return dict(meta)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, str, Dict[str, Any]]]:
+        """(src, dst, type, meta) in graph.json order."""
+        keys, types = self.keys.tolist(), self.types
+        for s, d, t, m in zip(self.src.tolist(), self.dst.tolist(), self.type.tolist(), self.meta_ids.tolist()):
+            yield keys[s], keys[d], types[t], self.meta(m)
+
+    def to_edges(self) -> List[Dict[str, Any]]:
+        return [{"src": u, "dst": v, "type": et, "meta": meta} for u, v, et, meta in self.iter_edges()]
+
+    def type_counts(self) -> Dict[str, int]:
+        """Edge count per relation type."""
+        counts = np.bincount(self.type, minlength=len(self.types)) if len(self) else []
+        return {t: int(c) for t, c in zip(self.types, counts) if c}
+
+    def degrees(self) -> np.ndarray:
+        """In + out degree per node id."""
+        n = self.number_of_nodes
+        return np.bincount(self.src, minlength=n) + np.bincount(self.dst, minlength=n)
+
+    def kind_counts(self) -> Dict[str, int]:
+        """Node count per kind ("" for plain names)."""
+        counts = np.bincount(self.kinds, minlength=len(self.kind_names)) if self.number_of_nodes else []
+        return {k: int(c) for k, c in zip(self.kind_names, counts) if c}
+
+    def used_keys(self) -> List[str]:
+        """Keys of the nodes that appear in at least one edge."""
+        keys = self.keys.tolist()
+        return [keys[i] for i in np.flatnonzero(self.degrees())]
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def save_graph(graph, out: Path) -> Path:
+    """Write graph.npz for a RelGraph into the output folder; returns its path."""
+    path = Path(out) / GRAPH_NPZ
+    GraphStore.from_graph(graph).save(path)
+    return path
+
+
+def load_graph(path: Union[str, Path]) -> Optional[GraphStore]:
+    """GraphStore for an output folder, graph.npz or graph.json.
+
+    graph.npz is used when it is not older than graph.json next to it;
+    otherwise graph.json is decoded. None if neither can be read.
+    """
+    path = Path(path)
+    folder = path if path.is_dir() else path.parent
+    npz, js = folder / GRAPH_NPZ, folder / GRAPH_JSON
+    if path.suffix == ".json":
+        js = path
+    elif path.suffix == ".npz":
+        npz = path
+    try:
+        if npz.exists() and (not js.exists() or npz.stat().st_mtime >= js.stat().st_mtime):
+            return GraphStore(_load_npz(npz))
+    except Exception:
+        pass
+    try:
+        if js.exists():
+            with open(js, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get("edges", [])
+            return GraphStore.from_edges(data if isinstance(data, list) else [])
+    except Exception:
+        pass
+    return None
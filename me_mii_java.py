@@ -0,0 +1,360 @@
+"""
+SAP ME/MII Java Declaration Extraction
+- extract_ast:  javalang AST (reference; fails on sources javalang cannot parse)
+- extract_fast: single pass over javalang.tokenizer tokens, no AST
+  (package, first class, its methods with parameters and annotations)
+- Method bodies as brace-matched (start, end) offsets, so per-method
+  heuristics can search text[start:end] in place (re.search(text, start, end))
+
+Both return the same JavaDecl for the first class declaration of a file
+(preorder, as ``tree.filter(ClassDeclaration)``) and only its own methods
+(no constructors, no methods of nested/anonymous classes). The fast mode
+tracks brace nesting only, so it also works on sources with syntax errors.
+"""
+from bisect import bisect_left
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from me_mii_scanner import LineIndex
+
+try:
+    import javalang  # type: ignore
+    from javalang import tokenizer as jtok  # type: ignore
+    HAS_JAVALANG = True
+except Exception:
+    HAS_JAVALANG = False
+
+
+class JavaMethodDecl(NamedTuple):
+    name: str
+    params: List[str]                           # type name of each parameter
+    annotations: List[Tuple[str, Optional[str]]]  # (name, string argument)
+    offset: int                                 # start of the declaration after modifiers/annotations
+    body: Optional[Tuple[int, int]] = None      # "{ ... }" span, None for abstract/native
+
+
+class JavaDecl(NamedTuple):
+    name: str
+    package: Optional[str]
+    methods: List[JavaMethodDecl]
+
+
+# -----------------------------
+# AST mode
+# -----------------------------
+def _ast_string(element) -> Optional[str]:
+    """String argument of an annotation: @A("x") or @A(value = "x")."""
+    if isinstance(element, list) and len(element) == 1 and getattr(element[0], "name", None) == "value":
+        element = element[0].value
+    if isinstance(element, javalang.tree.Literal) and isinstance(element.value, str) \
+            and element.value.startswith('"') and not element.prefix_operators and not element.selectors:
+        return element.value[1:-1]
+    return None
+
+
+class _BodySpans:
+    """Brace-matched spans of the member bodies of a token list.
+
+    javalang nodes only carry a start position, so a method's body is the
+    first '{' or ';' outside parentheses after that position: '{' opens the
+    body, ';' ends an abstract/native declaration.
+    """
+
+    __slots__ = ("_stops", "_spans")
+
+    def __init__(self, tokens: List, lines: LineIndex, size: int):
+        stops: List[int] = []                      # offsets of '{' / ';' outside parentheses
+        spans: Dict[int, Optional[Tuple[int, int]]] = {}
+        opened: List[int] = []                     # offsets of all open '{' (None if inside parentheses)
+        parens = 0
+        for tok in tokens:
+            if tok.__class__ is not jtok.Separator:
+                continue
+            v = tok.value
+            if v == "(":
+                parens += 1
+            elif v == ")":
+                parens -= 1
+            elif v == "{":
+                offset = lines.offset(tok.position.line, tok.position.column)
+                if parens <= 0:
+                    stops.append(offset)
+                    spans[offset] = (offset, size)  # until closed
+                opened.append(offset if parens <= 0 else None)
+            elif v == "}":
+                if opened:
+                    start = opened.pop()
+                    if start is not None:
+                        spans[start] = (start, lines.offset(tok.position.line, tok.position.column) + 1)
+            elif v == ";" and parens <= 0:
+                offset = lines.offset(tok.position.line, tok.position.column)
+                stops.append(offset)
+                spans[offset] = None
+        self._stops = stops
+        self._spans = spans
+
+    def after(self, offset: int) -> Optional[Tuple[int, int]]:
+        """Body span of the declaration starting at offset."""
+        i = bisect_left(self._stops, offset)
+        if i == len(self._stops):
+            return None
+        return self._spans[self._stops[i]]
+
+
+def extract_ast(text: str, lines: Optional[LineIndex] = None) -> Optional[JavaDecl]:
+    """JavaDecl from the javalang AST; raises on parse errors."""
+    lines = lines or LineIndex(text)
+    # One tokenizer pass feeds both the parser and the body spans
+    tokens = list(jtok.tokenize(text))
+    tree = javalang.parser.Parser(tokens).parse()
+    pkg = tree.package.name if tree.package else None
+    for _, node in tree.filter(javalang.tree.ClassDeclaration):
+        bodies = _BodySpans(tokens, lines, len(text))
+        methods = []
+        for m in node.methods:
+            offset = lines.offset(*m.position) if m.position else 0
+            methods.append(JavaMethodDecl(
+                name=m.name,
+                params=[getattr(p.type, "name", str(p.type)) for p in (m.parameters or [])],
+                annotations=[(a.name, _ast_string(a.element)) for a in (m.annotations or [])],
+                offset=offset,
+                body=bodies.after(offset) if m.position else None,
+            ))
+        return JavaDecl(node.name, pkg, methods)
+    return None
+
+
+# -----------------------------
+# Fast mode (tokenizer only)
+# -----------------------------
+class _Tokens:
+    """Token stream with one token of push-back."""
+
+    __slots__ = ("_it", "_back")
+
+    def __init__(self, text: str):
+        self._it = jtok.tokenize(text)
+        self._back = None
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        tok = self._back
+        if tok is not None:
+            self._back = None
+            return tok
+        return next(self._it)
+
+    def peek(self):
+        if self._back is None:
+            self._back = next(self._it, None)
+        return self._back
+
+    def skip_block(self):
+        """Skip to the '}' closing the '{' just consumed; returns it (or None)."""
+        depth = 1
+        for tok in self:
+            if tok.__class__ is jtok.Separator:
+                if tok.value == "{":
+                    depth += 1
+                elif tok.value == "}":
+                    depth -= 1
+                    if not depth:
+                        return tok
+        return None
+
+    def skip_statement(self):
+        """Skip to the ';' ending a field declaration (initializers may hold
+        lambdas, anonymous classes and array initializers)."""
+        depth = 0
+        for tok in self:
+            if tok.__class__ is jtok.Separator:
+                v = tok.value
+                if v in "({[":
+                    depth += 1
+                elif v in ")}]":
+                    depth -= 1
+                    if depth < 0:
+                        # Unterminated field at the end of the class body
+                        self._back = tok
+                        return
+                elif v == ";" and not depth:
+                    return
+
+    def until(self, *values: str):
+        """Skip to the first top-level separator in values; returns it (or None)."""
+        for tok in self:
+            if tok.__class__ is jtok.Separator and tok.value in values:
+                return tok
+        return None
+
+    def annotation(self) -> Tuple[str, Optional[str]]:
+        """Name and string argument of the annotation after a consumed '@'."""
+        parts = []
+        for tok in self:
+            parts.append(tok.value)
+            nxt = self.peek()
+            if nxt is None or nxt.value != ".":
+                break
+            parts.append(next(self).value)
+        arg = None
+        nxt = self.peek()
+        if nxt is not None and nxt.value == "(":
+            next(self)
+            inner = []
+            depth = 1
+            for tok in self:
+                if tok.__class__ is jtok.Separator:
+                    if tok.value == "(":
+                        depth += 1
+                    elif tok.value == ")":
+                        depth -= 1
+                        if not depth:
+                            break
+                inner.append(tok)
+            if len(inner) == 3 and inner[0].value == "value" and inner[1].value == "=":
+                inner = inner[2:]
+            if len(inner) == 1 and inner[0].__class__ is jtok.String and inner[0].value.startswith('"'):
+                arg = inner[0].value[1:-1]
+        return "".join(parts), arg
+
+    def params(self) -> List[str]:
+        """Parameter type names up to the ')' closing the consumed '('."""
+        params: List[str] = []
+        current: Optional[str] = None
+        depth = 0  # generics
+        for tok in self:
+            cls = tok.__class__
+            v = tok.value
+            if cls is jtok.Annotation:
+                self.annotation()
+                continue
+            if cls is jtok.Separator:
+                if v == ")":
+                    break
+                if v == "," and not depth:
+                    if current is not None:
+                        params.append(current)
+                    current = None
+                continue
+            if cls is jtok.Operator:
+                if v[0] == "<":
+                    depth += 1
+                elif v[0] == ">":
+                    depth -= len(v)
+                continue
+            if cls is jtok.Modifier:  # final
+                continue
+            if current is None:
+                current = v
+        if current is not None:
+            params.append(current)
+        return params
+
+
+_TYPE_KEYWORDS = frozenset(("class", "interface", "enum"))
+
+
+def _is_constructor(decl: List) -> bool:
+    """No return type before the name, only (optional) type parameters."""
+    if len(decl) == 1:
+        return True
+    if decl[0].value != "<":
+        return False
+    depth = 0
+    for i, tok in enumerate(decl):
+        v = tok.value
+        if tok.__class__ is jtok.Operator and v[0] in "<>":
+            depth += len(v) if v[0] == "<" else -len(v)
+            if depth <= 0:
+                return i == len(decl) - 2
+    return False
+
+
+def _class_body(tokens: _Tokens, lines: LineIndex) -> List[JavaMethodDecl]:
+    """Methods declared directly in the class body after its '{'."""
+    methods: List[JavaMethodDecl] = []
+    annotations: List[Tuple[str, Optional[str]]] = []
+    decl: List = []  # tokens of the current member after modifiers/annotations
+
+    for tok in tokens:
+        cls = tok.__class__
+        v = tok.value
+        if cls is jtok.Separator:
+            if v == "}" and not decl:
+                return methods
+            if v == "(" and decl and decl[-1].__class__ is jtok.Identifier:
+                name = decl[-1].value
+                params = tokens.params()
+                # throws ... followed by the body, or ';' for abstract/native
+                end = tokens.until("{", ";", "}")
+                body = None
+                if end is not None and end.value == "{":
+                    start = lines.offset(end.position.line, end.position.column)
+                    close = tokens.skip_block()
+                    stop = lines.offset(close.position.line, close.position.column) + 1 if close else len(lines.text)
+                    body = (start, stop)
+                elif end is not None and end.value == "}":
+                    return methods
+                if not _is_constructor(decl):
+                    first = decl[0].position
+                    methods.append(JavaMethodDecl(name, params, annotations,
+                                                  lines.offset(first.line, first.column), body))
+            elif v == "{":
+                # Initializer block, or body of a nested type
+                tokens.skip_block()
+            elif v == "}":
+                # Stray member tokens before the closing brace
+                return methods
+            elif v != ";":
+                decl.append(tok)
+                continue
+            annotations, decl = [], []
+        elif cls is jtok.Annotation:
+            nxt = tokens.peek()
+            if nxt is not None and nxt.value == "interface":
+                decl.append(tok)
+            else:
+                annotations.append(tokens.annotation())
+        elif cls is jtok.Modifier and not decl:
+            continue
+        elif cls is jtok.Operator and v == "=" and decl:
+            # Field with initializer
+            tokens.skip_statement()
+            annotations, decl = [], []
+        elif cls is jtok.Keyword and v in _TYPE_KEYWORDS:
+            # Nested type: skip its header and body
+            end = tokens.until("{", "}")
+            if end is not None and end.value == "{":
+                tokens.skip_block()
+            annotations, decl = [], []
+        else:
+            decl.append(tok)
+    return methods
+
+
+def extract_fast(text: str, lines: Optional[LineIndex] = None) -> Optional[JavaDecl]:
+    """JavaDecl from the token stream alone; raises only on lexer errors."""
+    lines = lines or LineIndex(text)
+    tokens = _Tokens(text)
+    pkg: Optional[str] = None
+    prev = None
+    for tok in tokens:
+        cls = tok.__class__
+        if cls is jtok.Keyword:
+            if tok.value == "package" and pkg is None:
+                parts = []
+                for t in tokens:
+                    if t.value == ";":
+                        break
+                    parts.append(t.value)
+                pkg = "".join(parts)
+            elif tok.value == "class" and (prev is None or prev.value != "."):
+                name_tok = next(tokens, None)
+                if name_tok is None or name_tok.__class__ is not jtok.Identifier:
+                    return None
+                if tokens.until("{") is None:
+                    return JavaDecl(name_tok.value, pkg, [])
+                return JavaDecl(name_tok.value, pkg, _class_body(tokens, lines))
+        prev = tok
+    return None
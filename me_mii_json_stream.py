@@ -0,0 +1,192 @@
+"""
+SAP ME/MII Streaming JSON Output
+- JsonDocumentWriter: writes one JSON object section by section, list/dict
+  members one at a time (never builds the whole document as a string)
+- JsonLinesWriter: one JSON record per line, for stream-reading consumers
+
+The document layout is byte-identical to
+``json.dumps(obj, indent=2, ensure_ascii=False)``, so readers of the
+existing outputs (doc_agent, streamlit_app, pdf_report_generator, ...) are
+unaffected. Files are written to a temporary name and moved into place when
+complete.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+
+class JsonDocumentWriter:
+    """Incremental writer for a top-level JSON object.
+
+    Use ``section(key, value)`` for whole sections, or ``begin_list(key)``,
+    ``append(item)`` ..., ``end_list()`` to emit a list item by item as it
+    is produced.
+    """
+
+    def __init__(self, path: Path, indent: int = 2, ensure_ascii: bool = False):
+        self.path = Path(path)
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._fh: Optional[TextIO] = None
+        self._sections = 0
+        self._items: Optional[int] = None  # open list: items written so far
+
+    # -----------------------------
+    # File handling
+    # -----------------------------
+    def open(self) -> "JsonDocumentWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self._tmp, "w", encoding="utf-8")
+        self._fh.write("{")
+        return self
+
+    def close(self):
+        """Finish the object and move the file into place."""
+        if self._fh is None:
+            return
+        if self._items is not None:
+            self.end_list()
+        self._fh.write("\n}" if self._sections else "}")
+        self._fh.close()
+        self._fh = None
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """Drop a partially written document."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        try:
+            self._tmp.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> "JsonDocumentWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # -----------------------------
+    # Encoding
+    # -----------------------------
+    def _encode(self, value: Any, level: int) -> str:
+        """value as json.dumps would render it nested at depth level."""
+        text = json.dumps(value, indent=self.indent, ensure_ascii=self.ensure_ascii)
+        if level and "\n" in text:
+            # Newlines inside strings are escaped, so only layout breaks match
+            text = text.replace("\n", "\n" + " " * (self.indent * level))
+        return text
+
+    def _pad(self, level: int) -> str:
+        return "\n" + " " * (self.indent * level)
+
+    def _key(self, key: str) -> str:
+        if self._items is not None:
+            raise ValueError("end_list() must be called before the next section")
+        sep = "," if self._sections else ""
+        self._sections += 1
+        return f"{sep}{self._pad(1)}{json.dumps(str(key), ensure_ascii=self.ensure_ascii)}: "
+
+    # -----------------------------
+    # Sections
+    # -----------------------------
+    def section(self, key: str, value: Any):
+        """Write one member; lists and dicts are streamed member by member."""
+        fh = self._fh
+        if isinstance(value, list) and value:
+            self.begin_list(key)
+            for item in value:
+                self.append(item)
+            self.end_list()
+        elif isinstance(value, dict) and value:
+            fh.write(self._key(key) + "{")
+            first = True
+            for k, v in value.items():
+                fh.write(("" if first else ",") + self._pad(2))
+                fh.write(f"{json.dumps(str(k), ensure_ascii=self.ensure_ascii)}: {self._encode(v, 2)}")
+                first = False
+            fh.write(self._pad(1) + "}")
+        else:
+            fh.write(self._key(key) + self._encode(value, 1))
+
+    def begin_list(self, key: str):
+        self._fh.write(self._key(key) + "[")
+        self._items = 0
+
+    def append(self, item: Any):
+        if self._items is None:
+            raise ValueError("append() outside begin_list()/end_list()")
+        self._fh.write(("," if self._items else "") + self._pad(2) + self._encode(item, 2))
+        self._items += 1
+
+    def end_list(self):
+        if self._items is None:
+            return
+        self._fh.write((self._pad(1) + "]") if self._items else "]")
+        self._items = None
+
+
+def dump_json(obj: Dict[str, Any], path: Path, indent: int = 2, ensure_ascii: bool = False):
+    """Stream a dict to path (same bytes as json.dumps(obj, indent=indent))."""
+    with JsonDocumentWriter(path, indent=indent, ensure_ascii=ensure_ascii) as writer:
+        for key, value in obj.items():
+            writer.section(key, value)
+
+
+class JsonLinesWriter:
+    """Append-only JSON Lines file (one record per line, UTF-8)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._fh: Optional[TextIO] = None
+        self.count = 0
+
+    def open(self) -> "JsonLinesWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self._tmp, "w", encoding="utf-8")
+        return self
+
+    def write(self, record: Any):
+        self._fh.write(json.dumps(record, ensure_ascii=False))
+        self._fh.write("\n")
+        self.count += 1
+
+    def close(self):
+        if self._fh is None:
+            return
+        self._fh.close()
+        self._fh = None
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        try:
+            self._tmp.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_json_lines(path: Path) -> Iterable[Any]:
+    """Read back a JSON Lines file record by record."""
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,412 @@
+"""
+SAP ME/MII Scan Engine
+- Single-pass directory walk (os.scandir, one stat per file)
+- File classification by suffix and path parts
+- Dispatch of every file to the registered parsers/collectors
+- Shared per-file content handle (read and decoded once for all parsers)
+- Optional process-pool fan-out of per-file parsing (Collector stages)
+
+The walk order matches ``Path.rglob("*")`` (files of a directory first, then
+its sub-directories depth-first), so analyzers that used to call rglob
+produce identical output when driven by the engine.
+"""
+import hashlib
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Files at or above this size are mapped instead of read for bytes views
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+
+class FileContent:
+    """Read-once handle on a file's contents.
+
+    ``data`` (raw bytes) and ``text`` (UTF-8, undecodable bytes ignored,
+    universal newlines — same as ``read_text(encoding="utf-8",
+    errors="ignore")``) are loaded on first access and cached, so every
+    detector/parser given the same handle shares one read and one decode.
+    """
+
+    __slots__ = ("path", "size", "_data", "_text", "_mmap", "_derived")
+
+    def __init__(self, path: Path, size: Optional[int] = None):
+        self.path = Path(path)
+        self.size = size
+        self._data: Optional[bytes] = None
+        self._text: Optional[str] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._derived: Optional[Dict[str, Any]] = None
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            self._data = self.path.read_bytes()
+            self.size = len(self._data)
+        return self._data
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            text = self.data.decode("utf-8", errors="ignore")
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            self._text = text
+        return self._text
+
+    def derived(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Per-file value computed once from the content (e.g. folded text)."""
+        if self._derived is None:
+            self._derived = {}
+        if key not in self._derived:
+            self._derived[key] = factory()
+        return self._derived[key]
+
+    def digest(self) -> str:
+        """Content hash used to detect changed files (incremental runs)."""
+        return hashlib.blake2b(self.data, digest_size=16).hexdigest()
+
+    def view(self, use_mmap: Optional[bool] = None) -> Union[memoryview, mmap.mmap]:
+        """Bytes view of the file without copying it again.
+
+        Large files (>= MMAP_THRESHOLD, or ``use_mmap=True``) that were not
+        read yet are memory-mapped read-only; otherwise a memoryview over
+        ``data`` is returned. Call ``close()`` to release a mapping.
+        """
+        if self._data is not None:
+            return memoryview(self._data)
+        if use_mmap is None:
+            size = self.size if self.size is not None else self.path.stat().st_size
+            use_mmap = size >= MMAP_THRESHOLD
+        if not use_mmap:
+            return memoryview(self.data)
+        if self._mmap is None:
+            with open(self.path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return memoryview(b"")
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "FileContent":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def file_text(fp: Path, content: Optional[FileContent] = None) -> str:
+    """Text of fp, taken from the shared handle when one is given."""
+    if content is not None:
+        return content.text
+    return fp.read_text(encoding="utf-8", errors="ignore")
+
+
+class LineIndex:
+    """Newline offsets of a text for O(log n) line/column lookups.
+
+    ``line(offset)`` equals ``text[:offset].count("\\n") + 1`` without
+    copying the prefix; the index is built on the first lookup.
+    """
+
+    __slots__ = ("text", "_newlines")
+
+    def __init__(self, text: str):
+        self.text = text
+        self._newlines: Optional[array] = None
+
+    @property
+    def newlines(self) -> array:
+        if self._newlines is None:
+            # Offset of each "\n": running sum of line lengths (+1 per break),
+            # minus the leading -1 and the end of the last (unterminated) line
+            lengths = (len(line) + 1 for line in self.text.split("\n"))
+            self._newlines = array("q", accumulate(lengths, initial=-1))[1:-1]
+        return self._newlines
+
+    def line(self, offset: int) -> int:
+        """1-based line number of offset."""
+        return bisect_left(self.newlines, offset) + 1
+
+    def column(self, offset: int) -> int:
+        """1-based column of offset."""
+        return self.position(offset)[1]
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """(line, column), both 1-based."""
+        newlines = self.newlines
+        k = bisect_left(newlines, offset)
+        line_start = newlines[k - 1] + 1 if k else 0
+        return k + 1, offset - line_start + 1
+
+    def offset(self, line: int, column: int) -> int:
+        """Inverse of position(): offset of a 1-based (line, column)."""
+        line_start = self.newlines[line - 2] + 1 if line > 1 else 0
+        return line_start + column - 1
+
+
+def line_index(text: str, content: Optional[FileContent] = None) -> LineIndex:
+    """LineIndex for a file's text; shared via the content handle when given."""
+    if content is not None:
+        return content.derived("line_index", lambda: LineIndex(text))
+    return LineIndex(text)
+
+
+class FileEntry:
+    """A file discovered by the scan, with its stat data captured once."""
+
+    __slots__ = ("path", "name", "suffix", "ext", "parts", "size", "mtime", "_content")
+
+    def __init__(self, path: Path, size: int, mtime: float):
+        self.path = path
+        self.name = path.name
+        self.suffix = path.suffix
+        self.ext = self.suffix.lower()
+        self.parts = path.parts
+        self.size = size
+        self.mtime = mtime
+        self._content: Optional[FileContent] = None
+
+    @property
+    def content(self) -> FileContent:
+        """Lazily created content handle shared by all handlers of this file."""
+        if self._content is None:
+            self._content = FileContent(self.path, self.size)
+        return self._content
+
+    def __repr__(self) -> str:
+        return f"FileEntry({str(self.path)!r}, size={self.size})"
+
+
+def iter_files(root: Path) -> Iterator[FileEntry]:
+    """Yield every regular file under root in rglob order.
+
+    Symlinked directories are not followed (same as rglob); symlinked files
+    are reported like ``Path.is_file()`` would.
+    """
+    root = Path(root)
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(str(directory)) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(directory / entry.name)
+                    continue
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            yield FileEntry(directory / entry.name, st.st_size, st.st_mtime)
+
+        # Depth-first: first sub-directory is visited next
+        stack.extend(reversed(subdirs))
+
+
+Handler = Callable[[FileEntry], None]
+
+# Upper bound on files per worker task (small chunks balance load, large
+# chunks keep pickling/IPC overhead low)
+MAX_CHUNK_SIZE = 256
+
+
+class Collector:
+    """Base class for per-file analysis stages.
+
+    ``parse`` must be side-effect free and only depend on the entry (it may
+    run in a worker process); ``merge`` folds a parse result into the
+    collector's state and is always called in scan order.
+    """
+
+    suffixes: Optional[Iterable[str]] = None
+
+    @classmethod
+    def accepts(cls, entry: FileEntry) -> bool:
+        return True
+
+    @classmethod
+    def parse(cls, entry: FileEntry) -> Any:
+        raise NotImplementedError
+
+    def merge(self, fragment: Any):
+        raise NotImplementedError
+
+    def visit(self, entry: FileEntry):
+        self.merge(self.parse(entry))
+
+    @classmethod
+    def dump_fragment(cls, fragment: Any) -> Any:
+        """JSON-serialisable form of a parse result (for the incremental cache)."""
+        return fragment
+
+    @classmethod
+    def load_fragment(cls, data: Any) -> Any:
+        return data
+
+
+Fragments = List[Tuple[int, Any]]
+
+
+def _parse_chunk(collector_types: Tuple[type, ...],
+                 items: List[Tuple[str, int, float, Tuple[int, ...]]],
+                 with_digest: bool = False) -> List[Tuple[Optional[str], Fragments]]:
+    """Worker side of ScanEngine.run(workers>1): parse one chunk of files."""
+    out = []
+    for path, size, mtime, indices in items:
+        entry = FileEntry(Path(path), size, mtime)
+        fragments = [(i, collector_types[i].parse(entry)) for i in indices]
+        digest = _entry_digest(entry) if with_digest else None
+        out.append((digest, fragments))
+        if entry._content is not None:
+            entry._content.close()
+    return out
+
+
+def _entry_digest(entry: FileEntry) -> Optional[str]:
+    try:
+        return entry.content.digest()
+    except OSError:
+        return None
+
+
+class ScanEngine:
+    """Walks a tree once and hands each file to every registered handler.
+
+    Handlers are called in registration order; ``suffixes`` (lower-case,
+    with dot) restricts a handler to matching files, ``match`` is an extra
+    predicate on the FileEntry. Handlers should read the file through
+    ``entry.content`` so it is loaded at most once per scan.
+
+    Collectors added with ``add`` can also be run on a process pool
+    (``run(workers=N)``) and/or against an incremental cache
+    (``run(cache=AnalysisCache)``, see me_mii_cache); results are merged in
+    scan order, so the output does not depend on either.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._handlers: List[Tuple[Optional[frozenset], Optional[Callable[[FileEntry], bool]], Handler, Optional[Collector]]] = []
+
+    def register(self, handler: Handler, suffixes: Optional[Iterable[str]] = None,
+                 match: Optional[Callable[[FileEntry], bool]] = None) -> "ScanEngine":
+        exts = frozenset(s.lower() for s in suffixes) if suffixes is not None else None
+        self._handlers.append((exts, match, handler, None))
+        return self
+
+    def add(self, collector: Collector) -> "ScanEngine":
+        suffixes = collector.suffixes
+        exts = frozenset(s.lower() for s in suffixes) if suffixes is not None else None
+        self._handlers.append((exts, collector.accepts, collector.visit, collector))
+        return self
+
+    @property
+    def collectors(self) -> List[Collector]:
+        collectors = [h[3] for h in self._handlers]
+        if any(c is None for c in collectors):
+            raise ValueError("parallel/cached scans need Collector stages (use add(), not register())")
+        return collectors
+
+    def _wanted(self, entry: FileEntry) -> Iterator[int]:
+        for i, (exts, match, _, _) in enumerate(self._handlers):
+            if exts is not None and entry.ext not in exts:
+                continue
+            if match is not None and not match(entry):
+                continue
+            yield i
+
+    def run(self, workers: int = 1, chunk_size: Optional[int] = None, cache=None) -> int:
+        """Scan the tree and dispatch; returns the number of files seen."""
+        if workers > 1:
+            return self._run_parallel(workers, chunk_size, cache)
+        if cache is not None:
+            return self._run_cached(cache)
+
+        count = 0
+        for entry in iter_files(self.root):
+            count += 1
+            for i in self._wanted(entry):
+                self._handlers[i][2](entry)
+            if entry._content is not None:
+                entry._content.close()
+        return count
+
+    def _run_cached(self, cache) -> int:
+        collectors = self.collectors
+        collector_types = tuple(type(c) for c in collectors)
+
+        count = 0
+        for entry in iter_files(self.root):
+            count += 1
+            indices = tuple(self._wanted(entry))
+            if not indices:
+                continue
+            fragments = cache.lookup(entry, collector_types, indices)
+            if fragments is None:
+                fragments = [(i, collector_types[i].parse(entry)) for i in indices]
+                cache.store(entry, collector_types, fragments, _entry_digest(entry))
+            for i, fragment in fragments:
+                collectors[i].merge(fragment)
+            if entry._content is not None:
+                entry._content.close()
+        return count
+
+    def _run_parallel(self, workers: int, chunk_size: Optional[int], cache=None) -> int:
+        collectors = self.collectors
+        collector_types = tuple(type(c) for c in collectors)
+
+        count = 0
+        # One slot per accepted file, in scan order: cached fragments are
+        # filled in right away, the rest come back from the pool
+        slots: List[Optional[Fragments]] = []
+        pending: List[Tuple[int, FileEntry]] = []
+        items = []
+        for entry in iter_files(self.root):
+            count += 1
+            indices = tuple(self._wanted(entry))
+            if not indices:
+                continue
+            fragments = cache.lookup(entry, collector_types, indices) if cache is not None else None
+            if fragments is None:
+                pending.append((len(slots), entry))
+                items.append((str(entry.path), entry.size, entry.mtime, indices))
+            if entry._content is not None:
+                entry._content.close()
+            slots.append(fragments)
+
+        if items:
+            if chunk_size is None:
+                # ~8 chunks per worker for load balancing
+                chunk_size = max(1, min(MAX_CHUNK_SIZE, len(items) // (workers * 8)))
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                # map() yields in submission order -> deterministic merge order
+                results = pool.map(_parse_chunk, [collector_types] * len(chunks), chunks,
+                                   [cache is not None] * len(chunks))
+                parsed = (r for chunk_result in results for r in chunk_result)
+                for (slot, entry), (digest, fragments) in zip(pending, parsed):
+                    slots[slot] = fragments
+                    if cache is not None:
+                        cache.store(entry, collector_types, fragments, digest)
+
+        for fragments in slots:
+            for i, fragment in fragments:
+                collectors[i].merge(fragment)
+        return count
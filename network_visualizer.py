@@ -5,9 +5,11 @@ Creates interactive network visualizations using Pyvis and NetworkX
 
 import networkx as nx
 import json
+import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from pyvis.network import Network
+from me_mii_graph_store import GraphStore, load_graph
 import streamlit as st
 import streamlit.components.v1 as components
 
@@ -229,9 +231,12 @@ def create_network_visualization(graph_json_path: Path, output_path: Path) -> st
         Path to generated HTML file
     """
     try:
-        # Load graph data
-        with open(graph_json_path, 'r', encoding='utf-8') as f:
-            graph_data = json.load(f)
+        # Load graph data (graph.npz next to graph.json when present)
+        graph = load_graph(graph_json_path)
+        if graph is None:
+            st.error(f"Graph data could not be loaded: {graph_json_path}")
+            return None
+        graph_data = graph.to_edges()
         
         # Create visualizer
         visualizer = NetworkVisualizer()
@@ -269,11 +274,14 @@ def create_summary_statistics(graph_data: Dict[str, Any]) -> Dict[str, Any]:
     Create summary statistics from graph data
     
     Args:
-        graph_data: JSON data from graph.json
+        graph_data: JSON data from graph.json, or a GraphStore (load_graph)
         
     Returns:
         Dictionary with statistics
     """
+    if isinstance(graph_data, GraphStore):
+        return _graph_store_statistics(graph_data)
+
     # Handle different JSON structures
     if isinstance(graph_data, list):
         edges = graph_data
@@ -290,6 +298,7 @@ def create_summary_statistics(graph_data: Dict[str, Any]) -> Dict[str, Any]:
     # Count nodes by type
     node_types = {}
     relation_types = {}
+    nodes = set()
     
     for edge in edges:
         # Handle different edge formats
@@ -313,17 +322,40 @@ def create_summary_statistics(graph_data: Dict[str, Any]) -> Dict[str, Any]:
         if source:
             source_type = _get_node_type_from_id(source)
             node_types[source_type] = node_types.get(source_type, 0) + 1
+            nodes.add(source)
         
         if target:
             target_type = _get_node_type_from_id(target)
             node_types[target_type] = node_types.get(target_type, 0) + 1
+            nodes.add(target)
     
     return {
         'total_edges': len(edges),
         'node_types': node_types,
         'relation_types': relation_types,
-        'unique_nodes': len(set([str(edge[0]) if isinstance(edge, list) and len(edge) > 0 else edge.get('source', '') for edge in edges] + 
-                              [str(edge[1]) if isinstance(edge, list) and len(edge) > 1 else edge.get('target', '') for edge in edges]))
+        'unique_nodes': len(nodes)
+    }
+
+
+def _graph_store_statistics(graph: GraphStore) -> Dict[str, Any]:
+    """create_summary_statistics on the columns: node types are resolved once
+    per node and weighted by its degree (one count per edge endpoint); nodes
+    and relation types are visited in edge order, as the edge-list path does"""
+    degrees = graph.degrees()
+    node_types = {}
+    keys = graph.keys.tolist()
+    endpoints = np.column_stack((np.asarray(graph.src), np.asarray(graph.dst))).ravel()
+    nodes, first = np.unique(endpoints, return_index=True)
+    for i in nodes[np.argsort(first)].tolist():
+        node_type = _get_node_type_from_id(keys[i])
+        node_types[node_type] = node_types.get(node_type, 0) + int(degrees[i])
+    types, first, counts = np.unique(np.asarray(graph.type), return_index=True, return_counts=True)
+    relation_types = {graph.types[types[j]]: int(counts[j]) for j in np.argsort(first).tolist()}
+    return {
+        'total_edges': len(graph),
+        'node_types': node_types,
+        'relation_types': relation_types,
+        'unique_nodes': len(nodes)
     }
 
 
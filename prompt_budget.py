@@ -0,0 +1,124 @@
+"""
+Token-budgeted prompt assembly (rag_consultant, doc_agent)
+- A prompt is a template with {name} fields plus one section per field:
+  a text (truncated to fit, head kept) or a list of items in value order
+  (whole items packed while they fit, the rest dropped)
+- Sections are packed by priority into the model window (Modelfile:
+  num_ctx 8192) minus the tokens reserved for the answer, each up to its
+  own budget
+- The token estimator is pluggable: the default is rag_index.estimate_tokens
+  (about 4 characters per token); tokenizer_estimator() wraps any tokenizer
+  with an encode() method (e.g. a Hugging Face or tiktoken tokenizer)
+- report: window, reserved, fixed template tokens, used and dropped tokens
+  per section, so the prefill size is known before the request is sent
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from rag_index import estimate_tokens
+
+NUM_CTX = 8192          # Modelfile: parameter num_ctx 8192
+ANSWER_TOKENS = 2048    # left free for the generated answer
+TRUNCATED = " …[truncated]"
+
+Estimator = Callable[[str], int]
+_FIELD = re.compile(r"\{(\w+)\}")
+
+
+def tokenizer_estimator(tokenizer: Any) -> Estimator:
+    """Estimator counting the tokens of tokenizer.encode(text)."""
+    return lambda text: len(tokenizer.encode(text))
+
+
+class _Section:
+    __slots__ = ("name", "value", "budget", "priority", "sep")
+
+    def __init__(self, name: str, value: Union[str, Sequence[str]], budget: Optional[int], priority: int, sep: str):
+        self.name = name
+        self.value = value
+        self.budget = budget
+        self.priority = priority
+        self.sep = sep
+
+
+class PromptBudget:
+    """Packs prompt sections into num_ctx - reserve tokens."""
+
+    def __init__(self, num_ctx: int = NUM_CTX, reserve: int = ANSWER_TOKENS, estimate: Estimator = estimate_tokens):
+        self.num_ctx = num_ctx
+        self.reserve = reserve
+        self.estimate = estimate
+        self.sections: List[_Section] = []
+        self.report: Dict[str, Any] = {}
+
+    def add(self, name: str, text: str, budget: Optional[int] = None, priority: int = 0) -> "PromptBudget":
+        """Text section; cut at the end (with a marker) if over its share."""
+        self.sections.append(_Section(name, text or "", budget, priority, ""))
+        return self
+
+    def add_items(self, name: str, items: Sequence[str], budget: Optional[int] = None, priority: int = 0,
+                  sep: str = "\n") -> "PromptBudget":
+        """List section, items best first; an item that does not fit is
+        skipped so smaller later ones can still use the space."""
+        self.sections.append(_Section(name, list(items), budget, priority, sep))
+        return self
+
+    def _truncate(self, text: str, limit: int) -> str:
+        if limit <= 0:
+            return ""
+        cost = self.estimate(text)
+        # Proportional cut, then shrink until the estimate fits (estimators
+        # are only roughly linear in the text length)
+        cut = len(text) * (limit - self.estimate(TRUNCATED)) // max(cost, 1)
+        while cut > 0:
+            head = text[:cut] + TRUNCATED
+            if self.estimate(head) <= limit:
+                return head
+            cut = cut * 49 // 50
+        return ""
+
+    def _fit(self, section: _Section, limit: int) -> Tuple[str, Dict[str, Any]]:
+        if isinstance(section.value, str):
+            text = section.value
+            cost = self.estimate(text) if text else 0
+            if cost > limit:
+                text = self._truncate(text, limit)
+            used = self.estimate(text) if text else 0
+            return text, {'used': used, 'dropped': max(cost - used, 0)}
+        kept: List[str] = []
+        used = dropped = 0
+        sep_cost = self.estimate(section.sep) if section.sep else 0
+        for item in section.value:
+            cost = self.estimate(item) + (sep_cost if kept else 0)
+            if used + cost <= limit:
+                kept.append(item)
+                used += cost
+            else:
+                dropped += cost
+        return section.sep.join(kept), {'used': used, 'dropped': dropped,
+                                        'items': len(kept), 'items_dropped': len(section.value) - len(kept)}
+
+    def render(self, template: str) -> str:
+        """template with every {name} field filled by its packed section
+        (unknown fields stay as written); sets self.report."""
+        names = {s.name for s in self.sections}
+        fixed = self.estimate(_FIELD.sub(lambda m: "" if m.group(1) in names else m.group(0), template))
+        available = self.num_ctx - self.reserve - fixed
+        remaining = max(available, 0)
+        texts: Dict[str, str] = {}
+        per_section: Dict[str, Dict[str, Any]] = {}
+        for section in sorted(self.sections, key=lambda s: s.priority):
+            limit = remaining if section.budget is None else min(section.budget, remaining)
+            texts[section.name], per_section[section.name] = self._fit(section, limit)
+            remaining -= per_section[section.name]['used']
+        prompt = _FIELD.sub(lambda m: texts.get(m.group(1), m.group(0)), template)
+        used = sum(s['used'] for s in per_section.values())
+        self.report = {
+            'window': self.num_ctx,
+            'reserved': self.reserve,
+            'fixed': fixed,
+            'used': fixed + used,
+            'dropped': sum(s['dropped'] for s in per_section.values()),
+            'sections': {s.name: per_section[s.name] for s in self.sections},
+        }
+        return prompt
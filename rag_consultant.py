@@ -1,23 +1,38 @@
 import os
 import json
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import requests
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from llm_cache import cache_key, get_cache
+from llm_client import get_client
+from prompt_budget import Estimator, PromptBudget
+from rag_index import SOURCES, RagIndex, estimate_tokens
+
+# Characters of each retrieved document that go into the prompt
+SNIPPET_CHARS = 4000
+# Per-section token budgets of a prompt (Modelfile: num_ctx 8192, minus
+# prompt_budget.ANSWER_TOKENS for the answer): retrieved chunks, and the
+# question (doc_agent sends whole generation prompts as the question)
+CONTEXT_TOKENS = 3000
+QUESTION_TOKENS = 2500
+DOC_HEADER_TOKENS = 40
+
+PROMPT_TEMPLATE = """Sistem: SAP ME/MII ve SAPUI5/Fiori uzman danışmansın. Somut SAP örnekleriyle, kısa ve uygulanabilir yanıtlar ver. Gerekirse adım adım çözüm ve risk notları ekle.
+
+[CONTEXT]
+{context}
+
+[QUESTION]
+{question}"""
+
 
 def load_corpus(output_dir: Path) -> List[Tuple[str, str]]:
     """Load analysis outputs as (doc_id, text)."""
     docs: List[Tuple[str, str]] = []
-    candidates = [
-        output_dir / "SUMMARY.md",
-        output_dir / "ADVANCED_SUMMARY.md",
-        output_dir / "graph.json",
-        output_dir / "sapui5_details.json",
-        output_dir / "sapui5_deep_analysis.json",
-    ]
+    candidates = [output_dir / name for name in SOURCES]
     for fp in candidates:
         if fp.exists():
             try:
@@ -29,7 +44,8 @@ def load_corpus(output_dir: Path) -> List[Tuple[str, str]]:
 
 
 def retrieve(query: str, docs: List[Tuple[str, str]], k: int = 5) -> List[Tuple[str, str, float]]:
-    """Return top-k (doc_id, text, score) by TF-IDF cosine."""
+    """Return top-k (doc_id, text, score) by TF-IDF cosine (fitted on the fly;
+    ask() uses the persistent RagIndex instead)."""
     if not docs:
         return []
     ids = [d[0] for d in docs]
@@ -44,10 +60,10 @@ def retrieve(query: str, docs: List[Tuple[str, str]], k: int = 5) -> List[Tuple[
     return ranked[:k]
 
 
-def build_prompt(contexts: List[Tuple[str, str, float]], question: str) -> str:
+def build_prompt(contexts: List[Tuple[str, str, float]], question: str, limit: Optional[int] = SNIPPET_CHARS) -> str:
     ctx = []
     for doc_id, text, score in contexts:
-        snippet = text[:4000]
+        snippet = text[:limit] if limit is not None else text
         ctx.append(f"[DOC:{doc_id} | score={score:.3f}]\n{snippet}")
     joined = "\n\n".join(ctx) if ctx else "(no context)"
     prompt = f"""
@@ -62,37 +78,129 @@ Sistem: SAP ME/MII ve SAPUI5/Fiori uzman danışmansın. Somut SAP örnekleriyle
     return prompt
 
 
-def ollama_chat(model: str, prompt: str, host: str = "http://localhost:11434", timeout_s: int = 600) -> str:
-    url = f"{host}/api/chat"
+def _chat_payload(model: str, prompt: str, stream: bool, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     payload = {
         "model": model,
         "messages": [{"role": "user", "content": prompt}],
-        "stream": False,
+        "stream": stream,
     }
-    resp = requests.post(url, json=payload, timeout=timeout_s)
-    resp.raise_for_status()
-    data = resp.json()
-    return data.get("message", {}).get("content", "")
+    if options:
+        payload["options"] = options
+    return payload
+
+
+def ollama_chat(model: str, prompt: str, host: str = "http://localhost:11434", timeout_s: int = 600,
+                options: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> str:
+    """Answer of model to prompt; identical requests come from the response
+    cache (llm_cache, keyed by model, prompt and options). use_cache=False
+    bypasses the cache (neither read nor written)."""
+    key = cache_key(model, prompt, options)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            return cached
+    payload = _chat_payload(model, prompt, False, options)
+    data = get_client(host).post_json("/api/chat", payload, timeout_s=timeout_s)
+    answer = data.get("message", {}).get("content", "")
+    if use_cache and answer:
+        get_cache().put(key, model, answer)
+    return answer
+
+
+def ollama_chat_stream(model: str, prompt: str, host: str = "http://localhost:11434", timeout_s: int = 600,
+                       options: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> Iterator[str]:
+    """Yield the answer's content pieces as Ollama produces them.
+
+    With "stream": true /api/chat sends NDJSON, one object per line, each
+    carrying the next message.content piece, until an object with
+    "done": true. timeout_s bounds the connect and each wait between lines.
+    Goes through the shared pooled client of host (llm_client.get_client).
+    A cached answer is yielded in one piece; a complete streamed answer is
+    cached as ollama_chat would.
+    """
+    key = cache_key(model, prompt, options)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            yield cached
+            return
+    payload = _chat_payload(model, prompt, True, options)
+    stream = get_client(host).stream_json("/api/chat", payload, timeout_s=timeout_s)
+    pieces = []
+    done = False
+    try:
+        for data in stream:
+            if data.get("error"):
+                raise RuntimeError(f"Ollama: {data['error']}")
+            piece = data.get("message", {}).get("content", "")
+            if piece:
+                pieces.append(piece)
+                yield piece
+            # the "done" object is the last line; reading on to the end of
+            # the body lets the connection go back to the pool
+            done = done or bool(data.get("done"))
+    finally:
+        stream.close()
+    if use_cache and done and pieces:
+        get_cache().put(key, model, "".join(pieces))
+
+
+def consult_prompt(question: str, output_dir: str = "./streamlit_output", estimate: Estimator = estimate_tokens,
+                   report: Optional[Dict[str, Any]] = None) -> str:
+    """Consultant prompt within the model window: the question up to
+    QUESTION_TOKENS, then the best chunks up to CONTEXT_TOKENS. report (if
+    given) receives the PromptBudget report (tokens used / dropped)."""
+    # Chunks are selected with their "[DOC:… | score=…]" header allowance
+    top = RagIndex.open(Path(output_dir)).retrieve_budget(
+        question, CONTEXT_TOKENS, lambda text: estimate(text) + DOC_HEADER_TOKENS)
+    budget = PromptBudget(estimate=estimate)
+    budget.add("question", question.strip(), QUESTION_TOKENS, priority=0)
+    if top:
+        budget.add_items("context", [f"[DOC:{doc_id} | score={score:.3f}]\n{text}" for doc_id, text, score in top],
+                         CONTEXT_TOKENS, priority=1, sep="\n\n")
+    else:
+        budget.add("context", "(no context)", priority=1)
+    prompt = budget.render(PROMPT_TEMPLATE)
+    if report is not None:
+        report.update(budget.report)
+    return prompt
+
+
+def ask(question: str, output_dir: str = "./streamlit_output", model: str = "me-mii-consultant", host: str = "http://localhost:11434", timeout_s: int = 600, use_cache: bool = True, report: Optional[Dict[str, Any]] = None, estimate: Estimator = estimate_tokens) -> str:
+    prompt = consult_prompt(question, output_dir, estimate=estimate, report=report)
+    return ollama_chat(model, prompt, host=host, timeout_s=timeout_s, use_cache=use_cache)
 
 
-def ask(question: str, output_dir: str = "./streamlit_output", model: str = "me-mii-consultant", host: str = "http://localhost:11434", timeout_s: int = 600) -> str:
-    docs = load_corpus(Path(output_dir))
-    top = retrieve(question, docs, k=5)
-    prompt = build_prompt(top, question)
-    return ollama_chat(model, prompt, host=host, timeout_s=timeout_s)
+def ask_stream(question: str, output_dir: str = "./streamlit_output", model: str = "me-mii-consultant", host: str = "http://localhost:11434", timeout_s: int = 600, use_cache: bool = True, report: Optional[Dict[str, Any]] = None, estimate: Estimator = estimate_tokens) -> Iterator[str]:
+    """ask(), yielding the answer piece by piece (e.g. for st.write_stream)."""
+    prompt = consult_prompt(question, output_dir, estimate=estimate, report=report)
+    yield from ollama_chat_stream(model, prompt, host=host, timeout_s=timeout_s, use_cache=use_cache)
 
 
 if __name__ == "__main__":
     import argparse
+    import sys
     parser = argparse.ArgumentParser()
     parser.add_argument("question", type=str, help="Consultant question")
     parser.add_argument("--out", type=str, default="./streamlit_output", help="Analysis output dir")
     parser.add_argument("--model", type=str, default="me-mii-consultant", help="Ollama model name")
     parser.add_argument("--host", type=str, default="http://localhost:11434", help="Ollama host URL")
     parser.add_argument("--timeout", type=int, default=600, help="HTTP timeout seconds (model cold start may take long)")
+    parser.add_argument("--no-stream", action="store_true", help="Print the answer only when it is complete")
+    parser.add_argument("--pool-size", type=int, default=None, help="Keep-alive connections to the Ollama host")
+    parser.add_argument("--retries", type=int, default=None, help="Retries on connection errors / 5xx")
+    parser.add_argument("--stats", action="store_true", help="Print LLM request timings and prompt tokens to stderr")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the response cache")
     args = parser.parse_args()
-    answer = ask(args.question, output_dir=args.out, model=args.model, host=args.host, timeout_s=args.timeout)
-    print(answer)
-
-
-
+    get_client(args.host, pool_size=args.pool_size, retries=args.retries)
+    prompt_report: Dict[str, Any] = {}
+    if args.no_stream:
+        answer = ask(args.question, output_dir=args.out, model=args.model, host=args.host, timeout_s=args.timeout, use_cache=not args.no_cache, report=prompt_report)
+        print(answer)
+    else:
+        for piece in ask_stream(args.question, output_dir=args.out, model=args.model, host=args.host, timeout_s=args.timeout, use_cache=not args.no_cache, report=prompt_report):
+            sys.stdout.write(piece)
+            sys.stdout.flush()
+        print()
+    if args.stats:
+        print(json.dumps(dict(get_client(args.host).stats(), cache=get_cache().stats(), prompt=prompt_report)), file=sys.stderr)
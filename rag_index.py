@@ -0,0 +1,449 @@
+"""
+Persistent RAG index for the consultant (rag_consultant.ask)
+- Analysis outputs are split into chunks with provenance: markdown by
+  heading, JSON by structure (per controller, view, XML analysis, graph
+  edge group, i18n group, ...); see chunk_markdown / chunk_json
+- TF-IDF vocabulary, IDF weights and the sparse chunk matrix of an
+  analysis output folder, fitted once and stored in <out>/.rag_index/
+  together with the chunk texts (read back by offset, only for hits)
+- Invalidated by the source files: size/mtime first, then content hash
+  (a touched but unchanged file keeps the index), and by this module's code
+- Questions are only transformed (vectorizer.transform), never refitted;
+  an index is kept per output folder for the lifetime of the process
+"""
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from me_mii_cache import module_fingerprint
+from me_mii_scanner import FileContent
+
+INDEX_DIRNAME = ".rag_index"
+INDEX_VERSION = 2
+MAX_FEATURES = 20000
+
+# Target chunk size; list items / i18n keys are packed up to it, a single
+# larger item stays one chunk
+CHUNK_CHARS = 2000
+# retrieve_budget considers this many top chunks, and stops once less than
+# MIN_CHUNK_TOKENS of the budget is left
+BUDGET_CANDIDATES = 50
+MIN_CHUNK_TOKENS = 32
+
+# Analysis outputs that make up the corpus, in document order
+SOURCES = (
+    "SUMMARY.md",
+    "ADVANCED_SUMMARY.md",
+    "graph.json",
+    "sapui5_details.json",
+    "sapui5_deep_analysis.json",
+)
+
+# Keys that name a JSON record in chunk labels, in order of preference
+_NAME_KEYS = ("file", "name", "src", "class", "operation", "control", "path", "id")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+_open_indexes: Dict[str, "RagIndex"] = {}
+_open_lock = threading.Lock()
+
+
+class Chunk(NamedTuple):
+    source: str   # output file name
+    label: str    # provenance inside the file (heading path, JSON path)
+    text: str
+
+    @property
+    def provenance(self) -> str:
+        return f"{self.source} › {self.label}" if self.label else self.source
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+# -----------------------------
+# Chunking
+# -----------------------------
+def chunk_markdown(source: str, text: str, size: int = CHUNK_CHARS) -> Iterator[Chunk]:
+    """One chunk per heading section (labelled with the heading path);
+    long sections are split at blank lines."""
+    path: List[str] = []
+    lines: List[str] = []
+
+    def flush():
+        body = "\n".join(lines).strip()
+        if not body:
+            return
+        label = " > ".join(path)
+        for part in _split_paragraphs(body, size):
+            yield Chunk(source, label, part)
+
+    for line in text.splitlines():
+        m = _HEADING.match(line)
+        if m:
+            yield from flush()
+            level = len(m.group(1))
+            path[level - 1:] = [m.group(2)]
+            del path[level:]
+            lines = [line]
+        else:
+            lines.append(line)
+    yield from flush()
+
+
+def _split_paragraphs(body: str, size: int) -> List[str]:
+    if len(body) <= 2 * size:
+        return [body]
+    parts, current = [], ""
+    for para in body.split("\n\n"):
+        if current and len(current) + len(para) > size:
+            parts.append(current)
+            current = ""
+        current = f"{current}\n\n{para}" if current else para
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _name(item: Any) -> str:
+    if isinstance(item, dict):
+        for key in _NAME_KEYS:
+            value = item.get(key)
+            if isinstance(value, str) and value:
+                return value.replace("\\", "/").rsplit("/", 1)[-1] if key == "file" else value
+    elif isinstance(item, str):
+        return item
+    return ""
+
+
+def _pack(source: str, label: str, items: List[Tuple[str, Any]], size: int) -> Iterator[Chunk]:
+    """Consecutive (name, value) items packed into chunks of about size chars."""
+    batch: List[Tuple[str, str]] = []
+    used = 0
+
+    def emit():
+        first, last = batch[0][0], batch[-1][0]
+        names = first if len(batch) == 1 else f"{first} … {last}"
+        header = f"{label} {names}".strip()
+        return Chunk(source, header, "\n".join([header] + [encoded for _, encoded in batch]).lstrip("\n"))
+
+    for name, value in items:
+        encoded = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        if batch and used + len(encoded) > size:
+            yield emit()
+            batch, used = [], 0
+        batch.append((name, encoded))
+        used += len(encoded) + 1
+    if batch:
+        yield emit()
+
+
+def _i18n_group(key: str) -> str:
+    """i18n keys are grouped by their category (``x.notification.label`` ->
+    ``notification.label``)."""
+    return key.split(".", 1)[1] if "." in key else key
+
+
+def chunk_json(source: str, data: Any, size: int = CHUNK_CHARS) -> Iterator[Chunk]:
+    """Structure-aware chunks of an analyzer JSON output.
+
+    Lists of records (controllers, views, xml_analysis, graph edges, ...)
+    give one chunk per record, small records packed together; mappings of
+    strings (i18n) are ordered by key category and packed the same way;
+    small sections stay whole.
+    """
+    if isinstance(data, list):
+        yield from _pack(source, "", [(_name(item), item) for item in data], size)
+        return
+    if not isinstance(data, dict):
+        yield Chunk(source, "", json.dumps(data, ensure_ascii=False))
+        return
+    small: Dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, list) and value:
+            label = key
+            yield from _pack(source, label, [(f"[{i}] {_name(item)}".strip(), item) for i, item in enumerate(value)], size)
+        elif isinstance(value, dict) and len(json.dumps(value, ensure_ascii=False)) > size:
+            if all(isinstance(v, str) for v in value.values()):
+                # Keys of a group are kept together; small groups share a chunk
+                items = sorted(value.items(), key=lambda kv: _i18n_group(kv[0]))
+                yield from _pack(source, key, [(k if "." not in k else f"{_i18n_group(k)}: {k}", {k: v})
+                                               for k, v in items], size)
+            else:
+                yield from chunk_json(source, value, size)
+        elif value not in ({}, [], None, ""):
+            small[key] = value
+    if small:
+        yield Chunk(source, ", ".join(small), json.dumps(small, ensure_ascii=False, separators=(",", ":")))
+
+
+def chunk_file(fp: Path, text: str, size: int = CHUNK_CHARS) -> Iterator[Chunk]:
+    """Chunks of one analysis output (markdown, JSON, otherwise plain text)."""
+    if fp.suffix == ".json":
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if data is not None:
+            yield from chunk_json(fp.name, data, size)
+            return
+    if fp.suffix in (".md", ".markdown"):
+        yield from chunk_markdown(fp.name, text, size)
+        return
+    for i, part in enumerate(_split_paragraphs(text, size)):
+        yield Chunk(fp.name, f"part {i + 1}", part)
+
+
+# -----------------------------
+# Index
+# -----------------------------
+def _fingerprint() -> str:
+    return module_fingerprint({__name__}, INDEX_VERSION, MAX_FEATURES, CHUNK_CHARS, sklearn.__version__)
+
+
+def _stat(fp: Path) -> Dict[str, Any]:
+    st = fp.stat()
+    return {"size": st.st_size, "mtime": st.st_mtime_ns}
+
+
+def _atomic(path: Path, write):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+class RagIndex:
+    """TF-IDF index over the chunks of the analysis outputs of one folder."""
+
+    def __init__(self, output_dir: Path, sources: Dict[str, Dict[str, Any]],
+                 chunks: List[Tuple[str, str, int, int]],
+                 vectorizer: Optional[TfidfVectorizer], matrix: Optional[sp.csr_matrix],
+                 texts: Optional[List[str]] = None):
+        self.output_dir = Path(output_dir)
+        self.sources = sources          # file name -> {size, mtime, hash}
+        self.doc_ids = list(sources)
+        self.chunks = chunks            # (source, label, offset, length) into chunks.txt
+        self.vectorizer = vectorizer
+        self.matrix = matrix            # one L2-normalised row per chunk
+        self._texts = texts             # chunk texts until saved
+        self._dirty = False
+
+    @property
+    def directory(self) -> Path:
+        return self.output_dir / INDEX_DIRNAME
+
+    # -----------------------------
+    # Build / persist
+    # -----------------------------
+    @classmethod
+    def build(cls, output_dir: Path) -> "RagIndex":
+        """Chunk the current source files and fit the vectorizer."""
+        output_dir = Path(output_dir)
+        sources: Dict[str, Dict[str, Any]] = {}
+        chunks: List[Tuple[str, str, int, int]] = []
+        texts: List[str] = []
+        offset = 0
+        for name in SOURCES:
+            fp = output_dir / name
+            if not fp.is_file():
+                continue
+            try:
+                content = FileContent(fp)
+                text = content.data.decode("utf-8", errors="ignore")
+                sources[name] = dict(_stat(fp), hash=content.digest())
+            except OSError:
+                continue
+            for chunk in chunk_file(fp, text):
+                length = len(chunk.text.encode("utf-8", "surrogatepass"))
+                chunks.append((chunk.source, chunk.label, offset, length))
+                texts.append(chunk.text)
+                offset += length
+        vectorizer = matrix = None
+        if texts:
+            try:
+                vectorizer = TfidfVectorizer(max_features=MAX_FEATURES)
+                matrix = vectorizer.fit_transform(texts).tocsr()
+            except ValueError:  # empty vocabulary
+                vectorizer = matrix = None
+        index = cls(output_dir, sources, chunks, vectorizer, matrix, texts)
+        index._dirty = True
+        return index
+
+    def save(self):
+        """Write chunks, vocabulary, IDF weights and matrix; the manifest goes last."""
+        d = self.directory
+        try:
+            d.mkdir(parents=True, exist_ok=True)
+            if self._texts is not None:
+                texts = self._texts
+                _atomic(d / "chunks.txt", lambda f: f.writelines(t.encode("utf-8", "surrogatepass") for t in texts))
+                _atomic(d / "chunks.json", lambda f: f.write(json.dumps(self.chunks, ensure_ascii=False).encode("utf-8")))
+            if self.vectorizer is not None:
+                vocab = sorted(self.vectorizer.vocabulary_, key=self.vectorizer.vocabulary_.get)
+                _atomic(d / "vocabulary.json", lambda f: f.write(json.dumps(vocab, ensure_ascii=False).encode("utf-8")))
+                _atomic(d / "idf.npy", lambda f: np.save(f, self.vectorizer.idf_))
+                _atomic(d / "matrix.npz", lambda f: sp.save_npz(f, self.matrix, compressed=False))
+            manifest = {
+                "version": INDEX_VERSION,
+                "fingerprint": _fingerprint(),
+                "sources": self.sources,
+                "chunks": len(self.chunks),
+                "empty": self.vectorizer is None,
+            }
+            _atomic(d / "manifest.json", lambda f: f.write(json.dumps(manifest, indent=1).encode("utf-8")))
+            self._texts = None
+            self._dirty = False
+        except OSError:
+            # Read-only output folder: the index is rebuilt in the next process
+            pass
+
+    @classmethod
+    def load(cls, output_dir: Path) -> Optional["RagIndex"]:
+        """Stored index of output_dir, or None if missing or built by other code."""
+        d = Path(output_dir) / INDEX_DIRNAME
+        try:
+            with open(d / "manifest.json", "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("fingerprint") != _fingerprint():
+                return None
+            sources = manifest["sources"]
+            if manifest.get("empty"):
+                return cls(output_dir, sources, [], None, None)
+            with open(d / "chunks.json", "r", encoding="utf-8") as f:
+                chunks = [tuple(c) for c in json.load(f)]
+            with open(d / "vocabulary.json", "r", encoding="utf-8") as f:
+                vocab = json.load(f)
+            vectorizer = TfidfVectorizer(max_features=MAX_FEATURES, vocabulary={t: i for i, t in enumerate(vocab)})
+            vectorizer.idf_ = np.load(d / "idf.npy")
+            matrix = sp.load_npz(d / "matrix.npz").tocsr()
+            if matrix.shape != (len(chunks), len(vocab)) or len(chunks) != manifest.get("chunks"):
+                return None
+            return cls(output_dir, sources, chunks, vectorizer, matrix)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def open(cls, output_dir: Path) -> "RagIndex":
+        """Current index of output_dir: in-process, stored, or freshly built (and saved)."""
+        key = str(Path(output_dir).resolve())
+        # Concurrent askers (doc_agent) share one build instead of racing
+        with _open_lock:
+            index = _open_indexes.get(key)
+            if index is None or not index.is_current():
+                index = cls.load(output_dir)
+                if index is None or not index.is_current():
+                    index = cls.build(output_dir)
+                # Nothing to index (e.g. a mistyped output_dir): keep it in
+                # memory only, no .rag_index folder is created
+                if index._dirty and index.sources:
+                    index.save()
+                _open_indexes[key] = index
+        return index
+
+    def is_current(self) -> bool:
+        """True if the source files still match the indexed ones.
+
+        Files whose size/mtime changed are hashed; if only the mtime moved the
+        index stays valid (and the manifest is refreshed on save).
+        """
+        present = [name for name in SOURCES if (self.output_dir / name).is_file()]
+        if present != self.doc_ids:
+            return False
+        for name in present:
+            fp = self.output_dir / name
+            rec = self.sources[name]
+            try:
+                st = _stat(fp)
+                if st["size"] == rec.get("size") and st["mtime"] == rec.get("mtime"):
+                    continue
+                if st["size"] != rec.get("size") or FileContent(fp).digest() != rec.get("hash"):
+                    return False
+            except OSError:
+                return False
+            self.sources[name] = dict(rec, **st)
+            self._dirty = True
+        return True
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def search(self, query: str, k: Optional[int] = 5) -> List[Tuple[int, float]]:
+        """Top-k (chunk id, cosine score) with a positive score; all of them if k is None."""
+        if self.vectorizer is None or not self.chunks:
+            return []
+        q = self.vectorizer.transform([query])
+        scores = (self.matrix @ q.T).toarray().ravel()  # rows and q are L2-normalised
+        hits = np.flatnonzero(scores > 0)
+        if k is not None and len(hits) > k:
+            # Partial selection first; ties at the cut keep document order
+            cut = -np.partition(-scores[hits], k - 1)[k - 1]
+            hits = hits[scores[hits] >= cut]
+        order = hits[np.argsort(-scores[hits], kind="stable")]
+        if k is not None:
+            order = order[:k]
+        return [(int(i), float(scores[i])) for i in order]
+
+    def chunks_of(self, ids: List[int]) -> Iterator[Chunk]:
+        """Chunks with their texts (read from chunks.txt by offset), in ids order."""
+        if self._texts is not None:
+            for i in ids:
+                source, label, _, _ = self.chunks[i]
+                yield Chunk(source, label, self._texts[i])
+            return
+        try:
+            f = open(self.directory / "chunks.txt", "rb")
+        except OSError:
+            f = None
+        try:
+            for i in ids:
+                source, label, offset, length = self.chunks[i]
+                text = ""
+                if f is not None:
+                    f.seek(offset)
+                    text = f.read(length).decode("utf-8", "surrogatepass")
+                yield Chunk(source, label, text)
+        finally:
+            if f is not None:
+                f.close()
+
+    def retrieve(self, query: str, k: int = 5, limit: Optional[int] = None) -> List[Tuple[str, str, float]]:
+        """Top-k (provenance, text, score) chunks, as rag_consultant.retrieve."""
+        hits = self.search(query, k)
+        return [(chunk.provenance, chunk.text[:limit] if limit is not None else chunk.text, score)
+                for chunk, (_, score) in zip(self.chunks_of([i for i, _ in hits]), hits)]
+
+    def retrieve_budget(self, query: str, budget: int,
+                        estimate: Callable[[str], int] = estimate_tokens) -> List[Tuple[str, str, float]]:
+        """Best-scoring chunks that fit in ``budget`` tokens together.
+
+        Chunks are taken in score order; one that does not fit is skipped so
+        smaller, lower-ranked chunks can still use the remaining budget (the
+        best chunk is truncated instead if it alone exceeds the budget).
+        """
+        out = []
+        used = 0
+        hits = self.search(query, BUDGET_CANDIDATES)
+        for chunk, (_, score) in zip(self.chunks_of([i for i, _ in hits]), hits):
+            text = chunk.text
+            cost = estimate(text)
+            if used + cost > budget:
+                if out:
+                    continue
+                # The best chunk alone is over budget: keep its head
+                text = text[:len(text) * budget // cost]
+                cost = estimate(text)
+            out.append((chunk.provenance, text, score))
+            used += cost
+            if budget - used < MIN_CHUNK_TOKENS:
+                break
+        return out
@@ -11,6 +11,8 @@ import re
 from typing import Dict, List, Any, Set, Tuple
 import xml.etree.ElementTree as ET
 
+from me_mii_scanner import LineIndex
+
 class SAPUI5Visualizer:
     """Advanced visualization for SAPUI5 projects"""
     
@@ -42,6 +44,7 @@ class SAPUI5Visualizer:
         for js_file in self.root.rglob("*.js"):
             if 'controller' in str(js_file).lower():
                 content = js_file.read_text(encoding='utf-8', errors='ignore')
+                lines = LineIndex(content)
                 
                 # REST API endpoints
                 rest_patterns = [
@@ -65,7 +68,7 @@ class SAPUI5Visualizer:
                                 'path': endpoint,
                                 'method': method,
                                 'file': str(js_file.name),
-                                'line': content[:match.start()].count('\n') + 1
+                                'line': lines.line(match.start())
                             })
                 
                 # WebSocket/MQTT
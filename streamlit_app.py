@@ -12,6 +12,8 @@ import sys
 import os
 import pandas as pd
 
+from me_mii_graph_store import load_graph
+
 # Sayfa yapılandırması
 st.set_page_config(
     page_title="SAPDOCAI",
@@ -535,25 +537,14 @@ if st.session_state.analysis_completed and st.session_state.output_path:
         endpoints_count = 0
         views_count = 0
         
-        # JSON verilerinden metrikleri hesapla
-        json_path = output_path / "graph.json"
-        if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                graph_data = json.load(f)
-            
+        # Graf verilerinden metrikleri hesapla (graph.npz bellek eşlemeli, yoksa graph.json)
+        graph = load_graph(output_path)
+        if graph is not None:
             # İlişki sayısı
-            relations_count = len(graph_data) if isinstance(graph_data, list) else 0
+            relations_count = len(graph)
             
             # Düğüm türlerini say
-            unique_nodes = set()
-            for edge in graph_data:
-                if isinstance(edge, dict):
-                    src = edge.get('src', '')
-                    dst = edge.get('dst', '')
-                    if src:
-                        unique_nodes.add(src)
-                    if dst:
-                        unique_nodes.add(dst)
+            unique_nodes = graph.used_keys()
             
             # Düğüm türlerine göre say
             for node in unique_nodes:
@@ -630,12 +621,10 @@ if st.session_state.analysis_completed and st.session_state.output_path:
                 from network_visualizer import create_network_visualization, display_interactive_network, create_summary_statistics
                 
                 json_path = output_path / "graph.json"
-                if json_path.exists():
+                graph = load_graph(output_path) if json_path.exists() else None
+                if graph is not None:
                     # İstatistikleri göster
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        graph_data = json.load(f)
-                    
-                    stats = create_summary_statistics(graph_data)
+                    stats = create_summary_statistics(graph)
                     
                     # İstatistik kartları
                     col1, col2, col3, col4 = st.columns(4)
@@ -963,6 +952,8 @@ if st.session_state.analysis_completed and st.session_state.output_path:
                     height=100,
                     key="dev_summary_text"
                 )
+                # Aynı özet için önbellekteki yanıt kullanılır; işaretlenirse yeniden üretilir
+                regenerate = st.checkbox("♻️ Önbelleği atla (yeniden üret)", value=False, key="doc_agent_no_cache")
                 
                 if st.button("🎓 Eğitim Materyali Üret", use_container_width=True, key="generate_training_btn"):
                     if dev_summary:
@@ -970,7 +961,7 @@ if st.session_state.analysis_completed and st.session_state.output_path:
                             from doc_agent import DocumentationAgent
                             
                             with st.spinner("AI eğitim materyali üretiyor..."):
-                                agent = DocumentationAgent(output_path)
+                                agent = DocumentationAgent(output_path, use_cache=not regenerate)
                                 documentation = agent.generate_complete_documentation(dev_summary)
                                 
                                 st.success("✅ Eğitim materyali üretildi!")
@@ -1090,7 +1081,8 @@ if st.session_state.analysis_completed and st.session_state.output_path:
                     zip_buffer = io.BytesIO()
                     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
                         for file_path in output_path.rglob('*'):
-                            if file_path.is_file():
+                            # .analysis_manifest.json gibi dahili cache dosyalarını atla
+                            if file_path.is_file() and not file_path.name.startswith('.'):
                                 zip_file.write(file_path, file_path.relative_to(output_path))
                     
                     zip_buffer.seek(0)
@@ -1203,25 +1195,14 @@ elif analyze_button:
                 endpoints_count = 0
                 views_count = 0
                 
-                # JSON verilerinden metrikleri hesapla
-                json_path = output_path / "graph.json"
-                if json_path.exists():
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        graph_data = json.load(f)
-                    
+                # Graf verilerinden metrikleri hesapla (graph.npz bellek eşlemeli, yoksa graph.json)
+                graph = load_graph(output_path)
+                if graph is not None:
                     # İlişki sayısı
-                    relations_count = len(graph_data) if isinstance(graph_data, list) else 0
+                    relations_count = len(graph)
                     
                     # Düğüm türlerini say
-                    unique_nodes = set()
-                    for edge in graph_data:
-                        if isinstance(edge, dict):
-                            src = edge.get('src', '')
-                            dst = edge.get('dst', '')
-                            if src:
-                                unique_nodes.add(src)
-                            if dst:
-                                unique_nodes.add(dst)
+                    unique_nodes = graph.used_keys()
                     
                     # Düğüm türlerine göre say
                     for node in unique_nodes:
@@ -1298,12 +1279,10 @@ elif analyze_button:
                         from network_visualizer import create_network_visualization, display_interactive_network, create_summary_statistics
                         
                         json_path = output_path / "graph.json"
-                        if json_path.exists():
+                        graph = load_graph(output_path) if json_path.exists() else None
+                        if graph is not None:
                             # İstatistikleri göster
-                            with open(json_path, 'r', encoding='utf-8') as f:
-                                graph_data = json.load(f)
-                            
-                            stats = create_summary_statistics(graph_data)
+                            stats = create_summary_statistics(graph)
                             
                             # İstatistik kartları
                             col1, col2, col3, col4 = st.columns(4)
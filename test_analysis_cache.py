@@ -0,0 +1,74 @@
+"""
+Incremental analysis test (me_mii_cache.AnalysisCache, ScanEngine.run(cache=...))
+- After an edit, a delete and a touch the incremental result equals a full run
+- A new code fingerprint or --java-parser setting discards the manifest
+"""
+
+import os
+
+import me_mii_cache
+from me_mii_analyzer_advanced import DetectionCollector, SAPUI5DeepCollector
+from me_mii_cache import AnalysisCache
+from me_mii_folder_analyzer import FolderCollector
+from me_mii_folder_analyzer_extended import ExtendedCollector
+
+COLLECTORS = [FolderCollector, ExtendedCollector, SAPUI5DeepCollector, DetectionCollector]
+
+
+def _load(out, root, parser="ast"):
+    return AnalysisCache.load(out, root, COLLECTORS, settings={"java_parser": parser})
+
+
+def _change_tree(root):
+    java = root / "backend" / "TestService.java"
+    java.write_text(java.read_text(encoding="utf-8").replace(
+        "public class TestService {",
+        "public class TestService {\n    @GET\n    @Path(\"/extra\")\n    public String extra() { return \"x\"; }\n"),
+        encoding="utf-8")
+    (root / "webapp" / "controller" / "typeLabel.controller.js").unlink()
+    touched = root / "webapp" / "controller" / "App.controller.js"
+    st = touched.stat()
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+def test_incremental_run_equals_full_run(source_tree, scan_outputs, tmp_path):
+    out = tmp_path / "out"
+    cache = _load(out, source_tree)
+    first = scan_outputs(source_tree, cache=cache)
+    cache.save()
+    assert cache.hits == 0 and cache.misses > 0
+    assert first == scan_outputs(source_tree)
+
+    _change_tree(source_tree)
+    cache = _load(out, source_tree)
+    incremental = scan_outputs(source_tree, cache=cache)
+    cache.save()
+    assert cache.misses == 1  # only the edited Java file is parsed again
+    assert cache.hits > 0
+    assert incremental == scan_outputs(source_tree)
+    assert incremental != first
+
+    # the deleted file left the manifest; the touched one kept its fragments
+    cache = _load(out, source_tree)
+    scan_outputs(source_tree, cache=cache)
+    assert cache.misses == 0
+
+
+def test_fingerprint_and_java_parser_invalidate_the_manifest(source_tree, scan_outputs, tmp_path, monkeypatch):
+    out = tmp_path / "out"
+    cache = _load(out, source_tree)
+    scan_outputs(source_tree, cache=cache)
+    cache.save()
+
+    cache = _load(out, source_tree, parser="fast")
+    scan_outputs(source_tree, cache=cache)
+    assert cache.hits == 0
+
+    cache = _load(out, source_tree)
+    scan_outputs(source_tree, cache=cache)
+    assert cache.hits > 0 and cache.misses == 0
+
+    monkeypatch.setattr(me_mii_cache, "CACHE_VERSION", me_mii_cache.CACHE_VERSION + 1)
+    cache = _load(out, source_tree)
+    scan_outputs(source_tree, cache=cache)
+    assert cache.hits == 0
@@ -0,0 +1,49 @@
+"""
+Java parse cache test (me_mii_cache.ContentCache)
+- Records round-trip by content digest; another salt misses
+- prune() drops unused entries by age, then least recently used by size
+"""
+
+import os
+import time
+
+from me_mii_cache import ContentCache
+
+
+def _age(cache, digest, seconds):
+    path = cache._path(digest)
+    t = time.time() - seconds
+    os.utime(path, (t, t))
+
+
+def test_get_put_by_digest_and_salt(tmp_path):
+    cache = ContentCache(tmp_path, "parser-v1")
+    assert cache.get("abc") is None
+    cache.put("abc", {"classes": ["TestService"]})
+    assert cache.get("abc") == {"classes": ["TestService"]}
+    assert ContentCache(tmp_path, "parser-v2").get("abc") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_prune_drops_entries_unused_for_max_age(tmp_path):
+    old = ContentCache(tmp_path, "parser-v1")
+    old.put("abc", {"n": 1})
+    _age(old, "abc", 3600)
+    cache = ContentCache(tmp_path, "parser-v2", max_age_s=60)
+    cache.put("abc", {"n": 2})
+    assert cache.prune() == 1  # the orphaned v1 entry
+    assert old.get("abc") is None
+    assert cache.get("abc") == {"n": 2}
+
+
+def test_prune_keeps_recently_used_entries_under_max_bytes(tmp_path):
+    cache = ContentCache(tmp_path, "s")
+    for i, digest in enumerate(("d1", "d2", "d3")):
+        cache.put(digest, {"text": "x" * 100})
+        _age(cache, digest, 300 - i * 100)   # d1 oldest, d3 newest
+    assert cache.get("d1") is not None           # a hit makes d1 the most recently used
+    size = cache._path("d1").stat().st_size
+    cache.max_bytes = 2 * size
+    assert cache.prune() == 1
+    assert cache.get("d2") is None
+    assert cache.get("d1") is not None and cache.get("d3") is not None
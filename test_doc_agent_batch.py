@@ -0,0 +1,62 @@
+"""
+Batch input test (doc_agent.read_summaries)
+- JSONL and CSV (with or without BOM) summaries, bare JSON strings
+- Bad lines and non-text summaries are reported and skipped
+- Item ids are unique and safe as folder names
+"""
+
+import json
+
+from doc_agent import read_summaries
+
+
+def _jsonl(path, *lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_csv_with_bom(tmp_path):
+    path = tmp_path / "summaries.csv"
+    path.write_bytes("id,summary\nCR-1,SfcService düzeltildi\n".encode("utf-8-sig"))
+    assert read_summaries(path) == [("CR-1", "SfcService düzeltildi")]
+
+
+def test_jsonl_objects_and_bare_strings(tmp_path):
+    path = _jsonl(tmp_path / "summaries.jsonl",
+                  json.dumps({"id": "CR-1", "summary": "  first  "}),
+                  "",
+                  json.dumps({"dev_summary": "second"}),
+                  json.dumps("third"))
+    assert read_summaries(path) == [("CR-1", "first"), ("item_002", "second"), ("item_003", "third")]
+
+
+def test_bad_lines_are_reported_by_line_number(tmp_path, capsys):
+    path = _jsonl(tmp_path / "summaries.jsonl",
+                  json.dumps({"summary": "ok"}),
+                  '{"summary": "missing quote}',
+                  json.dumps({"summary": "also ok"}))
+    assert [s for _, s in read_summaries(path)] == ["ok", "also ok"]
+    assert f"{path}:2: invalid JSON" in capsys.readouterr().out
+
+
+def test_non_text_summaries(tmp_path, capsys):
+    path = _jsonl(tmp_path / "summaries.jsonl",
+                  json.dumps({"summary": 5}),
+                  json.dumps({"summary": {"text": "nested"}}),
+                  json.dumps({"summary": ["a", "b"]}),
+                  json.dumps({"summary": None}),
+                  json.dumps(True))
+    assert read_summaries(path) == [("item_001", "5")]
+    out = capsys.readouterr().out
+    assert "item 2 skipped" in out and "item 3 skipped" in out and "item 5 skipped" in out
+
+
+def test_duplicate_and_unsafe_ids(tmp_path):
+    path = _jsonl(tmp_path / "summaries.jsonl",
+                  json.dumps({"id": "../../etc/passwd", "summary": "a"}),
+                  json.dumps({"id": "CR 7/feature", "summary": "b"}),
+                  json.dumps({"id": "CR_7_feature", "summary": "c"}),
+                  json.dumps({"id": "...", "summary": "d"}))
+    ids = [item_id for item_id, _ in read_summaries(path)]
+    assert ids == ["etc_passwd", "CR_7_feature", "CR_7_feature_", "item_004"]
+    assert all("/" not in i and not i.startswith(".") for i in ids)
@@ -0,0 +1,53 @@
+"""
+Development context test (doc_agent.DocumentationAgent._scan_summary)
+- Controllers known to the analysis come first, by their file name
+- Then by number of mentions, then by first mention; lists are capped
+"""
+
+import json
+
+import pytest
+
+import doc_agent
+from doc_agent import DocumentationAgent
+
+
+@pytest.fixture
+def agent(tmp_path):
+    analysis = {"controllers": [
+        {"file": "webapp\\controller\\Home.controller.js", "functions": ["onInit", "onPressAssemble"]},
+        {"file": "webapp/controller/Sfc.controller.js", "functions": ["startSfc"]},
+    ]}
+    (tmp_path / "sapui5_deep_analysis.json").write_text(json.dumps(analysis), encoding="utf-8")
+    return DocumentationAgent(tmp_path, use_cache=False)
+
+
+def test_known_controllers_first_then_by_mentions(agent):
+    summary = ("OrderController fixed. OrderController again, OrderController.js too. "
+               "HomeController updated.")
+    controllers, _, _ = agent._scan_summary(summary)
+    assert controllers == ["Home.controller.js", "OrderController", "OrderController.js"]
+
+
+def test_known_function_counts_for_its_controller(agent):
+    controllers, _, functions = agent._scan_summary(
+        "startSfc() now validates; LabelController calls print(label) and print(label).")
+    assert controllers == ["Sfc.controller.js", "LabelController"]
+    assert functions == ["startSfc", "print"]
+
+
+def test_services_by_mentions_then_first_mention(agent):
+    _, services, _ = agent._scan_summary(
+        "DateHelper, SfcService, ShopOrderManager, SfcService; for the Service layer")
+    assert services == ["SfcService", "DateHelper", "ShopOrderManager"]
+
+
+def test_keywords_and_plain_words_are_not_functions(agent):
+    _, _, functions = agent._scan_summary("if (x) return; while (y) onPressAssemble handler, getTime()")
+    assert functions == ["onPressAssemble", "getTime"]
+
+
+def test_lists_are_capped(agent):
+    summary = " ".join(f"Svc{i}Service" for i in range(doc_agent.CONTEXT_ITEMS + 5))
+    _, services, _ = agent._scan_summary(summary)
+    assert services == [f"Svc{i}Service" for i in range(doc_agent.CONTEXT_ITEMS)]
@@ -0,0 +1,40 @@
+"""
+Graph query test (me_mii_graph_query.GraphIndex)
+- Class nodes resolve by their simple name
+- Method mentions in free text match with or without "()"
+- Impact of a class reaches its importers and extenders
+"""
+
+from me_mii_graph_query import GraphIndex
+from me_mii_graph_store import GraphStore
+
+EDGES = [
+    {"src": "com.app.OrderController", "dst": "com.app.TestService", "type": "IMPORTS"},
+    {"src": "com.app.SpecialService", "dst": "com.app.TestService", "type": "EXTENDS"},
+    {"src": "com.app.TestService.run()", "dst": "REST:GET:/api/run", "type": "SERVICE_EXPOSES_ENDPOINT"},
+    {"src": "cfg/app.properties", "dst": "DSN:MES", "type": "CFG_DSN"},
+]
+
+
+def test_class_simple_name_resolves_to_class_node():
+    index = GraphIndex(GraphStore.from_edges(EDGES))
+    assert "com.app.TestService" in index.resolve("TestService")
+    assert "com.app.TestService" in index.find("refactor TestService error handling")
+
+
+def test_method_mentions_with_parentheses_are_found():
+    index = GraphIndex(GraphStore.from_edges(EDGES))
+    method = "com.app.TestService.run()"
+    assert index.find("call run() now") == [method]
+    assert index.find("TestService.run() returns early") == [method]
+    assert index.find(f"changed {method}.") == [method]
+    # a call with arguments is still split into its names
+    assert index.find("run(order)") == [method]
+
+
+def test_class_impact_reaches_importers_and_extenders():
+    report = GraphIndex(GraphStore.from_edges(EDGES)).impact("TestService")
+    assert "com.app.TestService" in report["changed"]
+    assert {"com.app.OrderController", "com.app.SpecialService"} <= set(report["classes"])
+    assert report["endpoints"] == ["REST:GET:/api/run"]
+    assert report["config"] == [] and report["other"] == []
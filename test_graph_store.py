@@ -0,0 +1,65 @@
+"""
+Graph store test (me_mii_graph_store)
+- RelGraph -> save_graph -> load_graph -> to_edges() equals graph.json,
+  with memory-mapped arrays and with the np.load fallback
+- Older graph.json records (source/target/relation, lists) still load
+"""
+
+import json
+
+import pytest
+
+import me_mii_graph_store
+from me_mii_folder_analyzer import RelGraph
+from me_mii_graph_store import GraphStore, load_graph, save_graph
+
+
+def _graph():
+    graph = RelGraph()
+    graph.add_endpoint("com.app.TestService.getOrders()", "GET", "/api/v1/orders", file="TestService.java")
+    graph.add_sql_usage("com.app.TestService.getOrders()", "heuristic", file="TestService.java")
+    graph.add_http_call("config/application.properties", "http://mes:50000/api")
+    graph.add_bls_rel("OrderTransaction", "SfcStart", {"file": "OrderTransaction.xml", "step": 2})
+    graph.add_edge("config/application.properties", "DSN:MES_DB", "CFG_DSN", node_file="config/application.properties")
+    return graph
+
+
+def _write_outputs(out):
+    graph = _graph()
+    (out / "graph.json").write_text(json.dumps(graph.to_edges(), ensure_ascii=False), encoding="utf-8")
+    save_graph(graph, out)
+    return json.loads((out / "graph.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("mmap", [True, False], ids=["mmap", "np.load"])
+def test_round_trip_through_graph_npz(tmp_path, monkeypatch, mmap):
+    edges = _write_outputs(tmp_path)
+    if not mmap:
+        def no_mmap(path):
+            raise ValueError("not mappable")
+        monkeypatch.setattr(me_mii_graph_store, "_mmap_npz", no_mmap)
+    store = load_graph(tmp_path)
+    assert isinstance(store, GraphStore)
+    assert store.to_edges() == edges
+    assert len(store) == len(edges) == 5
+
+
+def test_graph_json_alone_gives_the_same_edges(tmp_path):
+    edges = _write_outputs(tmp_path)
+    (tmp_path / "graph.npz").unlink()
+    assert load_graph(tmp_path / "graph.json").to_edges() == edges
+
+
+def test_older_graph_json_records(tmp_path):
+    (tmp_path / "graph.json").write_text(json.dumps({"edges": [
+        {"source": "SfcService", "target": "REST:GET:/sfc", "relation": "SERVICE_EXPOSES_ENDPOINT"},
+        ["OrderTransaction", "SfcStart", "BLS_CALLS_TARGET"],
+        ["a", "b"],
+        {"source": "", "target": "ignored"},
+    ]}), encoding="utf-8")
+    edges = load_graph(tmp_path).to_edges()
+    assert [(e["src"], e["dst"], e["type"]) for e in edges] == [
+        ("SfcService", "REST:GET:/sfc", "SERVICE_EXPOSES_ENDPOINT"),
+        ("OrderTransaction", "SfcStart", "BLS_CALLS_TARGET"),
+        ("a", "b", ""),
+    ]
@@ -0,0 +1,97 @@
+"""
+Java extraction test (me_mii_java)
+- extract_fast returns the same JavaDecl as the javalang AST reference:
+  methods, parameters, annotations, offsets and body spans
+- Constructors, nested and anonymous class methods are not the class's own
+"""
+
+from pathlib import Path
+
+import pytest
+
+from me_mii_java import extract_ast, extract_fast
+
+EXAMPLE = Path(__file__).resolve().parent / "example_test"
+
+ORDER_RESOURCE = '''package com.sap.me.demo;
+
+import javax.ws.rs.*;
+import java.util.*;
+
+@Path("/orders")
+public class OrderResource extends BaseResource implements Comparable<OrderResource> {
+    private static final Map<String, List<Integer>> CACHE = new HashMap<>();
+    private final String plant = "1000";
+
+    static {
+        CACHE.put("init", new ArrayList<>());
+    }
+
+    public OrderResource() {
+        this("1000");
+    }
+
+    <T> OrderResource(T plant) {
+        super();
+    }
+
+    @GET
+    @Path(value = "/{id}")
+    @Produces({"application/json"})
+    public Response get(@PathParam("id") String id, int[] qty, List<Map<String, Integer>> rows) throws Exception {
+        Runnable r = new Runnable() {
+            @Override
+            public void run() { System.out.println("}"); }
+        };
+        if (id == null) { return null; }
+        return Response.ok("{" + id + "}").build();
+    }
+
+    @Deprecated
+    protected abstract <T extends Comparable<T>> T pick(Collection<? extends T> items);
+
+    public native long nativeClock();
+
+    public static class Line {
+        public int number() { return 1; }
+    }
+
+    interface Listener {
+        void changed(String sfc);
+    }
+
+    public int compareTo(OrderResource other) {
+        return plant.compareTo(other.plant);
+    }
+}
+
+class Second {
+    void notTheFirstClass() {}
+}
+'''
+
+
+def _sources():
+    yield "TestService.java", (EXAMPLE / "TestService.java").read_text(encoding="utf-8")
+    yield "OrderResource.java", ORDER_RESOURCE
+
+
+@pytest.mark.parametrize("name,text", list(_sources()))
+def test_fast_mode_matches_ast(name, text):
+    assert extract_fast(text) == extract_ast(text)
+
+
+def test_declarations_of_the_example_class():
+    decl = extract_fast(ORDER_RESOURCE)
+    assert (decl.name, decl.package) == ("OrderResource", "com.sap.me.demo")
+    # constructors, the initializer, nested and anonymous class methods are skipped
+    assert [m.name for m in decl.methods] == ["get", "pick", "nativeClock", "compareTo"]
+    get, pick, native, _ = decl.methods
+    assert get.params == ["String", "int", "List"]
+    assert get.annotations == [("GET", None), ("Path", "/{id}"), ("Produces", None)]
+    assert pick.annotations == [("Deprecated", None)]
+    assert pick.body is None and native.body is None
+    start, end = get.body
+    body = ORDER_RESOURCE[start:end]
+    assert body.startswith("{\n        Runnable r") and body.endswith(".build();\n    }")
+    assert ORDER_RESOURCE[get.offset:].startswith("Response get(")  # after the modifiers
@@ -0,0 +1,84 @@
+"""
+LLM response cache test (llm_cache)
+- cache_key: stable, and different for another model, prompt or options
+- Eviction by age and, above max_bytes, least recently used first
+"""
+
+import pytest
+
+import llm_cache
+from llm_cache import LLMCache, cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+
+def test_cache_key_is_stable():
+    key = cache_key("me-mii-consultant", "Soru?", {"temperature": 0.2, "num_ctx": 8192})
+    assert key == cache_key("me-mii-consultant", "Soru?", {"num_ctx": 8192, "temperature": 0.2})
+    assert cache_key("m", "p") == cache_key("m", "p", None) == cache_key("m", "p", {})
+    assert len(key) == 32
+
+
+def test_cache_key_depends_on_model_prompt_and_options():
+    base = cache_key("m", "p", {"temperature": 0.2})
+    assert cache_key("other", "p", {"temperature": 0.2}) != base
+    assert cache_key("m", "p ", {"temperature": 0.2}) != base
+    assert cache_key("m", "p", {"temperature": 0.3}) != base
+    # field boundaries are kept: ("ab", "c") is not ("a", "bc")
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_get_put_and_stats(tmp_path, clock):
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    key = cache_key("m", "p")
+    assert cache.get(key) is None
+    cache.put(key, "m", "yanıt")
+    assert cache.get(key) == "yanıt"
+    assert cache.stats() == {"entries": 1, "bytes": len("yanıt".encode("utf-8")), "hits": 1, "misses": 1}
+    cache.close()
+
+
+def test_expired_answers_miss_and_are_evicted(tmp_path, clock):
+    cache = LLMCache(tmp_path / "llm.sqlite", max_age_s=60)
+    cache.put("old", "m", "a")
+    clock.now += 61
+    assert cache.get("old") is None
+    cache.put("new", "m", "b")  # a put evicts what has expired
+    assert cache.stats()["entries"] == 1
+    assert cache.get("new") == "b"
+    cache.close()
+
+
+def test_least_recently_used_answers_go_first_above_max_bytes(tmp_path, clock):
+    cache = LLMCache(tmp_path / "llm.sqlite", max_bytes=25)
+    for key in ("k1", "k2"):
+        cache.put(key, "m", "x" * 10)
+        clock.now += 1
+    assert cache.get("k1") is not None  # k1 is now used more recently than k2
+    clock.now += 1
+    cache.put("k3", "m", "x" * 10)      # 30 bytes > 25: k2 goes
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None and cache.get("k3") is not None
+    assert cache.stats()["bytes"] == 20
+    cache.close()
+
+
+def test_get_cache_is_shared_per_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "DEFAULT_LLM_CACHE", tmp_path / "llm.sqlite")
+    cache = llm_cache.get_cache()
+    assert cache is llm_cache.get_cache(tmp_path / "llm.sqlite")
+    assert cache is not llm_cache.get_cache(tmp_path / "other.sqlite")
+    assert cache.path == tmp_path / "llm.sqlite"
@@ -0,0 +1,122 @@
+"""
+Shared LLM HTTP client test (llm_client)
+- A 5xx answer is retried with exponential backoff, then the answer is used
+- A read timeout is not retried: one request, the error is raised
+- get_client replaces the shared client without closing the old one
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import llm_client
+from llm_client import LLMClient, get_client
+
+BACKOFF_S = 0.1
+
+
+class FakeServer:
+    """ThreadingHTTPServer answering POSTs with the scripted statuses, then 200.
+
+    delay_s: seconds to wait before answering (read timeouts)."""
+
+    def __init__(self, statuses=(), delay_s=0.0):
+        self.statuses = list(statuses)
+        self.arrivals = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                fake.arrivals.append(time.perf_counter())
+                status = fake.statuses.pop(0) if fake.statuses else 200
+                body = json.dumps({"status": status}).encode()
+                time.sleep(delay_s)
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (timeout)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.host = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def make(*args, **kwargs):
+        servers.append(FakeServer(*args, **kwargs))
+        return servers[-1]
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def test_5xx_is_retried_with_backoff(server_factory):
+    server = server_factory(statuses=[503, 503])
+    client = LLMClient(server.host, retries=3, backoff_s=BACKOFF_S)
+    assert client.post_json("/api/chat", {"q": 1}) == {"status": 200}
+    assert len(server.arrivals) == 3
+    # backoff_factor * 2 ** (n - 1) before the n-th consecutive retry (n >= 2)
+    assert server.arrivals[2] - server.arrivals[1] >= 2 * BACKOFF_S * 0.9
+    stats = client.stats()
+    assert stats["requests"] == 1 and stats["retries"] == 2 and stats["errors"] == 0
+    client.close()
+
+
+def test_5xx_after_the_last_retry_is_raised(server_factory):
+    server = server_factory(statuses=[503, 503, 503])
+    client = LLMClient(server.host, retries=1, backoff_s=0)
+    with pytest.raises(requests.HTTPError):
+        client.post_json("/api/chat", {"q": 1})
+    assert len(server.arrivals) == 2
+    assert client.timings[-1].status == 503 and client.timings[-1].attempts == 2
+    client.close()
+
+
+def test_read_timeout_is_not_retried(server_factory):
+    server = server_factory(delay_s=0.5)
+    client = LLMClient(server.host, retries=3, backoff_s=0)
+    with pytest.raises(requests.ReadTimeout):
+        client.post_json("/api/chat", {"q": 1}, timeout_s=0.1)
+    time.sleep(0.1)  # a retry would have reached the server by now
+    assert len(server.arrivals) == 1
+    assert client.timings[-1].status == 0 and client.timings[-1].attempts == 1
+    client.close()
+
+
+def test_get_client_replaces_without_closing(server_factory, monkeypatch):
+    monkeypatch.setattr(llm_client, "_clients", {})
+    server = server_factory()
+    old = get_client(server.host + "/")
+    assert get_client(server.host) is old
+    old.post_json("/api/chat", {"q": 1})
+    pools = old.session.get_adapter(server.host).poolmanager.pools
+    assert len(pools) == 1
+    new = get_client(server.host, pool_size=old.pool_size + 2)
+    assert new is not old and new.pool_size == old.pool_size + 2
+    assert get_client(server.host) is new
+    # a thread still holding the old client keeps its pooled connections
+    assert len(pools) == 1
+    assert old.post_json("/api/chat", {"q": 1}) == {"status": 200}
@@ -0,0 +1,46 @@
+"""
+Context snippet test (me_mii_context)
+- Bound references resolve to text while the file is unchanged
+- An edited file is not sliced; exported records keep size/mtime/hash
+"""
+
+import os
+
+from me_mii_context import ContextRecorder, ContextStore
+
+SOURCE = "sap.me.production.SfcStartService.startSfc(request);\n"
+
+
+def _bound(tmp_path):
+    fp = tmp_path / "Start.controller.js"
+    fp.write_text(SOURCE, encoding="utf-8")
+    start = SOURCE.index("startSfc")
+    ref = ContextRecorder(SOURCE).ref(start, start + len("startSfc"), 0)
+    store = ContextStore()
+    items = store.bind_items(str(fp), [{"method": "startSfc", "context": ref}])
+    return fp, store, items
+
+
+def test_bound_reference_resolves_to_text(tmp_path):
+    fp, store, items = _bound(tmp_path)
+    assert items[0]["context"][0] == 0 and len(items[0]["context"]) == 3
+    assert store.text(items[0]["context"]) == "startSfc"
+    assert store.resolve({"apis": items}) == {"apis": [{"method": "startSfc", "context": "startSfc"}]}
+
+
+def test_records_round_trip_and_edited_file_is_refused(tmp_path):
+    fp, store, items = _bound(tmp_path)
+    records = store.to_json()
+    assert records[0]["path"] == str(fp)
+    assert {"size", "mtime", "hash"} <= set(records[0])
+    assert ContextStore(records).text(items[0]["context"]) == "startSfc"
+
+    # touched only: same content hash, still resolved
+    st = fp.stat()
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert ContextStore(records).text(items[0]["context"]) == "startSfc"
+
+    fp.write_text("// moved\n" + SOURCE, encoding="utf-8")
+    assert ContextStore(records).text(items[0]["context"]) == ""
+    # plain paths (no signature) cannot be verified either
+    assert ContextStore([str(fp)]).text(items[0]["context"]) == ""
@@ -0,0 +1,136 @@
+"""
+Streaming Ollama client test (rag_consultant.ollama_chat_stream)
+- A local fake /api/chat answers with scripted NDJSON lines
+- Pieces, "done" handling, error objects, early close and the response cache
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import llm_cache
+import rag_consultant as rc
+
+
+def _piece(text, done=False):
+    return {"model": "fake", "done": done, "message": {"role": "assistant", "content": text}}
+
+
+class FakeOllama:
+    """ThreadingHTTPServer sending self.lines as a chunked NDJSON body."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                fake.requests.append(json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0)))))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    for obj in fake.lines:
+                        data = (json.dumps(obj) + "\n").encode()
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client closed the stream early
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.host = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "DEFAULT_LLM_CACHE", tmp_path / "llm.sqlite")
+    yield llm_cache.get_cache()
+    llm_cache.get_cache().close()
+
+
+@pytest.fixture
+def ollama():
+    servers = []
+
+    def start(lines):
+        servers.append(FakeOllama(lines))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def _stream(server, prompt="question?", **kwargs):
+    return rc.ollama_chat_stream("fake", prompt, host=server.host, timeout_s=10, **kwargs)
+
+
+def test_pieces_in_order_and_cached_when_done(ollama, cache):
+    server = ollama([_piece("Merhaba"), _piece(", "), _piece("dünya"), _piece("", done=True)])
+    assert list(_stream(server)) == ["Merhaba", ", ", "dünya"]
+    assert server.requests[0]["stream"] is True
+    assert server.requests[0]["model"] == "fake"
+    assert cache.get(llm_cache.cache_key("fake", "question?")) == "Merhaba, dünya"
+
+    # second call: answered from the cache in one piece, no request
+    assert list(_stream(server)) == ["Merhaba, dünya"]
+    assert len(server.requests) == 1
+
+
+def test_lines_after_done_are_read_to_the_end(ollama, cache):
+    server = ollama([_piece("a"), _piece("b", done=True), {"model": "fake", "done": True}])
+    assert list(_stream(server)) == ["a", "b"]
+    assert cache.get(llm_cache.cache_key("fake", "question?")) == "ab"
+
+
+def test_error_object_raises_and_is_not_cached(ollama, cache):
+    server = ollama([_piece("par"), {"error": "model 'fake' not found"}])
+    stream = _stream(server)
+    assert next(stream) == "par"
+    with pytest.raises(RuntimeError, match="Ollama: model 'fake' not found"):
+        next(stream)
+    assert cache.stats()["entries"] == 0
+
+
+def test_answer_without_done_is_not_cached(ollama, cache):
+    server = ollama([_piece("cut "), _piece("off")])
+    assert "".join(_stream(server)) == "cut off"
+    assert cache.stats()["entries"] == 0
+
+
+def test_abandoned_stream_is_not_cached(ollama, cache):
+    server = ollama([_piece("first"), _piece(" second"), _piece("", done=True)])
+    stream = _stream(server)
+    assert next(stream) == "first"
+    stream.close()
+    assert cache.stats()["entries"] == 0
+
+    # the next call goes to the server again and gets the whole answer
+    assert "".join(_stream(server)) == "first second"
+    assert len(server.requests) == 2
+
+
+def test_no_cache_neither_reads_nor_writes(ollama, cache):
+    cache.put(llm_cache.cache_key("fake", "question?"), "fake", "stale")
+    server = ollama([_piece("fresh", done=True)])
+    assert list(_stream(server, use_cache=False)) == ["fresh"]
+    assert len(server.requests) == 1
+    assert cache.get(llm_cache.cache_key("fake", "question?")) == "stale"
@@ -0,0 +1,63 @@
+"""
+Prompt budget test (prompt_budget.PromptBudget)
+- Text sections are cut at the end with a marker, within their budget
+- List sections skip an item that does not fit and keep packing
+- Sections are packed by priority into num_ctx - reserve
+"""
+
+from prompt_budget import TRUNCATED, PromptBudget
+
+
+def chars(text):
+    return len(text)  # one token per character: exact arithmetic
+
+
+def test_sections_that_fit_are_kept_as_is():
+    budget = PromptBudget(num_ctx=1000, reserve=100, estimate=chars)
+    budget.add("question", "Neden?").add_items("context", ["a", "b"], sep="|")
+    prompt = budget.render("Q:{question} C:{context} {unknown}")
+    assert prompt == "Q:Neden? C:a|b {unknown}"
+    report = budget.report
+    assert report["window"] == 1000 and report["reserved"] == 100
+    assert report["fixed"] == len("Q: C: {unknown}")
+    assert report["used"] == len(prompt) and report["dropped"] == 0
+    assert report["sections"]["context"] == {"used": 3, "dropped": 0, "items": 2, "items_dropped": 0}
+
+
+def test_text_is_truncated_to_its_budget():
+    text = "x" * 500
+    budget = PromptBudget(num_ctx=1000, reserve=0, estimate=chars)
+    prompt = budget.add("summary", text, budget=100).render("{summary}")
+    assert prompt.endswith(TRUNCATED) and prompt.startswith("x")
+    assert 90 <= len(prompt) <= 100
+    section = budget.report["sections"]["summary"]
+    assert section["used"] == len(prompt)
+    assert section["used"] + section["dropped"] == 500
+
+
+def test_item_that_does_not_fit_is_skipped_not_the_rest():
+    items = ["a" * 30, "b" * 60, "c" * 10]
+    budget = PromptBudget(num_ctx=1000, reserve=0, estimate=chars)
+    prompt = budget.add_items("context", items, budget=50, sep="\n").render("{context}")
+    assert prompt == "a" * 30 + "\n" + "c" * 10
+    section = budget.report["sections"]["context"]
+    assert section["items"] == 2 and section["items_dropped"] == 1
+    assert section["used"] == 41 and section["dropped"] == 61
+
+
+def test_priority_decides_who_gets_the_window():
+    budget = PromptBudget(num_ctx=120, reserve=20, estimate=chars)
+    budget.add_items("context", ["c" * 60, "d" * 30], priority=1)
+    budget.add("question", "q" * 80, priority=0)
+    prompt = budget.render("{question}{context}")
+    # the question is packed first; 20 tokens are left, too few for any item
+    assert prompt == "q" * 80
+    assert budget.report["used"] == 80
+    assert budget.report["sections"]["context"]["items_dropped"] == 2
+
+
+def test_window_smaller_than_the_template_renders_empty_sections():
+    budget = PromptBudget(num_ctx=10, reserve=5, estimate=chars)
+    prompt = budget.add("question", "Neden?").render("SYSTEM PROMPT {question}")
+    assert prompt == "SYSTEM PROMPT "
+    assert budget.report["sections"]["question"] == {"used": 0, "dropped": 6}
@@ -0,0 +1,73 @@
+"""
+RAG index test (rag_index.RagIndex)
+- A touched source (mtime only) keeps the stored index
+- Changed content rebuilds it
+- An output folder without sources gets no .rag_index folder
+"""
+
+import json
+import os
+
+import pytest
+
+import rag_index
+from rag_index import INDEX_DIRNAME, RagIndex
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    # no in-process memo between tests: open() goes to disk
+    monkeypatch.setattr(rag_index, "_open_indexes", {})
+
+
+def _write_summary(out, body):
+    (out / "SUMMARY.md").write_text(f"# Summary\n\n## Services\n\n{body}\n", encoding="utf-8")
+
+
+def _texts(index, question):
+    return " ".join(text for _, text, _ in index.retrieve_budget(question, 1000))
+
+
+def test_mtime_only_change_keeps_the_index(tmp_path, monkeypatch):
+    _write_summary(tmp_path, "SfcService starts the SFC at the operation.")
+    RagIndex.open(tmp_path)
+    manifest = tmp_path / INDEX_DIRNAME / "manifest.json"
+    assert manifest.is_file()
+
+    fp = tmp_path / "SUMMARY.md"
+    st = fp.stat()
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    monkeypatch.setattr(rag_index, "_open_indexes", {})
+    monkeypatch.setattr(RagIndex, "build", classmethod(lambda cls, out: pytest.fail("index rebuilt")))
+
+    index = RagIndex.open(tmp_path)
+    assert "SfcService" in _texts(index, "SfcService")
+    # the manifest follows the new mtime, so the next run skips the hash
+    assert json.loads(manifest.read_text())["sources"]["SUMMARY.md"]["mtime"] == fp.stat().st_mtime_ns
+
+
+def test_changed_content_rebuilds_the_index(tmp_path):
+    _write_summary(tmp_path, "SfcService starts the SFC at the operation.")
+    RagIndex.open(tmp_path)
+
+    fp = tmp_path / "SUMMARY.md"
+    st = fp.stat()
+    _write_summary(tmp_path, "LabelService prints SFC labels at assembly.")  # same size
+    assert fp.stat().st_size == st.st_size
+    # same size and mtime: trusted without hashing
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert RagIndex.load(tmp_path).is_current()
+
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert not RagIndex.load(tmp_path).is_current()
+    index = RagIndex.open(tmp_path)
+    assert "LabelService" in _texts(index, "LabelService label")
+    assert "SfcService" not in _texts(index, "SfcService")
+    assert RagIndex.load(tmp_path).is_current()
+
+
+def test_output_folder_without_sources_is_not_written(tmp_path):
+    out = tmp_path / "typo"
+    index = RagIndex.open(out)
+    assert index.retrieve_budget("SfcService", 1000) == []
+    assert not out.exists()
@@ -0,0 +1,32 @@
+"""
+Parallel scan test (ScanEngine.run(workers=N))
+- Fragments parsed in worker processes are merged in scan order, so the
+  outputs equal a single-process run (also with tiny chunks and a cache)
+"""
+
+from me_mii_analyzer_advanced import DetectionCollector, SAPUI5DeepCollector
+from me_mii_cache import AnalysisCache
+from me_mii_folder_analyzer import FolderCollector
+from me_mii_folder_analyzer_extended import ExtendedCollector
+
+COLLECTORS = [FolderCollector, ExtendedCollector, SAPUI5DeepCollector, DetectionCollector]
+
+
+def test_workers_give_the_same_output_as_one_process(source_tree, scan_outputs):
+    serial = scan_outputs(source_tree)
+    assert serial["base"]["classes"] and serial["deep"]["controllers"]
+    assert scan_outputs(source_tree, workers=3) == serial
+
+
+def test_workers_with_partly_cached_files(source_tree, scan_outputs, tmp_path):
+    out = tmp_path / "out"
+    cache = AnalysisCache.load(out, source_tree, COLLECTORS, settings={"java_parser": "ast"})
+    scan_outputs(source_tree, cache=cache)
+    cache.save()
+    (source_tree / "webapp" / "controller" / "Home.controller.js").write_text(
+        "sap.ui.define([], function () { return { onInit: function () {} }; });\n", encoding="utf-8")
+
+    cache = AnalysisCache.load(out, source_tree, COLLECTORS, settings={"java_parser": "ast"})
+    parallel = scan_outputs(source_tree, workers=2, cache=cache)
+    assert cache.hits > 0 and cache.misses == 1
+    assert parallel == scan_outputs(source_tree)